@@ -0,0 +1,150 @@
+"""
+Measurement harness for the compact tool-output encoding.
+For every agent it calls each compactable data tool for the mock students, once with verbose
+and once with compact output, and reports the prompt tokens saved and the tool latency change.
+
+Tokens are estimated as ceil(len(json) / 4), which tracks Gemini's tokenizer closely for JSON payloads.
+
+Usage:
+    python benchmarks/bench_compact_output.py [--repeats 200] [--output bench_compact.json]
+"""
+import sys
+import os
+import argparse
+import json
+import math
+import statistics
+import tempfile
+import time
+
+# Add the current directory to sys.path
+sys.path.append(os.getcwd())
+
+# Use a throwaway database so the harness never touches real data
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from school_dropout_agent.core.encoding.compact_output import set_compact_tools
+from school_dropout_agent.core.session.shared_state import SharedStateStore
+from school_dropout_agent.infrastructure.database.database import init_db
+from school_dropout_agent.infrastructure.memory.database_memory import DatabaseMemoryService
+from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.agents.risk_prediction.agent import RiskPredictionAgent
+from school_dropout_agent.agents.emotional.agent import EmotionalBehavioralAgent
+from school_dropout_agent.agents.academic_support.agent import AcademicSupportAgent
+from school_dropout_agent.agents.family.agent import FamilyEngagementAgent
+from school_dropout_agent.agents.monitoring.agent import MonitoringAgent
+from school_dropout_agent.agents.summary.agent import FinalSummaryAgent
+
+STUDENTS = ["student_high_risk", "student_medium_risk", "student_low_risk"]
+SEEDED_INTERVENTIONS = 25
+
+def estimate_tokens(payload) -> int:
+    return math.ceil(len(json.dumps(payload, default=str)) / 4)
+
+def seed_database():
+    """Give every mock student a risk profile and a long intervention history."""
+    init_db()
+    memory = DatabaseMemoryService()
+    for student_id in STUDENTS:
+        name = MockDataStore.get_student_data(student_id, "profile")["name"].split(" ")
+        memory.store_student_profile(student_id, {
+            "first_name": name[0],
+            "last_name": name[-1],
+            "email": f"{student_id}@example.com",
+            "enrollment_status": "Active",
+            "major": "Computer Science"
+        })
+        memory.update_risk_profile(student_id, {
+            "risk_score": 0.5,
+            "risk_level": "Medium",
+            "risk_factors": ["attendance", "grades"]
+        })
+        for i in range(SEEDED_INTERVENTIONS):
+            memory.store_intervention(student_id, {
+                "intervention_id": f"{student_id}-{i}",
+                "type": "Academic",
+                "description": f"Weekly tutoring session #{i} for Math 101"
+            })
+
+def tool_calls(tool, student_id):
+    """Yield the keyword arguments a real agent run would pass to a tool."""
+    params = tool.__wrapped__.__code__.co_varnames[:tool.__wrapped__.__code__.co_argcount]
+    if params == ("student_id",):
+        yield {"student_id": student_id}
+    elif "subject" in params:
+        weak = MockDataStore.get_student_data(student_id, "academic_support") or {}
+        for item in weak.get("weak_subjects", []):
+            yield {"subject": item["subject"], "topic": item["topic"]}
+
+def time_tool(tool, kwargs, repeats):
+    samples = []
+    result = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = tool(**kwargs)
+        samples.append(time.perf_counter() - start)
+    return result, statistics.median(samples)
+
+def measure_agent(agent, repeats):
+    tools = [tool for tool in agent.tools if hasattr(tool, "__wrapped__")]
+    report = {"agent": agent.name, "tools": {}}
+    totals = {"verbose_tokens": 0, "compact_tokens": 0, "verbose_latency_s": 0.0, "compact_latency_s": 0.0}
+
+    for tool in tools:
+        stats = {"verbose_tokens": 0, "compact_tokens": 0, "verbose_latency_s": 0.0, "compact_latency_s": 0.0}
+        for student_id in STUDENTS:
+            if tool.__name__ == "get_all_agent_results":
+                SharedStateStore.clear()
+            for kwargs in tool_calls(tool, student_id):
+                set_compact_tools(set())
+                verbose, verbose_latency = time_tool(tool, kwargs, repeats)
+                set_compact_tools({tool.__name__})
+                compact, compact_latency = time_tool(tool, kwargs, repeats)
+                stats["verbose_tokens"] += estimate_tokens(verbose)
+                stats["compact_tokens"] += estimate_tokens(compact)
+                stats["verbose_latency_s"] += verbose_latency
+                stats["compact_latency_s"] += compact_latency
+        for key in totals:
+            totals[key] += stats[key]
+        report["tools"][tool.__name__] = stats
+
+    set_compact_tools(None)
+    report.update(totals)
+    report["tokens_saved"] = totals["verbose_tokens"] - totals["compact_tokens"]
+    report["tokens_saved_pct"] = round(100 * report["tokens_saved"] / totals["verbose_tokens"], 1) if totals["verbose_tokens"] else 0.0
+    report["latency_change_s"] = totals["compact_latency_s"] - totals["verbose_latency_s"]
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=200)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    seed_database()
+    agents = [
+        RiskPredictionAgent(),
+        EmotionalBehavioralAgent(),
+        AcademicSupportAgent(),
+        FamilyEngagementAgent(),
+        MonitoringAgent(),
+        FinalSummaryAgent(),
+    ]
+    reports = [measure_agent(agent, args.repeats) for agent in agents]
+
+    print(f"{'agent':<32}{'verbose tok':>12}{'compact tok':>12}{'saved':>9}{'latency Δ (µs)':>16}")
+    print("-" * 81)
+    for report in reports:
+        print(
+            f"{report['agent']:<32}{report['verbose_tokens']:>12}{report['compact_tokens']:>12}"
+            f"{report['tokens_saved_pct']:>8}%{report['latency_change_s'] * 1e6:>16.1f}"
+        )
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump({"students": STUDENTS, "repeats": args.repeats, "agents": reports}, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+if __name__ == "__main__":
+    main()
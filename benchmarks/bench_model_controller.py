@@ -0,0 +1,135 @@
+"""
+Offline benchmark for the ModelCallController.
+Fires model calls at a RateLimitedStubLlm (a local endpoint that returns 429s past its quota) from an
+increasing number of parallel callers, once with naive retries and once through the adaptive controller,
+and reports throughput, 429 count, p95 latency and the controller's final concurrency limit.
+
+Usage:
+    python benchmarks/bench_model_controller.py --callers 1,8,32 --calls 20 --quota 40 --output bench_controller.json
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from datetime import datetime
+from typing import Dict, List
+
+# Add the current directory to sys.path
+sys.path.append(os.getcwd())
+
+from google.adk.models.llm_request import LlmRequest
+from google.genai import types
+
+from school_dropout_agent.infrastructure.llm.controlled_llm import ControlledLlm
+from school_dropout_agent.infrastructure.llm.model_call_controller import ModelCallController
+from school_dropout_agent.infrastructure.llm.rate_limited_stub import RateLimitedStubLlm
+
+def build_request(student_id: str) -> LlmRequest:
+    return LlmRequest(
+        contents=[types.Content(role="user", parts=[types.Part(text=f"Analyze student {student_id}")])],
+        config=types.GenerateContentConfig(system_instruction='Your internal name is "final_summary_agent".')
+    )
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+def build_controller(adaptive: bool, quota: int) -> ModelCallController:
+    if adaptive:
+        return ModelCallController(requests_per_minute=quota * 60, initial_concurrency=4, max_concurrency=64)
+    # Naive client: no pacing and a fixed, effectively unlimited concurrency
+    return ModelCallController(
+        requests_per_minute=1e9,
+        initial_concurrency=1e6,
+        max_concurrency=1e6,
+        throttle_decrease_factor=1.0,
+        latency_decrease_factor=1.0
+    )
+
+async def run_level(callers: int, calls: int, quota: int, latency: float, adaptive: bool) -> Dict[str, object]:
+    stub = RateLimitedStubLlm(
+        requests_per_window=quota,
+        window_seconds=1.0,
+        max_concurrent=max(1, quota // 4),
+        latency_seconds=latency,
+        congestion_seconds=latency / 10
+    )
+    controller = build_controller(adaptive, quota)
+    model = ControlledLlm(model=stub.model, inner=stub, controller=controller, max_retries=10, base_backoff_seconds=0.05)
+    latencies: List[float] = []
+    failures = 0
+
+    async def caller(index: int):
+        nonlocal failures
+        for call in range(calls):
+            started = time.perf_counter()
+            try:
+                async for _ in model.generate_content_async(build_request(f"student_{index}_{call}")):
+                    pass
+                latencies.append(time.perf_counter() - started)
+            except Exception:
+                failures += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(caller(i) for i in range(callers)))
+    elapsed = time.perf_counter() - started
+    return {
+        "mode": "adaptive" if adaptive else "naive",
+        "callers": callers,
+        "calls": callers * calls,
+        "seconds": elapsed,
+        "throughput_per_second": len(latencies) / elapsed if elapsed else 0.0,
+        "rate_limited_responses": stub.rejected,
+        "failed_calls": failures,
+        "p50_latency": percentile(latencies, 50),
+        "p95_latency": percentile(latencies, 95),
+        "mean_latency": statistics.fmean(latencies) if latencies else 0.0,
+        "final_concurrency_limit": controller.concurrency_limit if adaptive else None
+    }
+
+async def benchmark(callers: List[int], calls: int, quota: int, latency: float) -> List[Dict[str, object]]:
+    results = []
+    for level in callers:
+        for adaptive in (False, True):
+            result = await run_level(level, calls, quota, latency, adaptive)
+            results.append(result)
+            print(
+                f"{result['mode']:<8} callers={level:<4} {result['throughput_per_second']:7.1f} calls/s  "
+                f"429s={result['rate_limited_responses']:<5} failed={result['failed_calls']:<3} "
+                f"p95={result['p95_latency'] * 1000:8.1f}ms"
+            )
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--callers", default="1,8,32", help="Comma-separated numbers of parallel callers")
+    parser.add_argument("--calls", type=int, default=20, help="Model calls per caller")
+    parser.add_argument("--quota", type=int, default=40, help="Stub endpoint quota in requests per second")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="Simulated seconds per accepted call")
+    parser.add_argument("--output", default=None, help="Write the JSON results to this file")
+    args = parser.parse_args()
+
+    results = asyncio.run(benchmark(
+        [int(n) for n in args.callers.split(",")],
+        args.calls,
+        args.quota,
+        args.model_latency
+    ))
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "quota_per_second": args.quota,
+        "model_latency_seconds": args.model_latency,
+        "results": results
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
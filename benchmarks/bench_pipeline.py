@@ -0,0 +1,205 @@
+"""
+Offline benchmark for the FullAnalysisPipeline.
+Runs the pipeline with the deterministic ScriptedLlm (no Gemini, no network) for cohorts of 1..N students
+at several concurrency levels, and reports per-stage and end-to-end latency (p50/p95/p99),
+DB time per student and memory per student as JSON that can be compared across commits.
+
+Usage:
+    python benchmarks/bench_pipeline.py --students 1,10,50 --concurrency 1,4,16 --output bench_pipeline.json
+    python benchmarks/bench_pipeline.py --compare bench_pipeline.json   # diff a fresh run against a saved one
+"""
+import sys
+import os
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Dict, List
+
+# Add the current directory to sys.path
+sys.path.append(os.getcwd())
+
+# Use a throwaway database so the benchmark never touches real data
+_db_dir = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_db_dir, 'bench.db')}"
+
+from school_dropout_agent.agents.orchestrator.runner import AnalysisRunner
+from school_dropout_agent.infrastructure.database.database import init_db
+from school_dropout_agent.infrastructure.llm.scripted_llm import ScriptedLlm
+from school_dropout_agent.infrastructure.memory.database_memory import DatabaseMemoryService
+from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+
+TEMPLATES = ["student_high_risk", "student_medium_risk", "student_low_risk"]
+
+def percentile(samples: List[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    return {
+        "p50": percentile(samples, 50),
+        "p95": percentile(samples, 95),
+        "p99": percentile(samples, 99),
+        "mean": statistics.fmean(samples) if samples else 0.0,
+        "max": max(samples) if samples else 0.0
+    }
+
+def seed_cohort(size: int, prefix: str) -> List[str]:
+    """Create synthetic students cloned from the built-in High/Medium/Low profiles."""
+    memory = DatabaseMemoryService()
+    student_ids = []
+    for i in range(size):
+        student_id = f"student_{prefix}_{i:05d}"
+        template = TEMPLATES[i % len(TEMPLATES)]
+        MockDataStore.add_student(student_id, {
+            category: MockDataStore.get_student_data(template, category)
+            for category in ("profile", "attendance", "grades", "lms", "financial", "counseling",
+                             "surveys", "social", "academic_support", "family")
+        })
+        memory.store_student_profile(student_id, {
+            "first_name": "Bench",
+            "last_name": f"Student {i}",
+            "email": f"{student_id}@example.com",
+            "enrollment_status": "Active",
+            "major": "Computer Science"
+        })
+        student_ids.append(student_id)
+    return student_ids
+
+async def run_student(runner: AnalysisRunner, student_id: str) -> Dict[str, object]:
+    """Run one student and time each stage from the end of the previous one to its last event."""
+    start = time.perf_counter()
+    last_seen: Dict[str, float] = {}
+    order: List[str] = []
+    async for event in runner.stream_student(student_id):
+        if event.author not in last_seen:
+            order.append(event.author)
+        last_seen[event.author] = time.perf_counter()
+    end = time.perf_counter()
+
+    stages = {}
+    previous = start
+    for author in order:
+        stages[author] = last_seen[author] - previous
+        previous = last_seen[author]
+    return {"total": end - start, "stages": stages}
+
+async def run_level(runner: AnalysisRunner, student_ids: List[str], concurrency: int) -> List[Dict[str, object]]:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def bounded(student_id):
+        async with semaphore:
+            return await run_student(runner, student_id)
+
+    return await asyncio.gather(*(bounded(student_id) for student_id in student_ids))
+
+def db_seconds() -> float:
+    return sum(s["total_seconds"] for s in instrumentation.to_json(recent=False)["series"] if s["kind"] == "db")
+
+async def benchmark(sizes: List[int], concurrencies: List[int], model_latency: float) -> List[Dict[str, object]]:
+    runner = AnalysisRunner(model_name=ScriptedLlm(latency_seconds=model_latency))
+    results = []
+    for size in sizes:
+        for concurrency in concurrencies:
+            student_ids = seed_cohort(size, f"n{size}c{concurrency}")
+            instrumentation.reset()
+
+            wall_start = time.perf_counter()
+            runs = await run_level(runner, student_ids, concurrency)
+            wall = time.perf_counter() - wall_start
+            db_total = db_seconds()
+
+            # Separate pass for memory so tracemalloc overhead does not skew latency
+            memory_ids = seed_cohort(size, f"n{size}c{concurrency}m")
+            tracemalloc.start()
+            before, _ = tracemalloc.get_traced_memory()
+            await run_level(runner, memory_ids, concurrency)
+            after, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+            stage_names = list(dict.fromkeys(name for run in runs for name in run["stages"]))
+            results.append({
+                "students": size,
+                "concurrency": concurrency,
+                "wall_seconds": wall,
+                "throughput_students_per_s": size / wall if wall else 0.0,
+                "end_to_end_seconds": summarize([run["total"] for run in runs]),
+                "stages_seconds": {
+                    name: summarize([run["stages"][name] for run in runs if name in run["stages"]])
+                    for name in stage_names
+                },
+                "db_seconds_per_student": db_total / size,
+                "memory_retained_bytes_per_student": max(0, after - before) / size,
+                "memory_peak_bytes": peak
+            })
+            print(
+                f"students={size:<5} concurrency={concurrency:<3} wall={wall:7.3f}s "
+                f"e2e p50={results[-1]['end_to_end_seconds']['p50'] * 1000:8.2f}ms "
+                f"p95={results[-1]['end_to_end_seconds']['p95'] * 1000:8.2f}ms "
+                f"db/student={results[-1]['db_seconds_per_student'] * 1000:6.2f}ms "
+                f"mem/student={results[-1]['memory_retained_bytes_per_student'] / 1024:7.1f}KiB"
+            )
+    return results
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+def compare(previous: Dict[str, object], current: Dict[str, object]) -> None:
+    print(f"\nComparison {previous.get('commit')} -> {current.get('commit')} (end-to-end p50 / p95)")
+    old = {(r["students"], r["concurrency"]): r for r in previous["results"]}
+    for result in current["results"]:
+        key = (result["students"], result["concurrency"])
+        if key not in old:
+            continue
+        for pct in ("p50", "p95"):
+            before = old[key]["end_to_end_seconds"][pct]
+            after = result["end_to_end_seconds"][pct]
+            change = (after - before) / before * 100 if before else 0.0
+            print(f"  students={key[0]:<5} concurrency={key[1]:<3} {pct}: {before * 1000:8.2f}ms -> {after * 1000:8.2f}ms ({change:+.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--students", default="1,10,50", help="Comma-separated cohort sizes")
+    parser.add_argument("--concurrency", default="1,4", help="Comma-separated concurrency levels")
+    parser.add_argument("--model-latency", type=float, default=0.0, help="Simulated seconds per model call")
+    parser.add_argument("--output", default=None, help="Write the JSON results to this file")
+    parser.add_argument("--compare", default=None, help="Compare against a previously saved results file")
+    args = parser.parse_args()
+
+    init_db()
+    results = asyncio.run(benchmark(
+        [int(n) for n in args.students.split(",")],
+        [int(c) for c in args.concurrency.split(",")],
+        args.model_latency
+    ))
+    report = {
+        "commit": git_commit(),
+        "timestamp": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "model_latency_seconds": args.model_latency,
+        "results": results
+    }
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f), report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+
+if __name__ == "__main__":
+    main()
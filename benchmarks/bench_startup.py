@@ -0,0 +1,82 @@
+"""
+Startup-time benchmark.
+Measures, in fresh interpreters, how long it takes to import `school_dropout_agent.agent`,
+to build `root_agent` on first access, and to open the first database session.
+Also lists the slowest imports reported by `python -X importtime`.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeats 5] [--output bench_startup.json]
+"""
+import sys
+import os
+import argparse
+import json
+import statistics
+import subprocess
+import tempfile
+
+PROBE = r"""
+import json, os, time
+start = time.perf_counter()
+import school_dropout_agent.agent as entry
+imported = time.perf_counter()
+entry.root_agent
+built = time.perf_counter()
+from school_dropout_agent.infrastructure.database.database import SessionLocal
+SessionLocal().close()
+db_ready = time.perf_counter()
+print(json.dumps({
+    "import_seconds": imported - start,
+    "root_agent_seconds": built - imported,
+    "first_db_session_seconds": db_ready - built,
+    "total_seconds": db_ready - start
+}))
+"""
+
+def run_probe(env) -> dict:
+    output = subprocess.check_output([sys.executable, "-c", PROBE], env=env, text=True, stderr=subprocess.DEVNULL)
+    return json.loads(output.strip().splitlines()[-1])
+
+def slowest_imports(env, limit: int = 10) -> list:
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import school_dropout_agent.agent as e; e.root_agent"],
+        env=env, text=True, capture_output=True
+    )
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, module = [part.strip() for part in line[len("import time:"):].split("|")]
+        rows.append({"module": module, "self_ms": int(self_us) / 1000, "cumulative_ms": int(cumulative_us) / 1000})
+    return sorted(rows, key=lambda row: row["self_ms"], reverse=True)[:limit]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--output", default=None, help="Write the JSON report to this file")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.getcwd() + os.pathsep + env.get("PYTHONPATH", "")
+    env["DATABASE_URL"] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'startup.db')}"
+
+    samples = [run_probe(env) for _ in range(args.repeats)]
+    report = {
+        key: {"median": statistics.median(s[key] for s in samples), "min": min(s[key] for s in samples)}
+        for key in samples[0]
+    }
+    report["slowest_imports"] = slowest_imports(env)
+
+    for key in ("import_seconds", "root_agent_seconds", "first_db_session_seconds", "total_seconds"):
+        print(f"{key:<28} median={report[key]['median'] * 1000:9.1f}ms  min={report[key]['min'] * 1000:9.1f}ms")
+    print("\nSlowest imports (self time):")
+    for row in report["slowest_imports"]:
+        print(f"  {row['self_ms']:8.1f}ms  {row['module']}")
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport written to {args.output}")
+
+if __name__ == "__main__":
+    main()
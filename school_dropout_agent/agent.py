@@ -1,16 +1,23 @@
 """
 Entry point for ADK web interface.
 This file is automatically loaded by `adk web` command.
+The agent graph is built on first access to `root_agent`, and the database is initialized on first use,
+so importing this module stays cheap for short-lived workers.
 """
-from school_dropout_agent.agents.orchestrator.agent import DropoutPreventionOrchestrator
-from school_dropout_agent.infrastructure.memory.database_memory import DatabaseMemoryService
-from school_dropout_agent.infrastructure.database.database import init_db
+_root_agent = None
 
-# Initialize database
-init_db()
+def get_root_agent():
+    """Build the root agent and its memory service on first use."""
+    global _root_agent
+    if _root_agent is None:
+        from school_dropout_agent.agents.orchestrator.agent import DropoutPreventionOrchestrator
+        from school_dropout_agent.infrastructure.memory.memory_provider import get_default_memory_service
 
-# Create memory service
-memory_service = DatabaseMemoryService()
+        # Create root agent with memory service
+        _root_agent = DropoutPreventionOrchestrator(memory_service=get_default_memory_service())
+    return _root_agent
 
-# Create root agent with memory service
-root_agent = DropoutPreventionOrchestrator(memory_service=memory_service)
+def __getattr__(name):
+    if name == "root_agent":
+        return get_root_agent()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,8 +1,19 @@
 """
 This module defines the AcademicSupportAgent.
 It creates personalized study plans based on the student's academic performance and learning style.
+Plans are memoized by weak-subject and learning-style signature, so repeat signatures skip the LLM.
 """
+from typing import Optional
+
+from google.adk.agents.callback_context import CallbackContext
 from google.adk.agents.llm_agent import Agent
+from google.genai import types
+from school_dropout_agent.core.session.shared_state import result_key, save_session_result
+from school_dropout_agent.infrastructure.academic.study_plan_cache import plan_signature, study_plan_cache
+from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from .tools import get_weak_subjects, get_learning_style, get_study_resources, get_video_resources
 
 ACADEMIC_SUPPORT_INSTRUCTION = """
@@ -12,13 +23,13 @@ Your goal is to create personalized study plans and recommend resources for stru
 You have access to the following tools:
 - `get_weak_subjects`: Identify subjects where the student is struggling.
 - `get_learning_style`: Get the student's preferred learning style.
-- `get_study_resources`: Fetch relevant study resources for specific topics.
+- `get_study_resources`: Fetch relevant study resources for specific topics, ranked for the student's learning style and preferences.
 - `get_video_resources`: Search YouTube for educational videos on specific topics.
 
 **Your Task:**
 1. Identify the student's weak subjects.
 2. Understand their learning style preferences.
-3. Recommend tailored study resources for each weak subject.
+3. Recommend tailored study resources for each weak subject, passing the `learning_style` and `preferences` to `get_study_resources`.
 4. Use `get_video_resources` to find specific video tutorials for the weak topics.
     
 **Output Format:**
@@ -27,13 +38,58 @@ You have access to the following tools:
 """
 
 
-from school_dropout_agent.agents.orchestrator.tools import save_agent_result
+from school_dropout_agent.agents.orchestrator.tools import save_agent_result, result_archive
+
+AGENT_NAME = "academic_support_agent"
+
+def _signature_for(student_id: str) -> Optional[str]:
+    data = MockDataStore.get_student_data(student_id, "academic_support")
+    if not data or not data.get("weak_subjects"):
+        return None
+    return plan_signature(data["weak_subjects"], data.get("learning_style", "Visual"), data.get("preferences", []))
+
+def _student_name(student_id: str) -> Optional[str]:
+    return (MockDataStore.get_student_data(student_id, "profile") or {}).get("name")
+
+def reuse_cached_plan(callback_context: CallbackContext) -> Optional[types.Content]:
+    """Before the agent runs: answer from the plan cache when the student's signature was seen before."""
+    student_id = callback_context.state.get("student_id")
+    signature = _signature_for(student_id) if student_id else None
+    if not signature:
+        return None
+
+    plan = study_plan_cache.get(signature, student_id, _student_name(student_id))
+    if plan is None:
+        callback_context.state["study_plan_signature"] = signature
+        # Whatever the agent saves from here on is this run's plan
+        callback_context.state[result_key(AGENT_NAME)] = None
+        return None
+
+    # The signature ignores grades, so the student's own grades are layered onto the shared plan
+    plan["weak_subjects"] = MockDataStore.get_student_data(student_id, "academic_support")["weak_subjects"]
+    save_session_result(callback_context.state, AGENT_NAME, plan)
+    run_id = callback_context.state.get("run_id") or callback_context.invocation_id
+    result_archive.archive(student_id, AGENT_NAME, plan, run_id=run_id)
+    return types.Content(role="model", parts=[types.Part(text=f"Reused a cached study plan for {student_id}.")])
+
+def store_generated_plan(callback_context: CallbackContext) -> Optional[types.Content]:
+    """
+    After the agent runs: cache the plan it saved in this session under the signature computed before the run.
+    Plans that do not name this student are never cached, so no one else's details can reach a template.
+    """
+    student_id = callback_context.state.get("student_id")
+    signature = callback_context.state.get("study_plan_signature")
+    plan = callback_context.state.get(result_key(AGENT_NAME))
+    if signature and student_id and isinstance(plan, dict) and plan.get("student_id") == student_id:
+        study_plan_cache.put(signature, plan, student_id, _student_name(student_id))
+        callback_context.state["study_plan_signature"] = None
+    return None
 
 class AcademicSupportAgent(Agent):
     def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
         super().__init__(
-            model=model_name,
-            name="academic_support_agent",
+            model=build_model(model_name),
+            name=AGENT_NAME,
             description="Generates personalized study plans and resources.",
             instruction=ACADEMIC_SUPPORT_INSTRUCTION,
             tools=[
@@ -42,7 +98,11 @@ class AcademicSupportAgent(Agent):
                 get_study_resources,
                 get_video_resources,
                 save_agent_result
-            ]
+            ],
+            before_agent_callback=reuse_cached_plan,
+            after_agent_callback=store_generated_plan,
+            **instrumentation.agent_callbacks()
         )
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
 
@@ -3,13 +3,15 @@ This module defines tools for the Academic Support Agent.
 It provides functionality to create study plans and retrieve learning resources.
 """
 import os
-from mcp.client.stdio import StdioServerParameters
-from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
-from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.core.encoding.compact_output import compact_tool
+from school_dropout_agent.infrastructure.academic.resource_catalog import get_resource_catalog
 
+RESOURCE_LIMIT = 5
+
+@compact_tool()
 def get_weak_subjects(student_id: str) -> Dict[str, Any]:
     """
     Identifies subjects where the student is struggling.
@@ -26,6 +28,7 @@ def get_weak_subjects(student_id: str) -> Dict[str, Any]:
         "weak_subjects": []
     }
 
+@compact_tool()
 def get_learning_style(student_id: str) -> Dict[str, Any]:
     """
     Retrieves the student's preferred learning style.
@@ -44,18 +47,30 @@ def get_learning_style(student_id: str) -> Dict[str, Any]:
         "preferences": ["Videos", "Diagrams", "Interactive simulations"]
     }
 
-def get_study_resources(subject: str, topic: str) -> Dict[str, Any]:
+@compact_tool()
+def get_study_resources(
+    subject: str,
+    topic: str,
+    learning_style: Optional[str] = None,
+    preferences: Optional[List[str]] = None
+) -> Dict[str, Any]:
     """
     Fetches relevant study resources for a given subject and topic.
+    Pass the `learning_style` and `preferences` from `get_learning_style` to rank matching formats first.
     """
-    # Mock data - in production, this would query a resource database
+    resources = get_resource_catalog().search(subject, topic, learning_style, preferences, limit=RESOURCE_LIMIT)
+    if not resources:
+        # Nothing in the catalog covers the topic; fall back to generic searches
+        resources = [
+            {"type": "Video", "title": f"{topic} Explained", "url": "https://example.com/video"},
+            {"type": "Practice Problems", "title": f"{topic} Exercises", "url": "https://example.com/exercises"},
+            {"type": "Tutorial", "title": f"{topic} Step-by-Step", "url": "https://example.com/tutorial"}
+        ]
     return {
         "subject": subject,
         "topic": topic,
         "resources": [
-            {"type": "Video", "title": f"{topic} Explained", "url": "https://example.com/video"},
-            {"type": "Practice Problems", "title": f"{topic} Exercises", "url": "https://example.com/exercises"},
-            {"type": "Tutorial", "title": f"{topic} Step-by-Step", "url": "https://example.com/tutorial"}
+            {"type": r["type"], "title": r["title"], "url": r["url"]} for r in resources
         ]
     }
 
@@ -72,6 +87,11 @@ async def get_video_resources(subject: str, topic: str) -> Dict[str, Any]:
     - videos: List of videos with title, url, description, etc.
     """
     try:
+        # Imported here so the MCP client stack is only loaded when videos are requested
+        from mcp.client.stdio import StdioServerParameters
+        from google.adk.tools.mcp_tool.mcp_session_manager import StdioConnectionParams
+        from google.adk.tools.mcp_tool.mcp_toolset import McpToolset
+
         # Create MCP toolset connection
         mcp_toolset = McpToolset(
             connection_params=StdioConnectionParams(
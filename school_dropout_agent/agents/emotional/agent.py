@@ -3,6 +3,11 @@ This module defines the EmotionalBehavioralAgent.
 It analyzes qualitative data (counseling notes, surveys) to assess the student's emotional well-being.
 """
 from google.adk.agents.llm_agent import Agent
+from google.adk.agents.readonly_context import ReadonlyContext
+from school_dropout_agent.infrastructure.rules.rule_engine import rule_engine
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from .tools import get_counseling_visits, get_survey_responses, get_social_engagement
 
 EMOTIONAL_AGENT_INSTRUCTION = """
@@ -10,16 +15,16 @@ You are an expert Emotional & Behavioral Agent for a university dropout preventi
 Your goal is to analyze a student's emotional and behavioral patterns to identify signs of distress.
 
 You have access to the following tools:
-- `get_counseling_visits`: Check counseling visit history.
-- `get_survey_responses`: Check recent survey responses and sentiment.
+- `get_counseling_visits`: Check counseling visit history and the distress score of reported issues.
+- `get_survey_responses`: Check recent survey responses and the sentiment scores of the comment.
 - `get_social_engagement`: Check campus and social engagement levels.
+- `get_threshold_flags`: Evaluate the behavioral rules below for the student (use rule_set "emotional").
 
 **Behavioral Flags to Look For:**
-1. Increased counseling visits (>3 in last 30 days).
-2. High stress levels (>4 out of 5).
-3. Low satisfaction scores (<3 out of 5).
-4. Declining social engagement (no club memberships, low event attendance).
-5. Negative sentiment in survey comments.
+{emotional_rules}
+
+Sentiment ranges from -1 (very negative) to 1 (very positive); distress ranges from 0 to 1.
+`distress_terms` lists the words that drove the distress score.
 
 **Output Format:**
 1. Call `save_agent_result` with the full JSON analysis.
@@ -27,20 +32,27 @@ You have access to the following tools:
 """
 
 
-from school_dropout_agent.agents.orchestrator.tools import save_agent_result
+from school_dropout_agent.agents.orchestrator.tools import save_agent_result, get_threshold_flags
+
+def emotional_agent_instruction(context: ReadonlyContext) -> str:
+    """Renders the instruction with the current behavioral rules, so rule changes apply without a redeploy."""
+    return EMOTIONAL_AGENT_INSTRUCTION.replace("{emotional_rules}", rule_engine.render("emotional"))
 
 class EmotionalBehavioralAgent(Agent):
     def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
         super().__init__(
-            model=model_name,
+            model=build_model(model_name),
             name="emotional_behavioral_agent",
             description="Analyzes student emotional and behavioral patterns.",
-            instruction=EMOTIONAL_AGENT_INSTRUCTION,
+            instruction=emotional_agent_instruction,
             tools=[
                 get_counseling_visits,
                 get_survey_responses,
                 get_social_engagement,
+                get_threshold_flags,
                 save_agent_result
-            ]
+            ],
+            **instrumentation.agent_callbacks()
         )
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
@@ -1,46 +1,68 @@
 """
 This module defines tools for the Emotional & Behavioral Agent.
 It mocks retrieval of counseling logs and student survey responses.
+Free text (survey comments, reported counseling issues) is replaced by local sentiment and distress scores.
 """
 from typing import Dict, Any, List
 from datetime import datetime, timedelta
 
+from school_dropout_agent.infrastructure.features.student_features import DEFAULT_COMMENT, build_feature_matrix
 from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.infrastructure.nlp.sentiment import sentiment_scorer
+from school_dropout_agent.infrastructure.rules.rule_engine import rule_engine
+from school_dropout_agent.core.encoding.compact_output import compact_tool
 
+def _issue_scores(issues: List[str]) -> Dict[str, Any]:
+    """Aggregate scores of reported counseling issues (worst issue wins)."""
+    scores = sentiment_scorer.score_batch(issues)
+    return {
+        "issue_count": len(issues),
+        "issue_distress": max((s["distress"] for s in scores), default=0.0),
+        "issue_sentiment": min((s["sentiment"] for s in scores), default=0.0),
+        "distress_terms": sorted({term for s in scores for term in s["distress_terms"]})
+    }
+
+@compact_tool(defaults={"total_visits": 0, "recent_visits": 0})
 def get_counseling_visits(student_id: str) -> Dict[str, Any]:
     """
     Fetches counseling visit records for a student.
     """
     data = MockDataStore.get_student_data(student_id, "counseling")
     if data:
-        data["student_id"] = student_id
-        return data
+        result = {key: value for key, value in data.items() if key != "reported_issues"}
+        result["student_id"] = student_id
+        result.update(_issue_scores(data.get("reported_issues", [])))
+        return result
 
     return {
         "student_id": student_id,
         "total_visits": 0,
         "recent_visits": 0,
         "last_visit_date": None,
-        "reported_issues": []
+        **_issue_scores([])
     }
 
+@compact_tool()
 def get_survey_responses(student_id: str) -> Dict[str, Any]:
     """
-    Fetches recent survey responses from the student.
+    Fetches recent survey responses from the student, with the comment replaced by its sentiment scores.
     """
     data = MockDataStore.get_student_data(student_id, "surveys")
     if data:
-        data["student_id"] = student_id
-        return data
+        result = {key: value for key, value in data.items() if key != "comments"}
+        result["student_id"] = student_id
+        result["comment_sentiment"] = sentiment_scorer.score(data.get("comments", ""))
+        return result
 
     return {
         "student_id": student_id,
         "satisfaction_score": 4.0,
         "stress_level": 2.0,
         "workload_rating": 3.0,
-        "comments": "Everything is going well."
+        "comment_sentiment": sentiment_scorer.score(DEFAULT_COMMENT)
     }
 
+@compact_tool()
 def get_social_engagement(student_id: str) -> Dict[str, Any]:
     """
     Fetches social and campus engagement data.
@@ -56,3 +78,25 @@ def get_social_engagement(student_id: str) -> Dict[str, Any]:
         "event_attendance_last_month": 2,
         "peer_interaction_score": 3.0
     }
+
+def prescreen_emotional_distress(student_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+    """
+    Evaluates the `emotional` threshold rules over a whole cohort in one vectorized pass, without any model calls.
+    Returns per-student text scores, the matched rule IDs and a `flagged` verdict, keyed by student ID.
+    """
+    # The feature matrix scores every comment and issue of the cohort in one batch
+    matrix = build_feature_matrix(student_ids)
+    matches = rule_engine.evaluate("emotional", matrix)
+    sentiment, comment_distress, issue_distress = (
+        matrix.column(name) for name in ("comment_sentiment", "comment_distress", "issue_distress")
+    )
+    return {
+        student_id: {
+            "comment_sentiment": float(sentiment[row]),
+            "comment_distress": float(comment_distress[row]),
+            "issue_distress": float(issue_distress[row]),
+            "rules": matches[student_id],
+            "flagged": bool(matches[student_id])
+        }
+        for row, student_id in enumerate(matrix.student_ids)
+    }
@@ -3,6 +3,9 @@ This module defines the FamilyEngagementAgent.
 It drafts communication to parents/guardians to involve them in the student's support plan.
 """
 from google.adk.agents.llm_agent import Agent
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from .tools import get_parent_contact_info, send_parent_message, translate_message
 
 FAMILY_ENGAGEMENT_INSTRUCTION = """
@@ -30,7 +33,7 @@ from school_dropout_agent.agents.orchestrator.tools import save_agent_result
 class FamilyEngagementAgent(Agent):
     def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
         super().__init__(
-            model=model_name,
+            model=build_model(model_name),
             name="family_engagement_agent",
             description="Manages communication with parents/guardians.",
             instruction=FAMILY_ENGAGEMENT_INSTRUCTION,
@@ -39,6 +42,8 @@ class FamilyEngagementAgent(Agent):
                 send_parent_message,
                 translate_message,
                 save_agent_result
-            ]
+            ],
+            **instrumentation.agent_callbacks()
         )
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
@@ -5,7 +5,14 @@ It provides functionality to retrieve parent contact info and send messages.
 from typing import Dict, Any
 
 from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.core.encoding.compact_output import compact_tool
+from school_dropout_agent.infrastructure.translation.mock_backend import MockTranslationBackend
+from school_dropout_agent.infrastructure.translation.translation_service import TranslationService
 
+# Shared across students so identical notices are translated once per language
+translation_service = TranslationService(MockTranslationBackend())
+
+@compact_tool()
 def get_parent_contact_info(student_id: str) -> Dict[str, Any]:
     """
     Retrieves parent/guardian contact information.
@@ -36,13 +43,13 @@ def send_parent_message(student_id: str, message: str, language: str = "English"
         "timestamp": "2025-11-20T14:00:00"
     }
 
-def translate_message(message: str, target_language: str) -> Dict[str, Any]:
+async def translate_message(message: str, target_language: str) -> Dict[str, Any]:
     """
     Translates a message to the target language.
     """
-    # Mock translation - in production, use a translation API
+    translated = await translation_service.translate(message, target_language)
     return {
         "original": message,
-        "translated": f"[{target_language}] {message}",
+        "translated": translated,
         "target_language": target_language
     }
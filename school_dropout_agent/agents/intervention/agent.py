@@ -4,7 +4,9 @@ It is responsible for creating formal intervention records and notifying stakeho
 It saves intervention plans to the database.
 """
 from google.adk.agents.llm_agent import Agent
-from school_dropout_agent.agents.intervention.tools import create_intervention, notify_stakeholder, get_active_interventions
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from school_dropout_agent.agents.intervention.tools import create_intervention, notify_stakeholder, get_active_interventions
 
 INTERVENTION_INSTRUCTION = """
@@ -15,11 +17,15 @@ You have access to the following tools:
 - `create_intervention`: Create a new intervention record.
 - `notify_stakeholder`: Send notifications to teachers, counselors, or parents.
 - `get_active_interventions`: Check existing active interventions to avoid duplicates.
+- `get_student_history_page`: Page through older interventions when the recent ones in the session are not enough.
+- `get_intervention_effectiveness`: Rank intervention types by recorded effectiveness for a risk band and major.
+- `find_similar_students`: Find similar students and the outcomes of their interventions; prefer intervention types that were resolved for them.
 
 **Decision Rules:**
 1. **High Risk**: Notify counselor AND teacher. Create "Academic" and "Emotional" interventions.
 2. **Medium Risk**: Notify teacher. Create "Academic" intervention.
 3. **Low Risk**: No immediate action, but log for monitoring.
+4. When adding interventions beyond the required ones, prefer the types with the highest effectiveness for the student's risk band and major.
 
 **Output Format:**
 1. Call `save_agent_result` with the full interventions JSON.
@@ -27,12 +33,12 @@ You have access to the following tools:
 """
 
 
-from school_dropout_agent.agents.orchestrator.tools import save_agent_result
+from school_dropout_agent.agents.orchestrator.tools import save_agent_result, get_student_history_page, find_similar_students, get_intervention_effectiveness
 
 class InterventionCoordinatorAgent(Agent):
     def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
         super().__init__(
-            model=model_name,
+            model=build_model(model_name),
             name="intervention_coordinator_agent",
             description="Coordinates interventions and notifications.",
             instruction=INTERVENTION_INSTRUCTION,
@@ -40,7 +46,12 @@ class InterventionCoordinatorAgent(Agent):
                 create_intervention,
                 notify_stakeholder,
                 get_active_interventions,
+                get_student_history_page,
+                find_similar_students,
+                get_intervention_effectiveness,
                 save_agent_result
-            ]
+            ],
+            **instrumentation.agent_callbacks()
         )
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
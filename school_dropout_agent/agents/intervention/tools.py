@@ -2,12 +2,31 @@
 This module defines tools for the Intervention Coordinator Agent.
 It includes `create_intervention` (which saves to DB) and `notify_stakeholder`.
 """
-from typing import Dict, Any, List
-from school_dropout_agent.infrastructure.memory.database_memory import DatabaseMemoryService
+import atexit
+from typing import Dict, Any, List, Optional
+from google.adk.tools.tool_context import ToolContext
+from school_dropout_agent.infrastructure.memory.memory_provider import resolve_memory_service
+from school_dropout_agent.infrastructure.notifications.digest_service import NotificationDigestService
+from school_dropout_agent.infrastructure.notifications.mock_sender import MockNotificationSender
+from school_dropout_agent.infrastructure.analytics.intervention_reviews import intervention_reviews
+from school_dropout_agent.infrastructure.mock_data import MockDataStore
 
-memory_service = DatabaseMemoryService()
+# Shared across students so each recipient gets one digest per window
+notification_service = NotificationDigestService(MockNotificationSender())
+atexit.register(notification_service.shutdown)
 
-def create_intervention(student_id: str, intervention_type: str, description: str) -> Dict[str, Any]:
+def _recipient_for(stakeholder_type: str, student_id: str) -> Optional[str]:
+    """The student's actual teacher, counselor or parent contact, when known."""
+    if stakeholder_type.lower() == "parent":
+        return (MockDataStore.get_student_data(student_id, "family") or {}).get("email")
+    return (MockDataStore.get_student_data(student_id, "contacts") or {}).get(stakeholder_type.lower())
+
+def create_intervention(
+    student_id: str,
+    intervention_type: str,
+    description: str,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
     """
     Creates a new intervention record and saves it to the database.
     """
@@ -24,21 +43,33 @@ def create_intervention(student_id: str, intervention_type: str, description: st
         "created_at": datetime.now().isoformat()
     }
     
-    # Save to database
-    memory_service.store_intervention(student_id, intervention_data)
+    # Save to database, with the metrics the monitoring sweep will compare against
+    resolve_memory_service(tool_context).store_intervention(student_id, intervention_data)
+    intervention_reviews.capture_baselines({intervention_id: student_id})
     
     return intervention_data
 
-def notify_stakeholder(stakeholder_type: str, student_id: str, message: str) -> Dict[str, Any]:
+def notify_stakeholder(
+    stakeholder_type: str,
+    student_id: str,
+    message: str,
+    recipient_id: Optional[str] = None
+) -> Dict[str, Any]:
     """
-    Sends a notification to a stakeholder (teacher, counselor, parent).
+    Queues a notification to a stakeholder (teacher, counselor, parent).
+    Notifications are delivered as a periodic digest per recipient.
     """
+    from datetime import datetime
+
+    recipient_id = recipient_id or _recipient_for(stakeholder_type, student_id)
+    digest_status = notification_service.enqueue(stakeholder_type, student_id, message, recipient_id)
     return {
         "stakeholder_type": stakeholder_type,
         "student_id": student_id,
         "message": message,
-        "status": "Sent",
-        "timestamp": "2025-11-20T14:00:00"
+        "status": "Queued",
+        "timestamp": datetime.now().isoformat(),
+        **digest_status
     }
 
 def get_active_interventions(student_id: str) -> Dict[str, Any]:
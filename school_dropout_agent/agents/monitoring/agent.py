@@ -4,6 +4,9 @@ It tracks the progress of interventions and student performance over time.
 Used for follow-up queries and long-term tracking.
 """
 from google.adk.agents.llm_agent import Agent
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from .tools import get_intervention_outcome, compare_metrics, record_outcome
 
 MONITORING_AGENT_INSTRUCTION = """
@@ -13,24 +16,25 @@ Your goal is to track the effectiveness of interventions and adjust plans as nee
 You have access to the following tools:
 - `get_intervention_outcome`: Check the status and outcome of an intervention.
 - `compare_metrics`: Compare student metrics before and after intervention.
-- `record_outcome`: Record the final outcome of an intervention.
+- `record_outcome`: Record the outcome of an intervention ("Improved", "No Change" or "Declined"). Improved closes it; pass `close=true` to close an intervention that is being replaced.
+- `get_intervention_effectiveness`: Check how effective an intervention type has been for similar risk bands and majors.
 
 **Monitoring Criteria:**
 1. Compare attendance, GPA, and LMS activity before and after intervention.
 2. Determine if the intervention was effective (metrics improved).
-3. Recommend continuation, adjustment, or closure of the intervention.
+3. Recommend continuation, adjustment, or closure of the intervention; when adjusting, suggest the intervention types with the best effectiveness for the student's risk band and major.
 
 **Output Format:**
 1. Call `save_agent_result` with the full monitoring report JSON.
 2. Return a BRIEF 1-sentence summary (e.g., "Intervention effective, attendance improved by 10%.").
 """
 
-from school_dropout_agent.agents.orchestrator.tools import save_agent_result
+from school_dropout_agent.agents.orchestrator.tools import save_agent_result, get_intervention_effectiveness
 
 class MonitoringAgent(Agent):
     def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
         super().__init__(
-            model=model_name,
+            model=build_model(model_name),
             name="monitoring_agent",
             description="Tracks intervention effectiveness and outcomes.",
             instruction=MONITORING_AGENT_INSTRUCTION,
@@ -38,7 +42,10 @@ class MonitoringAgent(Agent):
                 get_intervention_outcome,
                 compare_metrics,
                 record_outcome,
+                get_intervention_effectiveness,
                 save_agent_result
-            ]
+            ],
+            **instrumentation.agent_callbacks()
         )
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
@@ -0,0 +1,178 @@
+"""
+This module defines the MonitoringSweep.
+It reviews every open intervention that is past its review date in one set-based pass: a single query for the
+due interventions, one feature extraction for their students and one NumPy comparison against the baselines.
+Only interventions flagged for escalation or closure are handed to the MonitoringAgent.
+Usage: python -m school_dropout_agent.agents.monitoring.sweep [--once]
+"""
+import argparse
+import asyncio
+import json
+import os
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from school_dropout_agent.core.domain.intervention import InterventionType
+from school_dropout_agent.infrastructure.analytics.intervention_reviews import (
+    METRIC_NAMES, intervention_reviews, metric_changes, metric_values, normalize_intervals
+)
+from school_dropout_agent.infrastructure.features.student_features import build_feature_matrix
+
+ESCALATE = "escalate"
+CLOSE = "close"
+CONTINUE = "continue"
+
+SWEEP_INTERVAL_SECONDS = float(os.getenv("MONITORING_SWEEP_INTERVAL_SECONDS", "86400"))
+
+MONITORING_PROMPT = (
+    "Review intervention {intervention_id} ({type}) for student {student_id}. "
+    "The monitoring sweep recommends to {decision} it; metric changes since it started: {changes}. "
+    "Confirm with your tools, record the outcome if it should be closed, and recommend next steps."
+)
+
+class MonitoringSweep:
+    """
+    Batch review of due interventions.
+
+    An intervention is flagged for escalation when its mean improvement (in metric scales, see
+    `REVIEW_METRICS`) is at or below `escalate_score`, or any single metric declined by `severe_decline`
+    scales or more; it is flagged for closure when its mean improvement reaches `close_score`.
+    Interventions without a baseline get one captured now and are compared at their next review.
+    """
+
+    def __init__(
+        self,
+        runner=None,
+        escalate_score: float = -0.5,
+        close_score: float = 1.0,
+        severe_decline: float = 2.0,
+        intervals: Optional[Dict[Union[InterventionType, str], float]] = None
+    ):
+        self.runner = runner
+        self.escalate_score = escalate_score
+        self.close_score = close_score
+        self.severe_decline = severe_decline
+        self.intervals = normalize_intervals(intervals)
+
+    @classmethod
+    def for_agent(cls, memory_service=None, model_name: str = "gemini-2.5-flash", **kwargs) -> "MonitoringSweep":
+        """Sweep whose flagged cases are reviewed by a MonitoringAgent."""
+        from school_dropout_agent.agents.monitoring.agent import MonitoringAgent
+        from school_dropout_agent.agents.orchestrator.runner import AnalysisRunner
+
+        runner = AnalysisRunner(
+            agent=MonitoringAgent(memory_service=memory_service, model_name=model_name),
+            memory_service=memory_service
+        )
+        return cls(runner=runner, **kwargs)
+
+    def evaluate(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """Review every due intervention without calling the LLM and return the flagged ones."""
+        now = now or datetime.now()
+        due = intervention_reviews.due(now, self.intervals)
+        if not due:
+            return {"reviewed": 0, "baselines_captured": 0, "continued": 0, "flagged": []}
+
+        student_ids = list(dict.fromkeys(row["student_id"] for row in due))
+        matrix = build_feature_matrix(student_ids)
+        positions = {student_id: i for i, student_id in enumerate(matrix.student_ids)}
+        features = [dict(zip(matrix.feature_names, values)) for values in matrix.values.tolist()]
+
+        current = np.array([metric_values(features[positions[row["student_id"]]]) for row in due])
+        has_baseline = np.array([row["baseline"] is not None for row in due])
+        baseline = np.array([
+            metric_values(row["baseline"]) if row["baseline"] is not None else current[i]
+            for i, row in enumerate(due)
+        ])
+        changes = metric_changes(baseline, current)
+        score, improvement = changes["score"], changes["improvement"]
+
+        escalate = has_baseline & ((score <= self.escalate_score) | (improvement.min(axis=1) <= -self.severe_decline))
+        close = has_baseline & ~escalate & (score >= self.close_score)
+        decisions = np.where(escalate, ESCALATE, np.where(close, CLOSE, CONTINUE))
+
+        reviews, flagged = [], []
+        for i, row in enumerate(due):
+            review = {
+                "intervention_id": row["intervention_id"],
+                "student_id": row["student_id"],
+                "decision": str(decisions[i]),
+                "score": round(float(score[i]), 3),
+                # Interventions without a baseline start one from today's features
+                "baseline": None if has_baseline[i] else features[positions[row["student_id"]]]
+            }
+            reviews.append(review)
+            if review["decision"] != CONTINUE:
+                flagged.append({
+                    "intervention_id": row["intervention_id"],
+                    "student_id": row["student_id"],
+                    "type": row["type"],
+                    "decision": review["decision"],
+                    "score": review["score"],
+                    "changes": {
+                        name: round(float(changes["deltas"][i, j]), 3)
+                        for j, name in enumerate(METRIC_NAMES) if changes["deltas"][i, j]
+                    }
+                })
+        intervention_reviews.mark_reviewed(reviews, now)
+
+        return {
+            "reviewed": len(due),
+            "baselines_captured": int((~has_baseline).sum()),
+            "continued": len(due) - len(flagged),
+            "flagged": flagged
+        }
+
+    async def run(self, now: Optional[datetime] = None, concurrency: int = 4) -> Dict[str, Any]:
+        """Evaluate the due interventions, then run the MonitoringAgent on each flagged one."""
+        report = self.evaluate(now)
+        if self.runner is None or not report["flagged"]:
+            return report
+
+        semaphore = asyncio.Semaphore(concurrency)
+        failed: Dict[str, str] = {}
+
+        async def review(case: Dict[str, Any]):
+            async with semaphore:
+                try:
+                    await self.runner.analyze_student(case["student_id"], prompt=MONITORING_PROMPT.format(**case))
+                except Exception as e:
+                    failed[case["intervention_id"]] = f"{type(e).__name__}: {e}"
+
+        await asyncio.gather(*(review(case) for case in report["flagged"]))
+        report["agent_reviews"] = len(report["flagged"]) - len(failed)
+        report["failed"] = failed
+        return report
+
+    async def run_periodically(
+        self,
+        interval_seconds: float = SWEEP_INTERVAL_SECONDS,
+        on_result: Optional[Callable[[Dict[str, Any]], Any]] = None,
+        concurrency: int = 4
+    ) -> None:
+        """Sweep every `interval_seconds` until cancelled; `on_result` receives each sweep report."""
+        while True:
+            report = await self.run(concurrency=concurrency)
+            if on_result is not None:
+                on_result(report)
+            await asyncio.sleep(interval_seconds)
+
+def main():
+    parser = argparse.ArgumentParser(description="Review due interventions on a schedule, escalating or closing flagged ones.")
+    parser.add_argument("--once", action="store_true", help="Run a single sweep and exit")
+    parser.add_argument("--interval-seconds", type=float, default=SWEEP_INTERVAL_SECONDS)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--model", default="gemini-2.5-flash")
+    args = parser.parse_args()
+
+    sweep = MonitoringSweep.for_agent(model_name=args.model)
+    print_report = lambda report: print(json.dumps(report, default=str), flush=True)
+    if args.once:
+        print_report(asyncio.run(sweep.run(concurrency=args.concurrency)))
+    else:
+        asyncio.run(sweep.run_periodically(args.interval_seconds, print_report, args.concurrency))
+
+if __name__ == "__main__":
+    main()
@@ -1,56 +1,85 @@
 """
 This module defines tools for the Monitoring Agent.
-It provides functionality to check intervention status and recent academic progress.
+It provides functionality to check intervention status and recent academic progress, and to persist intervention outcomes.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
 from datetime import datetime, timedelta
-from school_dropout_agent.infrastructure.mock_data import MockDataStore
 
+import numpy as np
+
+from school_dropout_agent.infrastructure.features.student_features import build_feature_matrix
+from school_dropout_agent.infrastructure.analytics.intervention_reviews import (
+    METRIC_NAMES, intervention_reviews, metric_changes, metric_values
+)
+from school_dropout_agent.core.encoding.compact_output import compact_tool
+from school_dropout_agent.infrastructure.analytics.intervention_effectiveness import intervention_effectiveness
+
+# Change (in metric scales) needed to call a metric improving or declining
+TREND_THRESHOLD = 0.5
+
+@compact_tool()
 def get_intervention_outcome(intervention_id: str) -> Dict[str, Any]:
     """
-    Retrieves the outcome of a specific intervention.
+    Retrieves the recorded outcome of a specific intervention,
+    with the effectiveness of its intervention type for the same risk band and major.
     """
-    # Mock data
-    return {
-        "intervention_id": intervention_id,
-        "status": "Completed",
-        "outcome": "Improved",
-        "notes": "Student attended tutoring sessions and grades improved."
-    }
+    outcome = intervention_effectiveness.get_outcome(intervention_id)
+    if outcome is None:
+        return {
+            "intervention_id": intervention_id,
+            "status": "not_recorded",
+            "message": "No outcome has been recorded for this intervention yet."
+        }
+    outcome["effectiveness"] = intervention_effectiveness.stats(
+        outcome["intervention_type"], outcome["risk_band"], outcome["major"]
+    )
+    return outcome
 
+@compact_tool()
 def compare_metrics(student_id: str) -> Dict[str, Any]:
     """
-    Compares current metrics with historical data.
+    Compares current metrics with the baseline captured when the student's latest open intervention was created.
     """
-    # Fetch current data from MockDataStore
-    current_attendance = MockDataStore.get_student_data(student_id, "attendance")
-    current_grades = MockDataStore.get_student_data(student_id, "grades")
-    
-    # Mock historical data (e.g., from last month)
-    # In a real system, this would query the database for past records
-    
-    attendance_trend = "Stable"
-    if current_attendance and current_attendance.get("attendance_rate", 1.0) < 0.8:
-        attendance_trend = "Declining"
-        
-    grade_trend = "Stable"
-    if current_grades and current_grades.get("failed_courses", 0) > 0:
-        grade_trend = "Declining"
+    current = build_feature_matrix([student_id]).row(student_id)
+    baseline = intervention_reviews.latest_baseline(student_id)
+    if baseline is None:
+        # No baseline yet: fall back to the current values against fixed thresholds
+        return {
+            "student_id": student_id,
+            "attendance_trend": "Declining" if current["attendance_rate"] < 0.8 else "Stable",
+            "grade_trend": "Declining" if current["failed_courses"] > 0 else "Stable",
+            "notes": "No intervention baseline recorded; trends are based on current thresholds."
+        }
 
+    changes = metric_changes(np.array([metric_values(baseline["baseline"])]), np.array([metric_values(current)]))
+    trends = {
+        name: "Improving" if improvement >= TREND_THRESHOLD else "Declining" if improvement <= -TREND_THRESHOLD else "Stable"
+        for name, improvement in zip(METRIC_NAMES, changes["improvement"][0].tolist())
+    }
     return {
         "student_id": student_id,
-        "attendance_trend": attendance_trend,
-        "grade_trend": grade_trend,
-        "notes": "Comparison based on mock historical baseline."
+        "intervention_id": baseline["intervention_id"],
+        "baseline_at": baseline["baseline_at"],
+        "attendance_trend": trends["attendance_rate"],
+        "grade_trend": trends["current_gpa"],
+        "improvement_score": round(float(changes["score"][0]), 3),
+        "metrics": {
+            name: {
+                "baseline": round(float(baseline["baseline"].get(name, 0.0)), 3),
+                "current": round(float(current[name]), 3),
+                "trend": trends[name]
+            } for name in METRIC_NAMES
+        }
     }
 
-def record_outcome(intervention_id: str, outcome: str, notes: str) -> Dict[str, Any]:
+def record_outcome(intervention_id: str, outcome: str, notes: str, close: Optional[bool] = None) -> Dict[str, Any]:
     """
-    Records the outcome of an intervention.
+    Records the outcome of an intervention ("Improved", "No Change" or "Declined").
+    Improved outcomes resolve the intervention; No Change and Declined keep it open for continuation or
+    adjustment. Pass `close` to override (e.g. close=True to end an intervention that did not work).
+    Recording again for the same intervention corrects the previous outcome.
     """
-    return {
-        "intervention_id": intervention_id,
-        "outcome": outcome,
-        "notes": notes,
-        "recorded_at": datetime.now().isoformat()
-    }
+    record = intervention_effectiveness.record(intervention_id, outcome, notes, close)
+    if record is None:
+        return {"status": "not_found", "message": f"Intervention {intervention_id} does not exist"}
+    return {"status": "success", **record}
@@ -3,8 +3,12 @@ This module defines the DropoutPreventionOrchestrator agent.
 It acts as a Router, deciding whether to run a full analysis pipeline or answer specific questions based on existing data.
 """
 from google.adk.agents.llm_agent import Agent
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from school_dropout_agent.agents.orchestrator.pipeline import FullAnalysisPipeline
 from school_dropout_agent.agents.summary.agent import FinalSummaryAgent
+from school_dropout_agent.agents.orchestrator.tools import get_dashboard_counts
 
 ROUTER_INSTRUCTION = """
 You are the Dropout Prevention Orchestrator. You are the main interface for the system.
@@ -12,12 +16,14 @@ You are the Dropout Prevention Orchestrator. You are the main interface for the
 **Your Capabilities:**
 1. **Run Full Analysis**: If the user asks to analyze a student, assess risk, or create interventions, delegate to `full_analysis_pipeline`.
 2. **Provide Summary**: If the user asks about the results of the last assessment, or wants a summary of what happened, delegate to `final_summary_agent`.
+3. **Answer Dashboard Questions**: If the user asks how many students are at a risk level or in a major, or how many interventions are open, call `get_dashboard_counts` and answer directly.
 
 **Routing Logic:**
 - "Analyze student X" -> `full_analysis_pipeline`
 - "Check risk for student Y" -> `full_analysis_pipeline`
 - "What was the result?" -> `final_summary_agent`
 - "Show me the summary" -> `final_summary_agent`
+- "How many high-risk students are there?" -> `get_dashboard_counts`
 
 **Important:**
 - Do NOT run the full pipeline if the user is just asking about previous results.
@@ -37,12 +43,15 @@ class DropoutPreventionOrchestrator(Agent):
         ]
         
         super().__init__(
-            model=model_name,
+            model=build_model(model_name),
             name="dropout_prevention_orchestrator",
             description="Main router that coordinates student analysis and reporting.",
             instruction=ROUTER_INSTRUCTION,
-            sub_agents=sub_agents
+            sub_agents=sub_agents,
+            tools=[get_dashboard_counts],
+            **instrumentation.agent_callbacks()
         )
         
         # Store memory service after super().__init__()
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
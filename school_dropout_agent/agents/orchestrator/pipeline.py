@@ -1,22 +1,64 @@
 """
 This module defines the FullAnalysisPipeline.
 It uses SequentialAgent to ensure all sub-agents are called in the correct order for a full analysis.
+After the risk stage it routes Low-risk students down a short path (risk, then a brief summary);
+Medium and High risk students get every stage.
+Each stage's output is checkpointed by run ID so a failed run can resume from its first unfinished stage.
+Progress events (`pipeline_progress`) are emitted as stages save results, so partial results can be shown early.
 """
+import time
+from datetime import datetime
+from typing import Any, AsyncGenerator, Dict, List, Optional, Tuple
+
+from google.adk.agents.invocation_context import InvocationContext
 from google.adk.agents.sequential_agent import SequentialAgent
+from google.adk.events import Event, EventActions
+from google.adk.utils.context_utils import Aclosing
 from school_dropout_agent.agents.risk_prediction.agent import RiskPredictionAgent
 from school_dropout_agent.agents.emotional.agent import EmotionalBehavioralAgent
 from school_dropout_agent.agents.academic_support.agent import AcademicSupportAgent
 from school_dropout_agent.agents.intervention.agent import InterventionCoordinatorAgent
 from school_dropout_agent.agents.family.agent import FamilyEngagementAgent
 from school_dropout_agent.agents.monitoring.agent import MonitoringAgent
-from school_dropout_agent.agents.summary.agent import FinalSummaryAgent
+from school_dropout_agent.agents.summary.agent import FinalSummaryAgent, BriefSummaryAgent
+from school_dropout_agent.core.session.progress_bus import progress_bus
+from school_dropout_agent.core.session.shared_state import RESULT_KEY_PREFIX, result_key, saved_result
+from school_dropout_agent.infrastructure.checkpoints.checkpoint_store import CheckpointStore, COMPLETED
+from school_dropout_agent.infrastructure.memory.memory_provider import get_default_memory_service, register_agent_memory_service
+
+RISK_STAGE = "risk_prediction_agent"
+BRIEF_SUMMARY_STAGE = "brief_summary_agent"
+
+# Stages run for Low-risk students; everyone else runs every stage except the brief summary
+SHORT_PATH = (RISK_STAGE, BRIEF_SUMMARY_STAGE)
+SHORT_PATH_RISK_LEVELS = ("Low",)
+
+# Progress event kinds
+RISK_SAVED = "risk_saved"
+INTERVENTION_CREATED = "intervention_created"
+STAGE_COMPLETED = "stage_completed"
+STAGE_SKIPPED = "stage_skipped"
+PIPELINE_COMPLETED = "pipeline_completed"
 
 class FullAnalysisPipeline(SequentialAgent):
     """
     Sequential pipeline that runs the full student analysis workflow.
+
+    The run ID is read from the session state key `run_id` (defaulting to the invocation ID).
+    A stage's output is the result it saved in the session state (`save_agent_result`) during this run;
+    results left in the session by earlier runs are cleared when the pipeline starts.
+    When the state key `resume` is true, stages already checkpointed as completed for that run
+    are skipped and their saved outputs are restored into the session state.
+    The route taken and the stages it skipped are written to the state key `pipeline_route`
+    and checkpointed with status `skipped`.
+
+    Progress is reported as it happens, both as events carrying the state key `pipeline_progress`
+    and on the progress bus: `risk_saved` as soon as the risk level is stored, `intervention_created`
+    for each intervention, and `stage_completed` (with the stage's saved result) or `stage_skipped`
+    for every stage, then `pipeline_completed`.
     """
-    
-    def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
+
+    def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash", checkpoint_store=None, progress=None):
         # Initialize sub-agents with memory service
         # These will be called in sequence automatically
         sub_agents = [
@@ -25,14 +67,173 @@ class FullAnalysisPipeline(SequentialAgent):
             AcademicSupportAgent(memory_service=memory_service, model_name=model_name),
             InterventionCoordinatorAgent(memory_service=memory_service, model_name=model_name),
             FamilyEngagementAgent(memory_service=memory_service, model_name=model_name),
-            FinalSummaryAgent(memory_service=memory_service, model_name=model_name)
+            FinalSummaryAgent(memory_service=memory_service, model_name=model_name),
+            BriefSummaryAgent(memory_service=memory_service, model_name=model_name)
         ]
-        
+
         super().__init__(
             name="full_analysis_pipeline",
             description="Runs a complete analysis of the student, including risk prediction, emotional check, academic support, interventions, and family engagement.",
             sub_agents=sub_agents
         )
-        
+
         # Store memory service after super().__init__()
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
+        object.__setattr__(self, 'checkpoint_store', checkpoint_store or CheckpointStore())
+        object.__setattr__(self, 'progress', progress or progress_bus)
+
+    def stages_for(self, risk_level: Optional[str]) -> List[str]:
+        """Names of the stages to run after the risk stage has produced `risk_level`."""
+        if risk_level in SHORT_PATH_RISK_LEVELS:
+            return list(SHORT_PATH)
+        return [sub_agent.name for sub_agent in self.sub_agents if sub_agent.name != BRIEF_SUMMARY_STAGE]
+
+    async def _run_async_impl(self, ctx: InvocationContext) -> AsyncGenerator[Event, None]:
+        state = ctx.session.state
+        run_id = state.get("run_id") or ctx.invocation_id
+        student_id = state.get("student_id")
+        checkpoints = self.checkpoint_store.load(run_id) if state.get("resume") else {}
+
+        route: Optional[List[str]] = None
+        risk_level = None
+        ran, restored, skipped = [], [], []
+        outputs: Dict[str, Any] = {}
+        started = time.perf_counter()
+        sequence = 0
+
+        stale = {key: None for key, value in state.items() if key.startswith(RESULT_KEY_PREFIX) and value is not None}
+        if stale:
+            yield self._state_event(ctx, stale)
+
+        def progress_event(kind: str, stage: Optional[str], **details: Any) -> Event:
+            nonlocal sequence
+            sequence += 1
+            payload = {
+                "run_id": run_id,
+                "student_id": student_id,
+                "sequence": sequence,
+                "kind": kind,
+                "stage": stage,
+                "elapsed_seconds": round(time.perf_counter() - started, 3),
+                **details
+            }
+            self.progress.publish(payload)
+            return self._state_event(ctx, {"pipeline_progress": payload})
+
+        for sub_agent in self.sub_agents:
+            if route is not None and sub_agent.name not in route:
+                self.checkpoint_store.mark_skipped(run_id, sub_agent.name, student_id)
+                skipped.append(sub_agent.name)
+                yield progress_event(STAGE_SKIPPED, sub_agent.name)
+                continue
+
+            checkpoint = checkpoints.get(sub_agent.name)
+            if checkpoint and checkpoint["status"] == COMPLETED:
+                if checkpoint["output"] is not None:
+                    outputs[sub_agent.name] = checkpoint["output"]
+                    yield self._state_event(ctx, {result_key(sub_agent.name): checkpoint["output"]})
+                restored.append(sub_agent.name)
+            else:
+                pause_invocation = False
+                calls: Dict[str, Dict[str, Any]] = {}
+                stage_started = datetime.now()
+                try:
+                    async with Aclosing(sub_agent.run_async(ctx)) as agen:
+                        async for event in agen:
+                            yield event
+                            if ctx.should_pause_invocation(event):
+                                pause_invocation = True
+                            saved = saved_result(event.actions.state_delta if event.actions else None, sub_agent.name)
+                            if saved is not None:
+                                outputs[sub_agent.name] = saved
+                            for kind, fields in self._tool_progress(event, calls):
+                                yield progress_event(kind, sub_agent.name, **fields)
+                except Exception as e:
+                    self.checkpoint_store.mark_failed(run_id, sub_agent.name, student_id, f"{type(e).__name__}: {e}")
+                    raise
+
+                if pause_invocation:
+                    return
+                self.checkpoint_store.mark_completed(run_id, sub_agent.name, student_id, outputs.get(sub_agent.name))
+                ran.append(sub_agent.name)
+
+            details: Dict[str, Any] = {
+                "status": "restored" if sub_agent.name in restored else "ran",
+                # Only what this stage saved in this run (or its restored checkpoint)
+                "result": outputs.get(sub_agent.name)
+            }
+            if sub_agent.name == RISK_STAGE:
+                # A restored stage's profile may have been overwritten since; only its checkpointed result counts
+                fresh_since = None if sub_agent.name in restored else stage_started
+                risk_level = self._risk_level(student_id, outputs.get(RISK_STAGE), fresh_since)
+                route = self.stages_for(risk_level)
+                details.update(risk_level=risk_level, path="short" if route == list(SHORT_PATH) else "full")
+            yield progress_event(STAGE_COMPLETED, sub_agent.name, **details)
+
+        pipeline_route = {
+            "run_id": run_id,
+            "risk_level": risk_level,
+            "path": "short" if route == list(SHORT_PATH) else "full",
+            "stages_run": ran,
+            "stages_restored": restored,
+            "stages_skipped": skipped
+        }
+        yield progress_event(PIPELINE_COMPLETED, None, route=pipeline_route)
+        yield self._state_event(ctx, {"pipeline_route": pipeline_route})
+
+    def _state_event(self, ctx: InvocationContext, state_delta: Dict[str, Any]) -> Event:
+        return Event(
+            invocation_id=ctx.invocation_id,
+            author=self.name,
+            branch=ctx.branch,
+            actions=EventActions(state_delta=state_delta)
+        )
+
+    @staticmethod
+    def _tool_progress(event: Event, calls: Dict[str, Dict[str, Any]]) -> List[Tuple[str, Dict[str, Any]]]:
+        """
+        Progress found in a stage event: the risk level once `save_risk_assessment` has stored it,
+        and each intervention once it has been created. `calls` holds the arguments of pending tool calls by ID.
+        """
+        for call in event.get_function_calls():
+            calls[call.id or call.name] = call.args or {}
+        found = []
+        for response in event.get_function_responses():
+            args = calls.pop(response.id or response.name, {})
+            result = response.response or {}
+            if response.name == "save_risk_assessment" and result.get("status") == "success":
+                found.append((RISK_SAVED, {
+                    "risk_level": args.get("risk_level"),
+                    "risk_score": args.get("risk_score"),
+                    "risk_factors": args.get("risk_factors", [])
+                }))
+            elif response.name == "create_intervention" and result.get("intervention_id"):
+                found.append((INTERVENTION_CREATED, {"intervention": result}))
+            elif response.name == "save_intervention_plan" and result.get("status") == "success":
+                for intervention, intervention_id in zip(args.get("interventions", []), result.get("created_intervention_ids", [])):
+                    found.append((INTERVENTION_CREATED, {"intervention": {**intervention, "intervention_id": intervention_id}}))
+        return found
+
+    def _risk_level(
+        self,
+        student_id: Optional[str],
+        risk_result: Any = None,
+        fresh_since: Optional[datetime] = None
+    ) -> Optional[str]:
+        """
+        The level `save_risk_assessment` stored for the student, if it was stored during this run (at or after
+        `fresh_since`); otherwise the risk stage's own result from this run. A profile left over from an earlier
+        run never routes the student, so a risk stage that saved nothing takes the full path.
+        """
+        if student_id and fresh_since is not None:
+            memory_service = self.memory_service or get_default_memory_service()
+            profile = memory_service.get_risk_profiles([student_id]).get(student_id) or {}
+            last_updated = profile.get("last_updated")
+            if isinstance(last_updated, str):
+                last_updated = datetime.fromisoformat(last_updated)
+            if profile.get("risk_level") and last_updated is not None and last_updated >= fresh_since:
+                return str(profile["risk_level"]).capitalize()
+        if isinstance(risk_result, dict) and risk_result.get("risk_level") and risk_result.get("student_id") == student_id:
+            return str(risk_result["risk_level"]).capitalize()
+        return None
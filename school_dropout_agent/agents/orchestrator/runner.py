@@ -0,0 +1,204 @@
+"""
+This module defines the AnalysisRunner.
+It wires an agent (the FullAnalysisPipeline by default) to an ADK Runner, a session service and the memory service,
+so batch jobs, benchmarks and schedulers can analyze students programmatically instead of through `adk web`.
+"""
+import asyncio
+import logging
+import uuid
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional
+
+from google.adk import Runner
+from google.adk.events import Event
+from google.adk.sessions import BaseSessionService, InMemorySessionService
+from google.genai.types import Content, Part
+
+from school_dropout_agent.core.session.session_manager import SessionManager
+from school_dropout_agent.infrastructure.analytics.dashboard_counters import dashboard_counters
+from school_dropout_agent.infrastructure.memory.memory_provider import (
+    MEMORY_SERVICE_STATE_KEY, get_default_memory_service, register_memory_service
+)
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+APP_NAME = "dropout_prevention"
+
+ANALYSIS_PROMPT = "Please analyze student {student_id} for dropout risk and create appropriate interventions."
+
+class AnalysisRunner:
+    """
+    Runs the analysis pipeline for one student at a time, each in its own session.
+    """
+
+    def __init__(
+        self,
+        agent=None,
+        memory_service=None,
+        session_service: Optional[BaseSessionService] = None,
+        model_name="gemini-2.5-flash",
+        app_name: str = APP_NAME
+    ):
+        self.memory_service = memory_service or get_default_memory_service()
+        # Sessions name the runner's service so tools use it even when other runners share agent names
+        self.memory_service_id = register_memory_service(self.memory_service)
+        self.session_service = session_service or InMemorySessionService()
+        self.session_manager = SessionManager(self.session_service, self.memory_service)
+        self.app_name = app_name
+
+        if agent is None:
+            from school_dropout_agent.agents.orchestrator.pipeline import FullAnalysisPipeline
+            agent = FullAnalysisPipeline(memory_service=self.memory_service, model_name=model_name)
+        self.agent = agent
+        self.runner = Runner(
+            agent=agent,
+            session_service=self.session_service,
+            app_name=app_name,
+            plugins=[instrumentation.plugin()]
+        )
+
+    async def stream_student(
+        self,
+        student_id: str,
+        user_id: str = "system",
+        session_id: Optional[str] = None,
+        prompt: Optional[str] = None,
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        session=None
+    ) -> AsyncGenerator[Event, None]:
+        """
+        Create a session for the student and yield pipeline events as they are produced.
+        Pass the `run_id` of an earlier attempt with `resume=True` to skip its completed stages.
+        A `session` created beforehand (e.g. by `create_student_sessions`) is used as is.
+        """
+        if session is None:
+            extra_state = {MEMORY_SERVICE_STATE_KEY: self.memory_service_id}
+            if run_id:
+                extra_state.update({"run_id": run_id, "resume": resume})
+            session = await self.session_manager.create_student_session(
+                app_name=self.app_name,
+                user_id=user_id,
+                student_id=student_id,
+                session_id=session_id or f"analysis_{student_id}_{uuid.uuid4().hex[:8]}",
+                extra_state=extra_state
+            )
+        message = Content(role="user", parts=[Part(text=prompt or ANALYSIS_PROMPT.format(student_id=student_id))])
+        async for event in self.runner.run_async(new_message=message, user_id=user_id, session_id=session.id):
+            yield event
+
+    async def analyze_student(
+        self,
+        student_id: str,
+        user_id: str = "system",
+        session_id: Optional[str] = None,
+        prompt: Optional[str] = None,
+        run_id: Optional[str] = None,
+        resume: bool = False,
+        session=None
+    ) -> List[Event]:
+        """Run the full analysis for one student and return every event."""
+        return [
+            event async for event in self.stream_student(student_id, user_id, session_id, prompt, run_id, resume, session)
+        ]
+
+    async def stream_progress(
+        self,
+        student_id: str,
+        user_id: str = "system",
+        session_id: Optional[str] = None,
+        run_id: Optional[str] = None,
+        resume: bool = False
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """Run the full analysis for one student, yielding only its `pipeline_progress` payloads as they arrive."""
+        async for event in self.stream_student(student_id, user_id, session_id, run_id=run_id, resume=resume):
+            progress = event.actions.state_delta.get("pipeline_progress") if event.actions else None
+            if progress:
+                yield progress
+
+    async def analyze_cohort(
+        self,
+        student_ids: List[str],
+        cohort_run_id: str,
+        resume: bool = True,
+        concurrency: int = 1,
+        user_id: str = "system",
+        on_progress: Optional[Callable[[Dict[str, Any]], None]] = None,
+        prescreen: bool = True
+    ) -> Dict[str, Any]:
+        """
+        Analyze a cohort under one run ID. Each student's run is `<cohort_run_id>:<student_id>`,
+        so rerunning a crashed cohort with the same ID skips finished students and resumes
+        partially finished ones from their first incomplete stage.
+        `on_progress` receives each student's `pipeline_progress` payloads as they are produced.
+        With `prescreen`, the cohort is first screened for emotional distress without model calls,
+        and flagged students are analyzed first.
+        """
+        run_ids = {student_id: f"{cohort_run_id}:{student_id}" for student_id in student_ids}
+        finished = set()
+        checkpoint_store = getattr(self.agent, "checkpoint_store", None)
+        if resume and checkpoint_store is not None:
+            stages = [sub_agent.name for sub_agent in self.agent.sub_agents]
+            finished = checkpoint_store.completed_runs(list(run_ids.values()), stages)
+
+        pending = [student_id for student_id in student_ids if run_ids[student_id] not in finished]
+        flagged: List[str] = []
+        if prescreen and pending:
+            from school_dropout_agent.agents.emotional.tools import prescreen_emotional_distress
+            screening = await asyncio.to_thread(prescreen_emotional_distress, pending)
+            flagged = [student_id for student_id in pending if screening[student_id]["flagged"]]
+            # A stable sort keeps the cohort's order within flagged and unflagged students
+            pending.sort(key=lambda student_id: not screening[student_id]["flagged"])
+        sessions = await self.session_manager.create_student_sessions(
+            app_name=self.app_name,
+            user_id=user_id,
+            student_ids=pending,
+            session_ids={student_id: f"analysis_{student_id}_{uuid.uuid4().hex[:8]}" for student_id in pending},
+            extra_state={
+                student_id: {"run_id": run_ids[student_id], "resume": resume, MEMORY_SERVICE_STATE_KEY: self.memory_service_id}
+                for student_id in pending
+            }
+        )
+
+        semaphore = asyncio.Semaphore(concurrency)
+        failed: Dict[str, str] = {}
+        stages_skipped: Dict[str, int] = {}
+
+        async def run(student_id: str):
+            async with semaphore:
+                try:
+                    async for event in self.stream_student(student_id, user_id=user_id, session=sessions[student_id]):
+                        state_delta = event.actions.state_delta if event.actions else {}
+                        if on_progress is not None and state_delta.get("pipeline_progress"):
+                            try:
+                                on_progress(state_delta["pipeline_progress"])
+                            except Exception:
+                                # As on the progress bus, a failing callback never fails the student's analysis
+                                logger.exception("on_progress failed for %s", student_id)
+                        if state_delta.get("pipeline_route"):
+                            stages_skipped[student_id] = len(state_delta["pipeline_route"]["stages_skipped"])
+                except Exception as e:
+                    failed[student_id] = f"{type(e).__name__}: {e}"
+
+        # Deliver due digests while the cohort runs, and everything still buffered once it is done;
+        # long cohorts also repair dashboard counter drift on the reconcile schedule
+        from school_dropout_agent.agents.intervention.tools import notification_service
+        background = [
+            asyncio.create_task(notification_service.run()),
+            asyncio.create_task(dashboard_counters.reconcile_periodically(delay_first=True))
+        ]
+        try:
+            await asyncio.gather(*(run(student_id) for student_id in pending))
+        finally:
+            for task in background:
+                task.cancel()
+            notification_service.flush_all()
+
+        return {
+            "cohort_run_id": cohort_run_id,
+            "skipped": len(student_ids) - len(pending),
+            "completed": len(pending) - len(failed),
+            "failed": failed,
+            "stages_skipped": sum(stages_skipped.values()),
+            "emotionally_flagged": flagged
+        }
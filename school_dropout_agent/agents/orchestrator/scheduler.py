@@ -0,0 +1,205 @@
+"""
+This module defines the AnalysisScheduler.
+It sits in front of the FullAnalysisPipeline and decides which student is analyzed next,
+ordering jobs by last known risk score, staleness of the last assessment and explicit counselor requests.
+A fixed pool of workers drains the queue; producers are held back when the queue is full,
+and urgent jobs jump to the front without waiting for space.
+"""
+import asyncio
+import heapq
+import itertools
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional
+
+from school_dropout_agent.infrastructure.memory.memory_provider import get_default_memory_service
+
+async def summarize_run(events: AsyncIterator[Any]) -> Dict[str, Any]:
+    """Consume a run's event stream, keeping only its route and stage counts instead of the events."""
+    summary: Dict[str, Any] = {
+        "events": 0, "risk_level": None, "route": None, "stages_run": 0, "stages_restored": 0, "stages_skipped": 0
+    }
+    async for event in events:
+        summary["events"] += 1
+        route = event.actions.state_delta.get("pipeline_route") if event.actions else None
+        if route:
+            summary["risk_level"] = route.get("risk_level")
+            summary["route"] = route.get("path")
+            for key in ("stages_run", "stages_restored", "stages_skipped"):
+                summary[key] = len(route.get(key, []))
+    return summary
+
+@dataclass(order=True)
+class AnalysisJob:
+    # Lower sorts first; urgent jobs use -inf and keep FIFO order through `sequence`
+    priority: float
+    sequence: int
+    student_id: str = field(compare=False)
+    requested_by: Optional[str] = field(compare=False, default=None)
+    urgent: bool = field(compare=False, default=False)
+    enqueued_at: datetime = field(compare=False, default_factory=datetime.now)
+
+class AnalysisScheduler:
+    """
+    Priority queue plus worker pool for student analyses.
+
+    `handler` runs one job; its return value is kept in `results` for the scheduler's lifetime, so it should be
+    a small summary rather than the run's events (`for_runner` keeps only `summarize_run`'s route and stage counts).
+    Priority is the weighted sum of the last risk score (0-1), the assessment's age relative to
+    `staleness_horizon_days` (capped at 1) and a bonus for counselor requests; higher runs sooner.
+    Students that were never assessed count as maximally stale with a neutral risk of 0.5.
+    A student already waiting in the queue is not queued twice; resubmitting only raises its priority.
+    Workers start on `start()`, or on their own when a producer would otherwise wait on a full queue.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[AnalysisJob], Awaitable[Any]],
+        memory_service=None,
+        workers: int = 4,
+        max_queue_size: int = 1000,
+        risk_weight: float = 0.6,
+        staleness_weight: float = 0.3,
+        request_weight: float = 0.5,
+        staleness_horizon_days: float = 30.0
+    ):
+        self.handler = handler
+        self.memory_service = memory_service or get_default_memory_service()
+        self.workers = workers
+        self.max_queue_size = max_queue_size
+        self.risk_weight = risk_weight
+        self.staleness_weight = staleness_weight
+        self.request_weight = request_weight
+        self.staleness_horizon_days = staleness_horizon_days
+
+        self.results: Dict[str, Any] = {}
+        # "<type>: <message>" rather than the exception, whose traceback would pin the failed run's frames
+        self.errors: Dict[str, str] = {}
+        self._heap: List[AnalysisJob] = []
+        self._pending: Dict[str, AnalysisJob] = {}
+        self._sequence = itertools.count()
+        self._condition = asyncio.Condition()
+        self._in_flight = 0
+        self._tasks: List[asyncio.Task] = []
+        self._closed = False
+
+    @classmethod
+    def for_runner(cls, runner, **kwargs) -> "AnalysisScheduler":
+        """Scheduler that runs each job through an AnalysisRunner, keeping only a summary of each run."""
+        async def handler(job: AnalysisJob) -> Dict[str, Any]:
+            return await summarize_run(runner.stream_student(job.student_id))
+
+        return cls(handler, memory_service=runner.memory_service, **kwargs)
+
+    def priority_for(self, risk_profile: Optional[Dict[str, Any]], requested: bool = False) -> float:
+        """Score a job from its student's last risk profile; higher scores run sooner."""
+        if risk_profile and risk_profile.get("last_updated"):
+            age_days = (datetime.now() - datetime.fromisoformat(risk_profile["last_updated"])).total_seconds() / 86400
+            staleness = min(max(age_days, 0.0) / self.staleness_horizon_days, 1.0)
+            risk = risk_profile.get("risk_score") or 0.0
+        else:
+            staleness = 1.0
+            risk = 0.5
+        return (
+            self.risk_weight * risk
+            + self.staleness_weight * staleness
+            + (self.request_weight if requested else 0.0)
+        )
+
+    async def submit(
+        self,
+        student_id: str,
+        requested_by: Optional[str] = None,
+        urgent: bool = False
+    ) -> AnalysisJob:
+        """
+        Queue one student, waiting for space unless the job is urgent.
+        Returns the already queued job if the student is waiting with an equal or higher priority.
+        """
+        if urgent:
+            priority = float("-inf")
+        else:
+            profiles = self.memory_service.get_risk_profiles([student_id])
+            priority = -self.priority_for(profiles.get(student_id), requested=requested_by is not None)
+        return await self._push(AnalysisJob(priority, next(self._sequence), student_id, requested_by, urgent))
+
+    async def submit_many(self, student_ids: List[str], requested_by: Optional[str] = None) -> List[AnalysisJob]:
+        """
+        Queue a sweep. Priorities come from a single bulk risk lookup and jobs are pushed
+        highest-priority first, so backpressure never holds urgent students behind low-risk ones.
+        """
+        student_ids = list(dict.fromkeys(student_ids))
+        profiles = self.memory_service.get_risk_profiles(student_ids)
+        scored = sorted(
+            (-self.priority_for(profiles.get(student_id), requested=requested_by is not None), student_id)
+            for student_id in student_ids
+        )
+        return [
+            await self._push(AnalysisJob(priority, next(self._sequence), student_id, requested_by))
+            for priority, student_id in scored
+        ]
+
+    def start(self) -> None:
+        """Start the worker pool on the running event loop (no-op if it is already running)."""
+        if self._tasks:
+            return
+        self._closed = False
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def join(self) -> None:
+        """Wait until every queued and running job has finished."""
+        async with self._condition:
+            await self._condition.wait_for(lambda: not self._heap and self._in_flight == 0)
+
+    async def stop(self) -> None:
+        """Finish outstanding jobs, then shut the workers down."""
+        await self.join()
+        self._closed = True
+        async with self._condition:
+            self._condition.notify_all()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def pending(self) -> List[AnalysisJob]:
+        """Queued jobs in the order they will run."""
+        return sorted(self._heap)
+
+    async def _push(self, job: AnalysisJob) -> AnalysisJob:
+        async with self._condition:
+            if not job.urgent:
+                if not self._tasks and job.student_id not in self._pending and len(self._heap) >= self.max_queue_size:
+                    # Nothing drains the queue yet, so waiting for space would never end
+                    self.start()
+                await self._condition.wait_for(
+                    lambda: job.student_id in self._pending or len(self._heap) < self.max_queue_size
+                )
+            existing = self._pending.get(job.student_id)
+            if existing is not None:
+                if existing <= job:
+                    return existing
+                self._heap.remove(existing)
+                heapq.heapify(self._heap)
+            heapq.heappush(self._heap, job)
+            self._pending[job.student_id] = job
+            self._condition.notify_all()
+        return job
+
+    async def _worker(self) -> None:
+        while True:
+            async with self._condition:
+                await self._condition.wait_for(lambda: self._heap or self._closed)
+                if not self._heap:
+                    return
+                job = heapq.heappop(self._heap)
+                self._pending.pop(job.student_id, None)
+                self._in_flight += 1
+                self._condition.notify_all()
+
+            try:
+                self.results[job.student_id] = await self.handler(job)
+            except Exception as e:
+                self.errors[job.student_id] = f"{type(e).__name__}: {e}"
+            finally:
+                async with self._condition:
+                    self._in_flight -= 1
+                    self._condition.notify_all()
@@ -1,16 +1,30 @@
 """
 This module defines tools specifically for the Orchestrator.
-Currently includes `get_student_context` to retrieve past history.
+Currently includes `get_student_context` to retrieve past history, `get_student_history_page` to page in older interventions
+and `find_similar_students` to look up what was done for comparable students.
 Note: Persistence tools (`save_risk_assessment`, etc.) are imported here but used by sub-agents.
 """
 from typing import Dict, Any, List, Optional
-from school_dropout_agent.infrastructure.memory.database_memory import DatabaseMemoryService
-from school_dropout_agent.core.session.shared_state import SharedStateStore
+from google.adk.tools.tool_context import ToolContext
+from school_dropout_agent.infrastructure.memory.memory_provider import resolve_memory_service
+from school_dropout_agent.core.session.shared_state import SharedStateStore, save_session_result, session_results
+from school_dropout_agent.core.encoding.compact_output import compact_tool
+from school_dropout_agent.infrastructure.archive.result_archive import ResultArchive
+from school_dropout_agent.infrastructure.rules.rule_engine import rule_engine
+from school_dropout_agent.infrastructure.features.similarity_index import similar_student_index
+from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.infrastructure.analytics.intervention_effectiveness import intervention_effectiveness
+from school_dropout_agent.infrastructure.analytics.intervention_reviews import intervention_reviews
 
-# Initialize memory service
-memory_service = DatabaseMemoryService()
+result_archive = ResultArchive()
 
-def save_risk_assessment(student_id: str, risk_score: float, risk_level: str, risk_factors: List[str]) -> Dict[str, Any]:
+def save_risk_assessment(
+    student_id: str,
+    risk_score: float,
+    risk_level: str,
+    risk_factors: List[str],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
     """
     Saves the risk assessment results to the database.
     Useful for sharing risk data with other agents and persisting history.
@@ -20,13 +34,18 @@ def save_risk_assessment(student_id: str, risk_score: float, risk_level: str, ri
         "risk_level": risk_level,
         "risk_factors": risk_factors
     }
-    memory_service.update_risk_profile(student_id, risk_data)
+    resolve_memory_service(tool_context).update_risk_profile(student_id, risk_data)
     return {"status": "success", "message": f"Risk profile updated for {student_id}"}
 
-def save_intervention_plan(student_id: str, interventions: List[Dict[str, Any]]) -> Dict[str, Any]:
+def save_intervention_plan(
+    student_id: str,
+    interventions: List[Dict[str, Any]],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
     """
     Saves created interventions to the database.
     """
+    memory_service = resolve_memory_service(tool_context)
     created_ids = []
     for intervention in interventions:
         # Ensure type is string if it's an enum or other object
@@ -36,49 +55,158 @@ def save_intervention_plan(student_id: str, interventions: List[Dict[str, Any]])
         intervention_id = memory_service.store_intervention(student_id, intervention)
         created_ids.append(intervention_id)
         
+    intervention_reviews.capture_baselines({intervention_id: student_id for intervention_id in created_ids if intervention_id})
     return {"status": "success", "created_intervention_ids": created_ids}
 
-def get_student_context(student_id: str) -> Dict[str, Any]:
+@compact_tool()
+def get_student_context(student_id: str, tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
     """
-    Retrieves the full student context (profile, risk, interventions) from the database.
+    Retrieves the student context (profile, latest risk, recent interventions and intervention counts) from the database.
     Useful for giving agents the full picture before they start their task.
+    Use `get_student_history_page` for interventions older than the recent ones.
     """
-    history = memory_service.retrieve_student_history(student_id)
+    history = resolve_memory_service(tool_context).retrieve_compact_history(student_id)
     if not history:
         return {"status": "not_found", "message": f"No history found for {student_id}"}
     return history
 
+@compact_tool(max_items_arg="page_size")
+def get_student_history_page(
+    student_id: str,
+    page: int = 1,
+    page_size: int = 10,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
+    """
+    Retrieves one page of a student's intervention history, newest first (page 1 is the most recent).
+    Use this when the session's `student_history` only shows recent interventions and older ones are needed.
+    """
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), 50)
+    result = resolve_memory_service(tool_context).get_intervention_page(student_id, offset=(page - 1) * page_size, limit=page_size)
+    result["page"] = page
+    return result
+
+@compact_tool()
+def get_threshold_flags(student_id: str, rule_set: str) -> Dict[str, Any]:
+    """
+    Evaluates the configured threshold rules for a student and returns the IDs of the rules it matches.
+    `rule_set` is "risk" or "emotional".
+    """
+    return {
+        "student_id": student_id,
+        "rule_set": rule_set,
+        "flags": rule_engine.flags_for(rule_set, [student_id])[student_id],
+        "rules_version": rule_engine.version
+    }
+
+@compact_tool(max_items_arg="k")
+def find_similar_students(student_id: str, k: int = 5, tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Finds the k students whose attendance, grades, LMS, financial and emotional data are most similar,
+    with their latest risk level and recent interventions.
+    Useful for choosing interventions that worked for students like this one.
+    """
+    # The index is built offline; only a small cohort is indexed on first use
+    if not similar_student_index.ensure_loaded(MockDataStore.student_ids):
+        return {
+            "status": "index_not_built",
+            "message": "The similar-student index has not been built; run "
+                       "python -m school_dropout_agent.infrastructure.features.similarity_index"
+        }
+    # Refresh the student's own vector so the comparison uses current data
+    if MockDataStore.get_student_data(student_id, "profile"):
+        similar_student_index.upsert([student_id])
 
+    neighbours = similar_student_index.query(student_id, k=min(max(k, 1), 20))
+    histories = resolve_memory_service(tool_context).retrieve_compact_histories([sid for sid, _ in neighbours])
+    similar = []
+    for neighbour_id, distance in neighbours:
+        history = histories.get(neighbour_id) or {}
+        outcomes: Dict[str, Dict[str, int]] = {}
+        for intervention in history.get("recent_interventions", []):
+            by_status = outcomes.setdefault(intervention["type"], {})
+            by_status[intervention["status"]] = by_status.get(intervention["status"], 0) + 1
+        similar.append({
+            "student_id": neighbour_id,
+            "distance": distance,
+            "risk_level": (history.get("risk_profile") or {}).get("risk_level"),
+            "intervention_outcomes": outcomes,
+            "interventions": history.get("recent_interventions", [])
+        })
+    return {"student_id": student_id, "similar_students": similar}
 
-def save_agent_result(agent_name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+@compact_tool()
+def get_intervention_effectiveness(intervention_type: str = "All", risk_band: str = "All", major: str = "All") -> Dict[str, Any]:
+    """
+    Returns how often interventions led to improvement, from recorded outcomes.
+    With a specific `intervention_type`, returns that type's stats; with "All", ranks every type, most effective first.
+    `risk_band` ("High", "Medium", "Low") and `major` narrow the population; "All" covers everyone.
+    """
+    if intervention_type.lower() != "all":
+        return intervention_effectiveness.stats(intervention_type, risk_band, major)
+    return {"risk_band": risk_band, "major": major, "by_type": intervention_effectiveness.compare_types(risk_band, major)}
+
+@compact_tool()
+def get_dashboard_counts(tool_context: Optional[ToolContext] = None) -> Dict[str, Any]:
+    """
+    Returns the institution-wide dashboard: how many students are at each risk level and in each major
+    (and in each combination), and how many interventions of each type are still open.
+    """
+    return resolve_memory_service(tool_context).get_dashboard_counts()
+
+def save_agent_result(
+    agent_name: str,
+    result: Dict[str, Any],
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
     """
     Saves the detailed result of an agent to the shared session state.
     Use this to pass full JSON data to the orchestrator without cluttering the conversation.
+    The result is also archived per run, so later summaries can be rebuilt without re-analysis.
     """
-    SharedStateStore.save_result(agent_name, result)
+    if tool_context is not None:
+        save_session_result(tool_context.state, agent_name, result)
+    else:
+        SharedStateStore.save_result(agent_name, result)
+
+    state = tool_context.state if tool_context else {}
+    student_id = (result.get("student_id") if isinstance(result, dict) else None) or state.get("student_id")
+    if student_id:
+        run_id = state.get("run_id") or (tool_context.invocation_id if tool_context else None)
+        result_archive.archive(student_id, agent_name, result, run_id=run_id)
     return {"status": "success", "message": f"Result saved for {agent_name}"}
 
-def get_all_agent_results(student_id: Optional[str] = None) -> Dict[str, Any]:
+@compact_tool()
+def get_all_agent_results(
+    student_id: Optional[str] = None,
+    tool_context: Optional[ToolContext] = None
+) -> Dict[str, Any]:
     """
-    Retrieves agent results. Prioritizes SharedStateStore (current session).
-    If empty and student_id is provided, falls back to DatabaseMemoryService.
+    Retrieves agent results. Prioritizes the current session's results.
+    If empty and student_id is provided, falls back to the latest archived result of every agent,
+    filling any gaps from the memory service (database).
     """
     # 1. Try Shared State (Current Session)
-    results = SharedStateStore.get_all_results()
+    if tool_context is None:
+        results = SharedStateStore.get_all_results()
+    elif student_id in (None, tool_context.state.get("student_id")):
+        results = session_results(tool_context.state)
+    else:
+        results = {}
     if results:
         return results
         
     # 2. Fallback to Database (Past History)
     if student_id:
-        history = memory_service.retrieve_student_history(student_id)
-        if history:
-            return {
-                "source": "database",
-                "risk_prediction_agent": history.get("risk_profile", {}),
-                "intervention_coordinator_agent": {"interventions": history.get("interventions", [])},
-                # Note: Other qualitative data might not be in the structured history yet
-                # but this gives us the core info.
-                "full_history": history
-            }
+        archived = result_archive.latest(student_id)
+        history = resolve_memory_service(tool_context).retrieve_student_history(student_id)
+        if archived or history:
+            results = {"source": "archive" if archived else "database", **archived}
+            if history:
+                results.setdefault("risk_prediction_agent", history.get("risk_profile", {}))
+                results.setdefault("intervention_coordinator_agent", {"interventions": history.get("interventions", [])})
+                results["full_history"] = history
+            return results
             
     return {"message": "No results found in shared state or database."}
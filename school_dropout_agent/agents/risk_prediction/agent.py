@@ -4,6 +4,11 @@ It analyzes student data (attendance, grades, LMS, financial) to calculate a dro
 It is responsible for saving the risk assessment to the database.
 """
 from google.adk.agents.llm_agent import Agent
+from google.adk.agents.readonly_context import ReadonlyContext
+from school_dropout_agent.infrastructure.rules.rule_engine import rule_engine
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from .tools import get_student_attendance, get_student_grades, get_lms_activity, get_financial_status
 
 
@@ -16,12 +21,10 @@ You have access to the following tools:
 - `get_student_grades`: Check academic performance.
 - `get_lms_activity`: Check engagement with the Learning Management System.
 - `get_financial_status`: Check for financial holds.
+- `get_threshold_flags`: Evaluate the risk rules below for the student (use rule_set "risk").
 
 **Risk Factors to Look For:**
-1. Attendance < 80% or recent absences.
-2. GPA < 2.5 or failing grades.
-3. No LMS login in > 7 days.
-4. Unpaid tuition or financial holds.
+{risk_rules}
 
 **Output Format:**
 1. Call `save_risk_assessment` to save to database.
@@ -29,22 +32,29 @@ You have access to the following tools:
 3. Return a BRIEF 1-sentence summary (e.g., "Identified High Risk (0.85) due to attendance and grades.").
 """
 
-from school_dropout_agent.agents.orchestrator.tools import save_risk_assessment, save_agent_result
+from school_dropout_agent.agents.orchestrator.tools import save_risk_assessment, save_agent_result, get_threshold_flags
+
+def risk_agent_instruction(context: ReadonlyContext) -> str:
+    """Renders the instruction with the current risk rules, so rule changes apply without a redeploy."""
+    return RISK_AGENT_INSTRUCTION.replace("{risk_rules}", rule_engine.render("risk"))
 
 class RiskPredictionAgent(Agent):
     def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
         super().__init__(
-            model=model_name,
+            model=build_model(model_name),
             name="risk_prediction_agent",
             description="Analyzes student data to predict dropout risk.",
-            instruction=RISK_AGENT_INSTRUCTION,
+            instruction=risk_agent_instruction,
             tools=[
                 get_student_attendance,
                 get_student_grades,
                 get_lms_activity,
                 get_financial_status,
+                get_threshold_flags,
                 save_risk_assessment,
                 save_agent_result
-            ]
+            ],
+            **instrumentation.agent_callbacks()
         )
-        object.__setattr__(self, 'memory_service', memory_service)
\ No newline at end of file
+        object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
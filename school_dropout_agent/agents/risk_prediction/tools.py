@@ -6,8 +6,10 @@ from typing import Dict, Any, List
 from datetime import datetime, timedelta
 
 from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.core.encoding.compact_output import compact_tool
 
 # Mock data for demonstration
+@compact_tool(defaults={"missed_classes": 0, "recent_absences": 0})
 def get_student_attendance(student_id: str) -> Dict[str, Any]:
     """
     Fetches attendance records for a student.
@@ -27,6 +29,7 @@ def get_student_attendance(student_id: str) -> Dict[str, Any]:
         "last_attended": datetime.now().strftime("%Y-%m-%d")
     }
 
+@compact_tool(defaults={"failed_courses": 0, "missing_assignments": 0})
 def get_student_grades(student_id: str) -> Dict[str, Any]:
     """
     Fetches current grades and assignment status.
@@ -44,6 +47,7 @@ def get_student_grades(student_id: str) -> Dict[str, Any]:
         "recent_grades": []
     }
 
+@compact_tool()
 def get_lms_activity(student_id: str) -> Dict[str, Any]:
     """
     Fetches Learning Management System (LMS) activity logs.
@@ -60,6 +64,7 @@ def get_lms_activity(student_id: str) -> Dict[str, Any]:
         "resources_viewed_last_week": 5
     }
 
+@compact_tool(defaults={"financial_hold": False, "outstanding_balance": 0.0})
 def get_financial_status(student_id: str) -> Dict[str, Any]:
     """
     Checks for financial holds or unpaid tuition.
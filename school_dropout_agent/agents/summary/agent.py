@@ -1,8 +1,12 @@
 """
 This module defines the FinalSummaryAgent.
 It aggregates results from all other agents and produces a comprehensive final report.
+Also defines the BriefSummaryAgent used on the pipeline's short path for low-risk students.
 """
 from google.adk.agents.llm_agent import Agent
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.llm.controlled_llm import build_model
+from school_dropout_agent.infrastructure.memory.memory_provider import register_agent_memory_service
 from school_dropout_agent.agents.orchestrator.tools import get_all_agent_results
 
 FINAL_SUMMARY_INSTRUCTION = """
@@ -33,13 +37,46 @@ Provide a structured markdown summary:
 [Recommendations for the user]
 """
 
+BRIEF_SUMMARY_INSTRUCTION = """
+You are the Brief Summary Agent for the Dropout Prevention System.
+The student was rated Low risk, so only the risk assessment was run.
+
+**Your Task:**
+1. Identify the `student_id` from the conversation context.
+2. Call `get_all_agent_results(student_id=...)` to retrieve the risk assessment.
+3. Confirm the low risk in a few lines and say when the student should be re-assessed.
+
+**Output Format:**
+## Student Analysis Summary
+**Risk Level:** Low (Score: X.XX)
+**Notes:** [One or two sentences]
+**Next Review:** [Suggested re-assessment timing]
+"""
+
 class FinalSummaryAgent(Agent):
     def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
         super().__init__(
-            model=model_name,
+            model=build_model(model_name),
             name="final_summary_agent",
             description="Aggregates results and produces final report.",
             instruction=FINAL_SUMMARY_INSTRUCTION,
-            tools=[get_all_agent_results]
+            tools=[get_all_agent_results],
+            **instrumentation.agent_callbacks()
+        )
+        object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
+
+class BriefSummaryAgent(Agent):
+    """Short report for students routed past the full pipeline because their risk is Low."""
+
+    def __init__(self, memory_service=None, model_name: str = "gemini-2.5-flash"):
+        super().__init__(
+            model=build_model(model_name),
+            name="brief_summary_agent",
+            description="Produces a short report for low-risk students.",
+            instruction=BRIEF_SUMMARY_INSTRUCTION,
+            tools=[get_all_agent_results],
+            **instrumentation.agent_callbacks()
         )
         object.__setattr__(self, 'memory_service', memory_service)
+        register_agent_memory_service(self, memory_service)
@@ -0,0 +1,161 @@
+"""
+This module defines the compact tool-output encoding.
+It shortens key names, drops nulls, empty values and per-tool defaults, and truncates long histories
+(only the lists under history-like keys; findings such as risk factors are always kept whole) so tool results take fewer prompt tokens when they are fed back into an agent's context.
+Compaction is opt-in per tool through the `COMPACT_TOOL_OUTPUT` environment variable or `set_compact_tools`.
+"""
+import functools
+import inspect
+import os
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Optional, Set
+
+# Long key -> short key. Short keys stay readable so agents need no legend.
+KEY_ALIASES: Dict[str, str] = {
+    "student_id": "sid",
+    "total_classes": "classes",
+    "missed_classes": "missed",
+    "attendance_rate": "att_rate",
+    "recent_absences": "recent_abs",
+    "last_attended": "last_att",
+    "current_gpa": "gpa",
+    "failed_courses": "failed",
+    "missing_assignments": "missing",
+    "recent_grades": "grades",
+    "last_login": "login",
+    "average_daily_time_minutes": "daily_min",
+    "resources_viewed_last_week": "res_week",
+    "tuition_paid": "paid",
+    "financial_hold": "hold",
+    "outstanding_balance": "balance",
+    "total_visits": "visits",
+    "recent_visits": "recent_visits",
+    "last_visit_date": "last_visit",
+    "reported_issues": "issues",
+    "satisfaction_score": "satisf",
+    "stress_level": "stress",
+    "workload_rating": "workload",
+    "club_memberships": "clubs",
+    "event_attendance_last_month": "events_month",
+    "peer_interaction_score": "peer",
+    "weak_subjects": "weak",
+    "subject": "subj",
+    "learning_style": "style",
+    "preferences": "prefs",
+    "parent_name": "parent",
+    "preferred_language": "lang",
+    "enrollment_status": "enroll",
+    "enrollment_date": "enrolled",
+    "risk_profile": "risk",
+    "risk_score": "score",
+    "risk_level": "level",
+    "risk_factors": "factors",
+    "last_updated": "updated",
+    "interventions": "intv",
+    "intervention_id": "id",
+    "description": "desc",
+    "created_at": "created",
+    "full_history": "history",
+    "attendance_trend": "att_trend",
+    "grade_trend": "grade_trend",
+}
+
+DEFAULT_MAX_ITEMS = 5
+
+# Keys whose lists are histories, where the most recent entries are enough; every other list is kept whole
+HISTORY_KEYS: FrozenSet[str] = frozenset({
+    "recent_grades", "interventions", "recent_interventions", "full_history", "history"
+})
+
+_compact_tools: Optional[Set[str]] = None
+
+def set_compact_tools(tool_names: Optional[Iterable[str]]) -> None:
+    """
+    Override which tools return compact output.
+    Pass `{"*"}` for every tool, an empty set to disable, or None to fall back to `COMPACT_TOOL_OUTPUT`.
+    """
+    global _compact_tools
+    _compact_tools = set(tool_names) if tool_names is not None else None
+
+def is_compact_enabled(tool_name: str) -> bool:
+    """Whether the named tool should return compact output."""
+    selected = _compact_tools
+    if selected is None:
+        raw = os.getenv("COMPACT_TOOL_OUTPUT", "")
+        selected = {name.strip() for name in raw.split(",") if name.strip()}
+        if raw.strip().lower() in ("1", "true", "all"):
+            selected = {"*"}
+    return "*" in selected or tool_name in selected
+
+def compact(
+    value: Any,
+    defaults: Optional[Dict[str, Any]] = None,
+    max_items: int = DEFAULT_MAX_ITEMS,
+    truncate_keys: Iterable[str] = HISTORY_KEYS,
+    _truncate: bool = False
+) -> Any:
+    """
+    Returns a compact copy of a tool result.
+    Lists under one of `truncate_keys` that are longer than `max_items` keep their most recent entries
+    followed by a "+N more" marker; other lists are kept whole.
+    """
+    defaults = defaults or {}
+    if isinstance(value, dict):
+        result = {}
+        for key, item in value.items():
+            if item is None or item == [] or item == {} or item == "":
+                continue
+            if key in defaults and item == defaults[key]:
+                continue
+            result[KEY_ALIASES.get(key, key)] = compact(item, defaults, max_items, truncate_keys, key in truncate_keys)
+        return result
+    if isinstance(value, list):
+        kept = value[-max_items:] if _truncate else value
+        items = [compact(item, defaults, max_items, truncate_keys) for item in kept]
+        if len(kept) < len(value):
+            items.append(f"+{len(value) - len(kept)} more")
+        return items
+    return value
+
+def compact_tool(
+    defaults: Optional[Dict[str, Any]] = None,
+    max_items: int = DEFAULT_MAX_ITEMS,
+    max_items_arg: Optional[str] = None,
+    truncate_keys: Iterable[str] = HISTORY_KEYS
+) -> Callable:
+    """
+    Decorator that compacts a tool's result when compaction is enabled for that tool.
+    Keys listed in `defaults` are dropped when they hold the default value.
+    Only lists under `truncate_keys` are truncated; a tool can opt more of its lists in, or pass an empty set.
+    For paged tools, `max_items_arg` names the argument holding the requested page size (e.g. "page_size"),
+    so lists are never truncated below what the caller asked for.
+    """
+    truncate_keys = frozenset(truncate_keys)
+
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+
+        def item_cap(args, kwargs) -> int:
+            if max_items_arg is None:
+                return max_items
+            bound = signature.bind_partial(*args, **kwargs)
+            bound.apply_defaults()
+            requested = bound.arguments.get(max_items_arg)
+            return max(max_items, requested) if isinstance(requested, int) else max_items
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                result = await func(*args, **kwargs)
+                if not is_compact_enabled(func.__name__):
+                    return result
+                return compact(result, defaults, item_cap(args, kwargs), truncate_keys)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if not is_compact_enabled(func.__name__):
+                return result
+            return compact(result, defaults, item_cap(args, kwargs), truncate_keys)
+        return wrapper
+    return decorator
@@ -34,3 +34,34 @@ class MemoryService(ABC):
     def get_interventions(self, student_id: str) -> List[Dict[str, Any]]:
         """Get all interventions for a student."""
         pass
+    
+    @abstractmethod
+    def get_risk_profiles(self, student_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the current risk profile of many students at once, keyed by student ID."""
+        pass
+    
+    @abstractmethod
+    def retrieve_compact_history(self, student_id: str, recent_interventions: int = 5) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a bounded history: the profile, the latest risk profile, the `recent_interventions`
+        newest interventions and aggregate intervention counts by status and type.
+        """
+        pass
+    
+    @abstractmethod
+    def retrieve_compact_histories(self, student_ids: List[str], recent_interventions: int = 5) -> Dict[str, Dict[str, Any]]:
+        """Retrieve the compact history of many students at once, keyed by student ID (unknown students are omitted)."""
+        pass
+    
+    @abstractmethod
+    def get_intervention_page(self, student_id: str, offset: int = 0, limit: int = 10) -> Dict[str, Any]:
+        """Get one page of a student's interventions, newest first, with the total count."""
+        pass
+
+    @abstractmethod
+    def get_dashboard_counts(self) -> Dict[str, Any]:
+        """
+        Get the live dashboard counts: students by risk level, by major and by both,
+        and open interventions by type.
+        """
+        pass
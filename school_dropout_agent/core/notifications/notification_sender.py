@@ -0,0 +1,15 @@
+"""
+This module defines the NotificationSender interface.
+It specifies the contract for delivering a digest of notifications to a single recipient.
+Implemented by concrete senders (e.g., MockNotificationSender) and used by the NotificationDigestService.
+"""
+from abc import ABC, abstractmethod
+from typing import Dict, Any
+
+class NotificationSender(ABC):
+    """Abstract interface for notification delivery channels."""
+    
+    @abstractmethod
+    def send_digest(self, recipient: str, digest: Dict[str, Any]) -> None:
+        """Deliver one digest to a recipient."""
+        pass
@@ -0,0 +1,66 @@
+"""
+Progress bus for partial pipeline results.
+The FullAnalysisPipeline publishes a progress event as each stage saves its result (risk level, emotional
+findings, interventions created, ...); UIs and batch runners subscribe to render them before the run finishes.
+The same events are also emitted on the ADK event stream under the state key `pipeline_progress`.
+"""
+import asyncio
+import inspect
+import itertools
+import logging
+import threading
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], Any]
+
+class ProgressBus:
+    """
+    In-process publish/subscribe of progress events.
+    Callbacks may be plain functions or coroutine functions (scheduled on the running loop and referenced
+    until they finish). A failing subscriber is logged and never fails the pipeline that published the event.
+    """
+
+    def __init__(self):
+        self._subscribers: Dict[int, Tuple[ProgressCallback, Optional[str], Optional[str]]] = {}
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+        # Scheduled coroutine callbacks; the event loop only keeps weak references to tasks
+        self._tasks: Set[asyncio.Future] = set()
+
+    def subscribe(self, callback: ProgressCallback, run_id: Optional[str] = None, student_id: Optional[str] = None) -> int:
+        """Receive every progress event, or only those of one run or student. Returns a token for `unsubscribe`."""
+        with self._lock:
+            token = next(self._tokens)
+            self._subscribers[token] = (callback, run_id, student_id)
+            return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, progress: Dict[str, Any]) -> None:
+        with self._lock:
+            subscribers = list(self._subscribers.values())
+        for callback, run_id, student_id in subscribers:
+            if run_id is not None and progress.get("run_id") != run_id:
+                continue
+            if student_id is not None and progress.get("student_id") != student_id:
+                continue
+            try:
+                result = callback(progress)
+                if inspect.isawaitable(result):
+                    task = asyncio.ensure_future(result)
+                    self._tasks.add(task)
+                    task.add_done_callback(self._task_done)
+            except Exception:
+                # Rendering progress is best effort; the analysis itself must go on
+                logger.exception("Progress subscriber %r failed", callback)
+
+    def _task_done(self, task: asyncio.Future) -> None:
+        self._tasks.discard(task)
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Progress subscriber failed", exc_info=task.exception())
+
+progress_bus = ProgressBus()
@@ -2,45 +2,93 @@
 This module defines the SessionManager.
 It wraps the ADK SessionService to integrate it with our custom MemoryService.
 Responsible for loading student history into the session context and persisting updates back to the database.
+Only a bounded history is loaded; older interventions are paged in on demand by `get_student_history_page`.
 """
-from typing import Dict, Any, Optional
+import asyncio
+from typing import Dict, Any, List, Optional
 from google.adk.sessions import BaseSessionService
-from school_dropout_agent.infrastructure.memory.database_memory import DatabaseMemoryService
+from school_dropout_agent.core.memory.memory_service import MemoryService
 
 class SessionManager:
     """Wrapper around ADK's SessionService with helper methods."""
     
-    def __init__(self, session_service: BaseSessionService, memory_service: DatabaseMemoryService):
+    def __init__(
+        self,
+        session_service: BaseSessionService,
+        memory_service: MemoryService,
+        recent_interventions: int = 5
+    ):
         self.session_service = session_service
         self.memory_service = memory_service
+        self.recent_interventions = recent_interventions
     
     async def create_student_session(
         self, 
         app_name: str, 
         user_id: str, 
         student_id: str,
-        session_id: Optional[str] = None
+        session_id: Optional[str] = None,
+        extra_state: Optional[Dict[str, Any]] = None
     ):
         """Create a new session for analyzing a student."""
-        # Load student history from memory
-        student_history = self.memory_service.retrieve_student_history(student_id)
-        
-        initial_state = {
-            "student_id": student_id,
-            "workflow_stage": "initialized",
-            "agent_results": {},
-            "student_history": student_history
-        }
+        # Load a bounded history so session state stays small for long-tenured students
+        student_history = self.memory_service.retrieve_compact_history(student_id, self.recent_interventions)
         
         session = await self.session_service.create_session(
             app_name=app_name,
             user_id=user_id,
-            state=initial_state,
+            state=self._initial_state(student_id, student_history, extra_state),
             session_id=session_id
         )
         
         return session
     
+    async def create_student_sessions(
+        self,
+        app_name: str,
+        user_id: str,
+        student_ids: List[str],
+        session_ids: Optional[Dict[str, str]] = None,
+        extra_state: Optional[Dict[str, Dict[str, Any]]] = None,
+        concurrency: int = 100
+    ) -> Dict[str, Any]:
+        """
+        Create sessions for a cohort, keyed by student ID.
+        Histories are loaded with one bulk query per chunk of students and sessions are created
+        concurrently (at most `concurrency` at a time). `session_ids` and `extra_state` are keyed by student ID.
+        """
+        student_ids = list(dict.fromkeys(student_ids))
+        histories = self.memory_service.retrieve_compact_histories(student_ids, self.recent_interventions)
+        session_ids = session_ids or {}
+        extra_state = extra_state or {}
+        semaphore = asyncio.Semaphore(concurrency)
+        
+        async def create(student_id: str):
+            async with semaphore:
+                return await self.session_service.create_session(
+                    app_name=app_name,
+                    user_id=user_id,
+                    state=self._initial_state(student_id, histories.get(student_id), extra_state.get(student_id)),
+                    session_id=session_ids.get(student_id)
+                )
+        
+        sessions = await asyncio.gather(*(create(student_id) for student_id in student_ids))
+        return dict(zip(student_ids, sessions))
+    
+    def _initial_state(
+        self,
+        student_id: str,
+        student_history: Optional[Dict[str, Any]],
+        extra_state: Optional[Dict[str, Any]]
+    ) -> Dict[str, Any]:
+        return {
+            "student_id": student_id,
+            "workflow_stage": "initialized",
+            "agent_results": {},
+            "student_history": student_history,
+            **(extra_state or {})
+        }
+    
     async def update_session_state(
         self,
         app_name: str,
@@ -1,8 +1,32 @@
 """
 Shared state store for passing data between agents in a sequential workflow.
-This is a simple in-memory store to hold agent results.
+Agent results are kept in the session state, one `agent_result:<agent name>` key per agent, so each run only
+sees its own results; the process-wide SharedStateStore is the fallback for calls made outside a session.
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Mapping, Optional
+
+RESULT_KEY_PREFIX = "agent_result:"
+
+def result_key(agent_name: str) -> str:
+    """Session state key holding an agent's result."""
+    return f"{RESULT_KEY_PREFIX}{agent_name}"
+
+def save_session_result(state, agent_name: str, result: Any) -> None:
+    """Save an agent's result in a session state (a tool or callback context's `state`)."""
+    state[result_key(agent_name)] = result
+
+def session_results(state: Mapping[str, Any]) -> Dict[str, Any]:
+    """Every agent result saved in a session state, keyed by agent name."""
+    values = state.to_dict() if hasattr(state, "to_dict") else state
+    return {
+        key[len(RESULT_KEY_PREFIX):]: value
+        for key, value in values.items()
+        if key.startswith(RESULT_KEY_PREFIX) and value is not None
+    }
+
+def saved_result(state_delta: Optional[Mapping[str, Any]], agent_name: str) -> Optional[Any]:
+    """The result an event saved for `agent_name`, or None if the event did not save one."""
+    return (state_delta or {}).get(result_key(agent_name))
 
 class SharedStateStore:
     _instance = None
@@ -0,0 +1,15 @@
+"""
+This module defines the TranslationBackend interface.
+It specifies the contract for translating a batch of texts into a single target language.
+Implemented by concrete backends (e.g., MockTranslationBackend) and used by the TranslationService.
+"""
+from abc import ABC, abstractmethod
+from typing import List
+
+class TranslationBackend(ABC):
+    """Abstract interface for translation providers."""
+    
+    @abstractmethod
+    def translate_batch(self, texts: List[str], target_language: str) -> List[str]:
+        """Translate every text into the target language, preserving order."""
+        pass
@@ -0,0 +1,194 @@
+"""
+This module implements the ResourceCatalog, an in-memory inverted index of study resources.
+Resources are bulk-loaded (from `config/study_resources.json`, or RESOURCE_CATALOG_PATH) and indexed once;
+each term keeps a precomputed BM25 weight per resource, so a query is a few NumPy additions.
+Results are ranked by subject/topic relevance and boosted by the student's learning style and preferences.
+Used by `get_study_resources`.
+"""
+import json
+import os
+import re
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+DEFAULT_CATALOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "study_resources.json")
+
+# Indexed fields and how much a term occurrence in each counts towards relevance
+FIELD_WEIGHTS = {"title": 2.0, "topic": 2.0, "subject": 1.5, "description": 1.0, "type": 0.5, "tags": 1.0}
+
+# Resource types that suit each learning style
+STYLE_TYPES = {
+    "visual": ["video", "diagram", "interactive simulation", "infographic"],
+    "auditory": ["lecture", "podcast", "group discussion"],
+    "kinesthetic": ["hands-on project", "interactive simulation", "practice problems", "lab"],
+    "reading/writing": ["article", "tutorial", "textbook", "practice problems"],
+}
+
+STYLE_BOOST = 0.5
+PREFERENCE_BOOST = 0.3
+SUBJECT_MATCH_BOOST = 0.5
+
+_STOPWORDS = {"a", "an", "and", "the", "of", "for", "to", "in", "on", "with", "by", "covering"}
+_TOKEN = re.compile(r"[a-z0-9]+")
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase word tokens without stopwords, with a naive plural strip."""
+    tokens = []
+    for token in _TOKEN.findall(str(text or "").lower()):
+        if token in _STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def _normalize(text: str) -> str:
+    return " ".join(str(text or "").lower().split())
+
+def _contains(sorted_docs: np.ndarray, candidates: np.ndarray) -> np.ndarray:
+    """Which candidates appear in an ascending doc ID array, in O(candidates x log docs)."""
+    positions = np.minimum(np.searchsorted(sorted_docs, candidates), len(sorted_docs) - 1)
+    return sorted_docs[positions] == candidates
+
+class ResourceCatalog:
+    """
+    Inverted index with BM25 ranking (`k1`, `b`).
+
+    `load` appends resources and rebuilds the index in one pass; the new index is swapped in atomically,
+    so searches running concurrently see either the old or the new catalog.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._resources: List[Dict[str, Any]] = []
+        self._index: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+        self._by_type: Dict[str, np.ndarray] = {}
+        self._by_subject: Dict[str, np.ndarray] = {}
+        self._by_label_term: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._resources)
+
+    def load(self, resources: Iterable[Dict[str, Any]]) -> int:
+        """Add resources in bulk and rebuild the index. Returns the catalog size."""
+        with self._lock:
+            self._build(self._resources + [dict(resource) for resource in resources])
+            return len(self._resources)
+
+    def load_file(self, path: str) -> int:
+        """Bulk-load a JSON list or a JSON Lines file of resources."""
+        with open(path) as f:
+            if path.endswith(".jsonl"):
+                resources = [json.loads(line) for line in f if line.strip()]
+            else:
+                resources = json.load(f)
+        return self.load(resources)
+
+    def search(
+        self,
+        subject: str,
+        topic: str,
+        learning_style: Optional[str] = None,
+        preferences: Optional[List[str]] = None,
+        limit: int = 5
+    ) -> List[Dict[str, Any]]:
+        """The best `limit` resources for a subject and topic, each with its `score`."""
+        resources, index = self._resources, self._index
+        if not resources:
+            return []
+
+        scores = np.zeros(len(resources))
+        for term in set(tokenize(f"{subject} {topic}")):
+            if term in index:
+                doc_ids, weights = index[term]
+                scores[doc_ids] += weights
+        # A subject match alone would return every resource of the subject; at least one topic term must match
+        topic_matched = np.zeros(len(resources), dtype=bool)
+        for term in set(tokenize(topic)) or set(tokenize(subject)):
+            if term in index:
+                topic_matched[index[term][0]] = True
+        candidates = np.flatnonzero(topic_matched)
+        if not len(candidates):
+            return []
+
+        # Boosts are looked up for the candidates only, never materialized for the whole catalog
+        boosts = np.ones(len(candidates))
+        subject_docs = self._by_subject.get(_normalize(subject))
+        if subject_docs is not None:
+            boosts[_contains(subject_docs, candidates)] += SUBJECT_MATCH_BOOST
+        for resource_type in STYLE_TYPES.get(_normalize(learning_style), []):
+            type_docs = self._by_type.get(resource_type)
+            if type_docs is not None:
+                boosts[_contains(type_docs, candidates)] += STYLE_BOOST
+        preferred = np.zeros(len(candidates), dtype=bool)
+        for preference in preferences or []:
+            for term in tokenize(preference):
+                label_docs = self._by_label_term.get(term)
+                if label_docs is not None:
+                    preferred |= _contains(label_docs, candidates)
+        boosts[preferred] += PREFERENCE_BOOST
+
+        candidate_scores = scores[candidates] * boosts
+        k = min(limit, len(candidates))
+        top = np.argpartition(-candidate_scores, k - 1)[:k]
+        top = top[np.argsort(-candidate_scores[top], kind="stable")]
+        return [
+            {**resources[candidates[i]], "score": round(float(candidate_scores[i]), 3)}
+            for i in top
+        ]
+
+    def _build(self, resources: List[Dict[str, Any]]) -> None:
+        postings: Dict[str, Dict[int, float]] = {}
+        by_type: Dict[str, List[int]] = {}
+        by_subject: Dict[str, List[int]] = {}
+        by_label_term: Dict[str, List[int]] = {}
+        lengths = np.zeros(len(resources))
+
+        for doc_id, resource in enumerate(resources):
+            for field, weight in FIELD_WEIGHTS.items():
+                value = resource.get(field)
+                text = " ".join(value) if isinstance(value, list) else value
+                for term in tokenize(text):
+                    postings.setdefault(term, {})
+                    postings[term][doc_id] = postings[term].get(doc_id, 0.0) + weight
+                    lengths[doc_id] += weight
+            by_type.setdefault(_normalize(resource.get("type")), []).append(doc_id)
+            by_subject.setdefault(_normalize(resource.get("subject")), []).append(doc_id)
+            # Type, title and tags describe the format, which is what preferences refer to
+            label = f"{resource.get('type', '')} {resource.get('title', '')} {' '.join(resource.get('tags', []))}"
+            for term in set(tokenize(label)):
+                by_label_term.setdefault(term, []).append(doc_id)
+
+        average_length = lengths.mean() if len(resources) else 1.0
+        index = {}
+        for term, docs in postings.items():
+            doc_ids = np.fromiter(docs.keys(), dtype=np.int64, count=len(docs))
+            tf = np.fromiter(docs.values(), dtype=float, count=len(docs))
+            idf = np.log(1 + (len(resources) - len(docs) + 0.5) / (len(docs) + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * lengths[doc_ids] / average_length)
+            index[term] = (doc_ids, idf * tf * (self.k1 + 1) / (tf + norm))
+
+        as_arrays = lambda groups: {key: np.array(ids, dtype=np.int64) for key, ids in groups.items()}
+        self._index = index
+        self._by_type = as_arrays(by_type)
+        self._by_subject = as_arrays(by_subject)
+        self._by_label_term = as_arrays(by_label_term)
+        self._resources = resources
+
+_default_catalog: Optional[ResourceCatalog] = None
+_default_lock = threading.Lock()
+
+def get_resource_catalog() -> ResourceCatalog:
+    """The process-wide catalog, bulk-loaded from RESOURCE_CATALOG_PATH (or the bundled file) on first use."""
+    global _default_catalog
+    if _default_catalog is None:
+        with _default_lock:
+            if _default_catalog is None:
+                catalog = ResourceCatalog()
+                catalog.load_file(os.getenv("RESOURCE_CATALOG_PATH", DEFAULT_CATALOG_PATH))
+                _default_catalog = catalog
+    return _default_catalog
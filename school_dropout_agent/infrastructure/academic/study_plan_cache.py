@@ -0,0 +1,86 @@
+"""
+This module implements the StudyPlanCache.
+Study plans depend on a student's weak subjects and topics, learning style and preferences, so plans are
+cached under a canonical signature of those inputs with TTL and size limits. Cached plans are stored as
+student-agnostic templates and personalized again for each student that reuses them.
+Used by the AcademicSupportAgent's callbacks to skip the LLM for repeat signatures.
+"""
+import copy
+import hashlib
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+from cachetools import TTLCache
+
+STUDENT_PLACEHOLDER = "<student_id>"
+NAME_PLACEHOLDER = "<student_name>"
+
+def _normalize(value: Any) -> str:
+    return " ".join(str(value or "").lower().split())
+
+def plan_signature(weak_subjects: List[Dict[str, Any]], learning_style: str, preferences: List[str]) -> str:
+    """Hash of the plan inputs that ignores order, case and spacing (grades are not part of it)."""
+    canonical = {
+        "weak_subjects": sorted([_normalize(s.get("subject")), _normalize(s.get("topic"))] for s in weak_subjects),
+        "learning_style": _normalize(learning_style),
+        "preferences": sorted(_normalize(p) for p in preferences)
+    }
+    return hashlib.sha256(json.dumps(canonical, sort_keys=True).encode("utf-8")).hexdigest()
+
+def _replace_strings(value: Any, replacements: Dict[str, str]) -> Any:
+    if isinstance(value, str):
+        for old, new in replacements.items():
+            if old:
+                value = value.replace(old, new)
+        return value
+    if isinstance(value, list):
+        return [_replace_strings(v, replacements) for v in value]
+    if isinstance(value, dict):
+        return {k: _replace_strings(v, replacements) for k, v in value.items()}
+    return value
+
+class StudyPlanCache:
+    """Thread-safe TTL cache of study plan templates keyed by plan signature."""
+
+    def __init__(self, maxsize: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        self.maxsize = maxsize or int(os.getenv("STUDY_PLAN_CACHE_SIZE", "1000"))
+        self.ttl_seconds = ttl_seconds or float(os.getenv("STUDY_PLAN_CACHE_TTL_SECONDS", "86400"))
+        self._cache = TTLCache(maxsize=self.maxsize, ttl=self.ttl_seconds)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, signature: str, student_id: str, student_name: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """The cached plan for a signature, personalized for the student, or None."""
+        with self._lock:
+            template = self._cache.get(signature)
+            if template is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        plan = _replace_strings(copy.deepcopy(template), {
+            STUDENT_PLACEHOLDER: student_id,
+            NAME_PLACEHOLDER: student_name or ""
+        })
+        plan["student_id"] = student_id
+        plan["plan_signature"] = signature
+        plan["cached"] = True
+        return plan
+
+    def put(self, signature: str, plan: Dict[str, Any], student_id: str, student_name: Optional[str] = None) -> None:
+        """Store a plan generated for one student as a template for everyone with the same signature."""
+        template = _replace_strings(plan, {student_id: STUDENT_PLACEHOLDER, student_name or "": NAME_PLACEHOLDER})
+        template.pop("cached", None)
+        with self._lock:
+            self._cache[signature] = template
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cache.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        return {"size": len(self._cache), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+study_plan_cache = StudyPlanCache()
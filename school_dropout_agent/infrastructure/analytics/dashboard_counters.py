@@ -0,0 +1,150 @@
+"""
+This module implements the DashboardCounters.
+Counts of students by risk level and major, and of open interventions by type, are kept in a counter table
+that writers adjust inside their own transactions (`adjust`), so dashboard reads never aggregate the base tables.
+`reconcile` recomputes the counters from the base tables to repair drift from writes that bypass the
+memory service (e.g. bulk loads); `reconcile_periodically` runs it on a schedule, and `backfill` runs it once
+for a database whose counter table is still empty.
+"""
+import asyncio
+import os
+from typing import Any, Dict, Optional
+
+from sqlalchemy import func
+
+from school_dropout_agent.core.domain.intervention import InterventionStatus
+from school_dropout_agent.infrastructure.database.database import SessionLocal, upsert_statement
+from school_dropout_agent.infrastructure.database.models import (
+    DashboardCounterModel, InterventionModel, RiskProfileModel, StudentModel
+)
+
+STUDENTS_BY_RISK_MAJOR = "students_by_risk_major"
+OPEN_INTERVENTIONS_BY_TYPE = "open_interventions_by_type"
+
+OPEN_STATUSES = (InterventionStatus.PENDING, InterventionStatus.ACTIVE)
+UNKNOWN = "Unknown"
+
+RECONCILE_INTERVAL_SECONDS = float(os.getenv("DASHBOARD_RECONCILE_INTERVAL_SECONDS", "3600"))
+
+def _label(value: Any) -> str:
+    if value is None or value == "":
+        return UNKNOWN
+    return value.value if hasattr(value, "value") else str(value)
+
+def adjust(db, counter: str, key: str, subkey: str = "", delta: int = 1) -> None:
+    """Add `delta` to a counter within the caller's transaction, creating it if needed, in one atomic statement."""
+    stmt = upsert_statement(DashboardCounterModel, ["counter", "key", "subkey"], [], increment_columns=["count"])
+    db.execute(stmt, {"counter": counter, "key": key, "subkey": subkey, "count": delta})
+
+def move_risk_count(db, old_level: Any, old_major: Any, new_level: Any, new_major: Any) -> None:
+    """Move one student between risk level x major cells (`old_level` is None when the student had no profile)."""
+    new_cell = (_label(new_level), _label(new_major))
+    if old_level is not None:
+        old_cell = (_label(old_level), _label(old_major))
+        if old_cell == new_cell:
+            return
+        adjust(db, STUDENTS_BY_RISK_MAJOR, *old_cell, delta=-1)
+    adjust(db, STUDENTS_BY_RISK_MAJOR, *new_cell, delta=1)
+
+def count_open_intervention(db, intervention_type: Any, delta: int = 1) -> None:
+    """Count an intervention opening (+1) or closing (-1)."""
+    adjust(db, OPEN_INTERVENTIONS_BY_TYPE, _label(intervention_type), delta=delta)
+
+class DashboardCounters:
+    """Reads and reconciles the dashboard counter table."""
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Every dashboard count, read from the counter table only."""
+        db = SessionLocal()
+        try:
+            # A negative count can only come from drift; it is repaired by the next reconcile
+            rows = db.query(DashboardCounterModel).filter(DashboardCounterModel.count > 0).all()
+        finally:
+            db.close()
+
+        by_risk_major: Dict[str, Dict[str, int]] = {}
+        by_risk: Dict[str, int] = {}
+        by_major: Dict[str, int] = {}
+        open_by_type: Dict[str, int] = {}
+        for row in rows:
+            if row.counter == STUDENTS_BY_RISK_MAJOR:
+                by_risk_major.setdefault(row.key, {})[row.subkey] = row.count
+                by_risk[row.key] = by_risk.get(row.key, 0) + row.count
+                by_major[row.subkey] = by_major.get(row.subkey, 0) + row.count
+            elif row.counter == OPEN_INTERVENTIONS_BY_TYPE:
+                open_by_type[row.key] = row.count
+        return {
+            "students_by_risk_level": by_risk,
+            "students_by_major": by_major,
+            "students_by_risk_level_and_major": by_risk_major,
+            "open_interventions_by_type": open_by_type,
+            "open_interventions": sum(open_by_type.values())
+        }
+
+    def reconcile(self) -> Dict[str, Any]:
+        """Recompute every counter from the base tables in one transaction; returns the cells that had drifted."""
+        db = SessionLocal()
+        try:
+            truth: Dict[tuple, int] = {}
+            risk_rows = db.query(
+                RiskProfileModel.risk_level, StudentModel.major, func.count()
+            ).outerjoin(
+                StudentModel, StudentModel.student_id == RiskProfileModel.student_id
+            ).group_by(RiskProfileModel.risk_level, StudentModel.major)
+            for risk_level, major, count in risk_rows:
+                cell = (STUDENTS_BY_RISK_MAJOR, _label(risk_level), _label(major))
+                truth[cell] = truth.get(cell, 0) + count
+            intervention_rows = db.query(
+                InterventionModel.type, func.count()
+            ).filter(InterventionModel.status.in_(OPEN_STATUSES)).group_by(InterventionModel.type)
+            for intervention_type, count in intervention_rows:
+                cell = (OPEN_INTERVENTIONS_BY_TYPE, _label(intervention_type), "")
+                truth[cell] = truth.get(cell, 0) + count
+
+            current = {(row.counter, row.key, row.subkey): row for row in db.query(DashboardCounterModel)}
+            drift = {}
+            for cell in set(truth) | set(current):
+                expected = truth.get(cell, 0)
+                row = current.get(cell)
+                actual = row.count if row else 0
+                if expected != actual:
+                    drift["/".join(part for part in cell if part)] = {"expected": expected, "actual": actual}
+                if row is None:
+                    db.add(DashboardCounterModel(counter=cell[0], key=cell[1], subkey=cell[2], count=expected))
+                elif expected == 0:
+                    db.delete(row)
+                else:
+                    row.count = expected
+            db.commit()
+            return {"cells": len(truth), "drifted": drift}
+        finally:
+            db.close()
+
+    def backfill(self) -> Optional[Dict[str, Any]]:
+        """Reconcile once if the counter table is empty, e.g. on a database created before the counters existed."""
+        db = SessionLocal()
+        try:
+            empty = db.query(DashboardCounterModel.counter).first() is None
+        finally:
+            db.close()
+        return self.reconcile() if empty else None
+
+    async def reconcile_periodically(
+        self,
+        interval_seconds: float = RECONCILE_INTERVAL_SECONDS,
+        on_result=None,
+        delay_first: bool = False
+    ) -> None:
+        """
+        Reconcile every `interval_seconds` until cancelled; `on_result` receives each reconcile report.
+        With `delay_first` the first reconcile waits one interval instead of running immediately.
+        """
+        if delay_first:
+            await asyncio.sleep(interval_seconds)
+        while True:
+            result = await asyncio.to_thread(self.reconcile)
+            if on_result is not None:
+                on_result(result)
+            await asyncio.sleep(interval_seconds)
+
+dashboard_counters = DashboardCounters()
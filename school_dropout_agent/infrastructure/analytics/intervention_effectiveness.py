@@ -0,0 +1,198 @@
+"""
+This module implements the InterventionEffectiveness tracker.
+It persists intervention outcomes and keeps outcome counters per intervention type x risk band x major,
+plus 'All' rollups over band and major, updated in the same transaction as each outcome.
+Reading the effectiveness of any combination is therefore a primary-key lookup, never a scan.
+Used by the monitoring tools and by `get_intervention_effectiveness`.
+"""
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from school_dropout_agent.core.domain.intervention import InterventionStatus, InterventionType
+from school_dropout_agent.infrastructure.analytics.dashboard_counters import OPEN_STATUSES, count_open_intervention
+from school_dropout_agent.infrastructure.database.database import SessionLocal, upsert_statement
+from school_dropout_agent.infrastructure.database.models import (
+    InterventionEffectivenessModel, InterventionModel, InterventionOutcomeModel, RiskProfileModel, StudentModel
+)
+
+ALL = "All"
+UNKNOWN = "Unknown"
+
+# Canonical outcome -> counter column
+OUTCOME_COLUMNS = {"Improved": "improved", "No Change": "no_change", "Declined": "declined"}
+
+# Outcomes that close the intervention unless the caller says otherwise; the others call for continuing or adjusting
+CLOSING_OUTCOMES = ("Improved",)
+
+def normalize_outcome(outcome: str) -> str:
+    """Map a free-text outcome ("improved", "Effective", "worse", ...) to a canonical one."""
+    text = str(outcome or "").strip().lower()
+    if text.startswith(("improv", "effective", "success", "better", "resolved")):
+        return "Improved"
+    if text.startswith(("declin", "worse", "deteriorat", "ineffective", "failed")):
+        return "Declined"
+    return "No Change"
+
+def _type_value(intervention_type: Any) -> str:
+    if isinstance(intervention_type, InterventionType):
+        return intervention_type.value
+    try:
+        return InterventionType[str(intervention_type).upper()].value
+    except KeyError:
+        return str(intervention_type)
+
+def _dimension(value: Optional[str], capitalize: bool = False) -> str:
+    if not value or str(value).lower() == ALL.lower():
+        return ALL
+    return str(value).capitalize() if capitalize else str(value)
+
+def _stats(intervention_type: str, risk_band: str, major: str, row: Optional[InterventionEffectivenessModel]) -> Dict[str, Any]:
+    total = row.total if row else 0
+    improved = row.improved if row else 0
+    return {
+        "intervention_type": intervention_type,
+        "risk_band": risk_band,
+        "major": major,
+        "total": total,
+        "improved": improved,
+        "no_change": row.no_change if row else 0,
+        "declined": row.declined if row else 0,
+        "effectiveness_rate": round(improved / total, 3) if total else None
+    }
+
+class InterventionEffectiveness:
+    """Outcome store with incrementally maintained effectiveness counters."""
+
+    def __init__(self):
+        # Serializes outcome corrections within the process; the counters themselves are updated atomically
+        self._lock = threading.Lock()
+
+    def record(
+        self,
+        intervention_id: str,
+        outcome: str,
+        notes: str = "",
+        close: Optional[bool] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Record (or correct) an intervention's outcome and update its counters.
+        The intervention is resolved when `close` is true, or by default when the outcome is Improved;
+        otherwise it stays open (a correction reopens one that an earlier outcome had resolved).
+        Returns the stored outcome, or None if the intervention does not exist.
+        """
+        canonical = normalize_outcome(outcome)
+        with self._lock:
+            db = SessionLocal()
+            try:
+                intervention = db.get(InterventionModel, intervention_id)
+                if intervention is None:
+                    return None
+                student = db.get(StudentModel, intervention.student_id)
+                risk_profile = db.get(RiskProfileModel, intervention.student_id)
+
+                previous = db.get(InterventionOutcomeModel, intervention_id)
+                if previous is not None:
+                    self._apply(db, (previous.intervention_type, previous.risk_band, previous.major), previous.outcome, -1)
+                    record = previous
+                else:
+                    record = InterventionOutcomeModel(intervention_id=intervention_id)
+                    db.add(record)
+                    # The band and major are fixed at first recording so corrections stay in the same cell
+                    record.student_id = intervention.student_id
+                    record.intervention_type = _type_value(intervention.type)
+                    record.risk_band = (risk_profile.risk_level if risk_profile and risk_profile.risk_level else UNKNOWN).capitalize()
+                    record.major = (student.major if student and student.major else UNKNOWN)
+                record.outcome = canonical
+                record.notes = notes
+                record.recorded_at = datetime.now()
+                self._apply(db, (record.intervention_type, record.risk_band, record.major), canonical, 1)
+
+                if close is None:
+                    close = canonical in CLOSING_OUTCOMES
+                if close and intervention.status in OPEN_STATUSES:
+                    count_open_intervention(db, intervention.type, -1)
+                    intervention.status = InterventionStatus.RESOLVED
+                    intervention.updated_at = datetime.now()
+                elif not close and previous is not None and intervention.status == InterventionStatus.RESOLVED:
+                    count_open_intervention(db, intervention.type, 1)
+                    intervention.status = InterventionStatus.ACTIVE
+                    intervention.updated_at = datetime.now()
+                db.commit()
+                return self._outcome_to_dict(record)
+            finally:
+                db.close()
+
+    def get_outcome(self, intervention_id: str) -> Optional[Dict[str, Any]]:
+        """The recorded outcome of an intervention, or None if none was recorded."""
+        db = SessionLocal()
+        try:
+            record = db.get(InterventionOutcomeModel, intervention_id)
+            return self._outcome_to_dict(record) if record else None
+        finally:
+            db.close()
+
+    def stats(self, intervention_type: str, risk_band: str = ALL, major: str = ALL) -> Dict[str, Any]:
+        """Outcome counts and effectiveness rate of one cell; use 'All' to roll up a dimension."""
+        key = (_type_value(intervention_type), _dimension(risk_band, capitalize=True), _dimension(major))
+        db = SessionLocal()
+        try:
+            return _stats(*key, db.get(InterventionEffectivenessModel, key))
+        finally:
+            db.close()
+
+    def compare_types(self, risk_band: str = ALL, major: str = ALL) -> List[Dict[str, Any]]:
+        """The stats of every intervention type for one band and major, most effective first."""
+        band, major = _dimension(risk_band, capitalize=True), _dimension(major)
+        types = [t.value for t in InterventionType]
+        db = SessionLocal()
+        try:
+            rows = {
+                row.intervention_type: row
+                for row in db.query(InterventionEffectivenessModel).filter(
+                    InterventionEffectivenessModel.intervention_type.in_(types),
+                    InterventionEffectivenessModel.risk_band == band,
+                    InterventionEffectivenessModel.major == major
+                ).all()
+            }
+            stats = [_stats(t, band, major, rows.get(t)) for t in types]
+            return sorted(stats, key=lambda s: (s["effectiveness_rate"] is None, -(s["effectiveness_rate"] or 0), -s["total"]))
+        finally:
+            db.close()
+
+    def _apply(self, db, key: Tuple[str, str, str], outcome: str, delta: int) -> None:
+        """Add `delta` to the outcome's cells with one atomic upsert each, so concurrent processes never lose counts."""
+        intervention_type, risk_band, major = key
+        column = OUTCOME_COLUMNS[outcome]
+        stmt = upsert_statement(
+            InterventionEffectivenessModel, ["intervention_type", "risk_band", "major"], ["updated_at"],
+            increment_columns=["total", column]
+        )
+        now = datetime.now()
+        cells = {
+            (intervention_type, risk_band, major),
+            (intervention_type, risk_band, ALL),
+            (intervention_type, ALL, major),
+            (intervention_type, ALL, ALL)
+        }
+        db.execute(stmt, [
+            {
+                "intervention_type": cell[0], "risk_band": cell[1], "major": cell[2], "updated_at": now,
+                "total": delta, "improved": 0, "no_change": 0, "declined": 0, column: delta
+            }
+            for cell in cells
+        ])
+
+    def _outcome_to_dict(self, record: InterventionOutcomeModel) -> Dict[str, Any]:
+        return {
+            "intervention_id": record.intervention_id,
+            "student_id": record.student_id,
+            "intervention_type": record.intervention_type,
+            "risk_band": record.risk_band,
+            "major": record.major,
+            "outcome": record.outcome,
+            "notes": record.notes,
+            "recorded_at": record.recorded_at.isoformat() if record.recorded_at else None
+        }
+
+intervention_effectiveness = InterventionEffectiveness()
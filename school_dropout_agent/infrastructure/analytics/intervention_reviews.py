@@ -0,0 +1,194 @@
+"""
+This module implements the InterventionReviewStore and the before/after metric comparison.
+A baseline of the student's features is captured when an intervention is created; reviews compare it
+with the current features as normalized, direction-aware deltas computed with NumPy for many interventions at once.
+Used by `compare_metrics`, the intervention tools and the MonitoringSweep.
+"""
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import and_, func, or_
+
+from school_dropout_agent.core.domain.intervention import InterventionStatus, InterventionType
+from school_dropout_agent.infrastructure.database.database import SessionLocal, QUERY_CHUNK_SIZE
+from school_dropout_agent.infrastructure.database.models import InterventionModel, InterventionReviewModel
+from school_dropout_agent.infrastructure.features.student_features import build_feature_matrix
+
+# Metric -> (direction, scale): +1 when higher is better; one `scale` of change counts as 1.0
+REVIEW_METRICS = {
+    "attendance_rate": (1, 0.05),
+    "current_gpa": (1, 0.25),
+    "missing_assignments": (-1, 2.0),
+    "days_since_lms_login": (-1, 7.0),
+    "lms_daily_minutes": (1, 15.0),
+    "stress_level": (-1, 1.0),
+    "satisfaction_score": (1, 1.0),
+    "comment_sentiment": (1, 0.3),
+}
+METRIC_NAMES = list(REVIEW_METRICS)
+_DIRECTIONS = np.array([direction for direction, _ in REVIEW_METRICS.values()], dtype=float)
+_SCALES = np.array([scale for _, scale in REVIEW_METRICS.values()], dtype=float)
+
+# Days between reviews of an open intervention, by type
+REVIEW_INTERVAL_DAYS = {
+    InterventionType.ACADEMIC: 14,
+    InterventionType.EMOTIONAL: 7,
+    InterventionType.FINANCIAL: 30,
+    InterventionType.BEHAVIORAL: 14,
+    InterventionType.FAMILY: 21,
+}
+
+def normalize_intervals(intervals: Optional[Dict[Any, float]]) -> Optional[Dict[InterventionType, float]]:
+    """Key review intervals by InterventionType, accepting names or values ("ACADEMIC", "Academic", "academic")."""
+    if intervals is None:
+        return None
+    normalized = {}
+    for intervention_type, days in intervals.items():
+        if not isinstance(intervention_type, InterventionType):
+            try:
+                intervention_type = InterventionType[str(intervention_type).upper()]
+            except KeyError:
+                raise ValueError(f"Unknown intervention type '{intervention_type}'") from None
+        normalized[intervention_type] = days
+    return normalized
+
+OPEN_STATUSES = [InterventionStatus.PENDING, InterventionStatus.ACTIVE]
+
+def metric_changes(baseline: np.ndarray, current: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Compare (interventions x METRIC_NAMES) arrays.
+    `improvement` is each delta in units of its scale, signed so that positive means better;
+    `score` is the mean improvement per intervention.
+    """
+    deltas = current - baseline
+    improvement = deltas * _DIRECTIONS / _SCALES
+    return {"deltas": deltas, "improvement": improvement, "score": improvement.mean(axis=1)}
+
+def metric_values(features: Dict[str, float]) -> List[float]:
+    return [float(features.get(name, 0.0)) for name in METRIC_NAMES]
+
+class InterventionReviewStore:
+    """Baselines and review state of interventions."""
+
+    def capture_baselines(self, interventions: Dict[str, str]) -> int:
+        """Snapshot the current features of each intervention's student (intervention ID -> student ID)."""
+        if not interventions:
+            return 0
+        student_ids = list(dict.fromkeys(interventions.values()))
+        matrix = build_feature_matrix(student_ids)
+        rows = {
+            student_id: dict(zip(matrix.feature_names, matrix.values[i].tolist()))
+            for i, student_id in enumerate(matrix.student_ids)
+        }
+        db = SessionLocal()
+        try:
+            now = datetime.now()
+            for intervention_id, student_id in interventions.items():
+                db.merge(InterventionReviewModel(
+                    intervention_id=intervention_id,
+                    student_id=student_id,
+                    baseline=rows[student_id],
+                    baseline_at=now
+                ))
+            db.commit()
+            return len(interventions)
+        finally:
+            db.close()
+
+    def due(self, now: Optional[datetime] = None, intervals: Optional[Dict[Any, float]] = None) -> List[Dict[str, Any]]:
+        """
+        Every open intervention whose last review (or creation) is older than its type's interval,
+        with its baseline (None when it was never captured), in one query.
+        """
+        now = now or datetime.now()
+        intervals = normalize_intervals(intervals) or REVIEW_INTERVAL_DAYS
+        last_reviewed = func.coalesce(InterventionReviewModel.reviewed_at, InterventionModel.created_at)
+        db = SessionLocal()
+        try:
+            query = db.query(
+                InterventionModel.intervention_id,
+                InterventionModel.student_id,
+                InterventionModel.type,
+                InterventionModel.status,
+                InterventionModel.created_at,
+                InterventionReviewModel.baseline,
+                InterventionReviewModel.reviewed_at
+            ).outerjoin(
+                InterventionReviewModel,
+                InterventionReviewModel.intervention_id == InterventionModel.intervention_id
+            ).filter(
+                InterventionModel.status.in_(OPEN_STATUSES),
+                or_(*(
+                    and_(InterventionModel.type == intervention_type, last_reviewed <= now - timedelta(days=days))
+                    for intervention_type, days in intervals.items()
+                ))
+            ).yield_per(QUERY_CHUNK_SIZE)
+            return [
+                {
+                    "intervention_id": row.intervention_id,
+                    "student_id": row.student_id,
+                    "type": row.type.value,
+                    "status": row.status.value,
+                    "created_at": row.created_at,
+                    "baseline": row.baseline,
+                    "reviewed_at": row.reviewed_at
+                } for row in query
+            ]
+        finally:
+            db.close()
+
+    def latest_baseline(self, student_id: str) -> Optional[Dict[str, Any]]:
+        """The baseline of the student's most recent open intervention."""
+        db = SessionLocal()
+        try:
+            row = db.query(InterventionReviewModel).join(
+                InterventionModel, InterventionModel.intervention_id == InterventionReviewModel.intervention_id
+            ).filter(
+                InterventionReviewModel.student_id == student_id,
+                InterventionModel.status.in_(OPEN_STATUSES)
+            ).order_by(InterventionReviewModel.baseline_at.desc()).first()
+            if row is None:
+                return None
+            return {
+                "intervention_id": row.intervention_id,
+                "baseline_at": row.baseline_at.isoformat() if row.baseline_at else None,
+                "baseline": row.baseline
+            }
+        finally:
+            db.close()
+
+    def mark_reviewed(self, reviews: List[Dict[str, Any]], now: Optional[datetime] = None) -> None:
+        """
+        Store each review's `decision` and `score`; reviews with a `baseline` and `student_id` also create
+        the review row of interventions that had none.
+        """
+        now = now or datetime.now()
+        db = SessionLocal()
+        try:
+            for start in range(0, len(reviews), QUERY_CHUNK_SIZE):
+                chunk = reviews[start:start + QUERY_CHUNK_SIZE]
+                existing = {
+                    row.intervention_id: row
+                    for row in db.query(InterventionReviewModel).filter(
+                        InterventionReviewModel.intervention_id.in_([r["intervention_id"] for r in chunk])
+                    )
+                }
+                for review in chunk:
+                    row = existing.get(review["intervention_id"])
+                    if row is None:
+                        row = InterventionReviewModel(
+                            intervention_id=review["intervention_id"],
+                            student_id=review["student_id"],
+                            baseline=review["baseline"],
+                            baseline_at=now
+                        )
+                        db.add(row)
+                    row.reviewed_at = now
+                    row.decision = review["decision"]
+                    row.score = review["score"]
+            db.commit()
+        finally:
+            db.close()
+
+intervention_reviews = InterventionReviewStore()
@@ -0,0 +1,76 @@
+"""
+This module implements the ResultArchive.
+It durably stores every agent result as compressed JSON, per run, and keeps a pointer to the
+latest result per student per agent so a complete summary can be rebuilt without re-analysis.
+Used by `save_agent_result` and by `get_all_agent_results` when the shared state is empty.
+"""
+import json
+import zlib
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from school_dropout_agent.infrastructure.database.database import SessionLocal
+from school_dropout_agent.infrastructure.database.models import AgentResultArchiveModel, LatestAgentResultModel
+
+def _compress(result: Any) -> bytes:
+    return zlib.compress(json.dumps(result, default=str, separators=(",", ":")).encode("utf-8"))
+
+def _decompress(payload: bytes) -> Any:
+    return json.loads(zlib.decompress(payload).decode("utf-8"))
+
+class ResultArchive:
+    """Append-only archive of agent results with a latest-per-agent index."""
+
+    def archive(self, student_id: str, agent_name: str, result: Any, run_id: Optional[str] = None) -> int:
+        """Append a result and make it the student's latest for that agent. Returns the archive ID."""
+        db = SessionLocal()
+        try:
+            now = datetime.now()
+            entry = AgentResultArchiveModel(
+                run_id=run_id,
+                student_id=student_id,
+                agent_name=agent_name,
+                created_at=now,
+                payload=_compress(result)
+            )
+            db.add(entry)
+            db.flush()
+            db.merge(LatestAgentResultModel(
+                student_id=student_id,
+                agent_name=agent_name,
+                archive_id=entry.archive_id,
+                updated_at=now
+            ))
+            db.commit()
+            return entry.archive_id
+        finally:
+            db.close()
+
+    def latest(self, student_id: str) -> Dict[str, Any]:
+        """The most recent result of every agent for a student, keyed by agent name."""
+        db = SessionLocal()
+        try:
+            rows = db.query(AgentResultArchiveModel).join(
+                LatestAgentResultModel,
+                LatestAgentResultModel.archive_id == AgentResultArchiveModel.archive_id
+            ).filter(LatestAgentResultModel.student_id == student_id).all()
+            return {row.agent_name: _decompress(row.payload) for row in rows}
+        finally:
+            db.close()
+
+    def history(self, student_id: str, agent_name: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Past results of one agent for a student, newest first."""
+        db = SessionLocal()
+        try:
+            rows = db.query(AgentResultArchiveModel).filter_by(
+                student_id=student_id, agent_name=agent_name
+            ).order_by(AgentResultArchiveModel.created_at.desc()).limit(limit).all()
+            return [
+                {
+                    "run_id": row.run_id,
+                    "created_at": row.created_at.isoformat() if row.created_at else None,
+                    "result": _decompress(row.payload)
+                } for row in rows
+            ]
+        finally:
+            db.close()
@@ -0,0 +1,90 @@
+"""
+This module implements the CheckpointStore.
+It persists the outcome and output of each FullAnalysisPipeline stage, keyed by run ID,
+so a failed or interrupted run can resume from its first unfinished stage.
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Set
+
+from sqlalchemy import func
+
+from school_dropout_agent.infrastructure.database.database import SessionLocal, QUERY_CHUNK_SIZE
+from school_dropout_agent.infrastructure.database.models import PipelineCheckpointModel
+
+COMPLETED = "completed"
+FAILED = "failed"
+SKIPPED = "skipped"
+
+class CheckpointStore:
+    """Database-backed record of finished and failed pipeline stages."""
+
+    def load(self, run_id: str) -> Dict[str, Dict[str, Any]]:
+        """All checkpoints of a run, keyed by stage name."""
+        db = SessionLocal()
+        try:
+            return {
+                c.stage: {
+                    "status": c.status,
+                    "output": c.output,
+                    "error": c.error,
+                    "updated_at": c.updated_at.isoformat() if c.updated_at else None
+                } for c in db.query(PipelineCheckpointModel).filter_by(run_id=run_id).all()
+            }
+        finally:
+            db.close()
+
+    def mark_completed(self, run_id: str, stage: str, student_id: Optional[str], output: Any) -> None:
+        """Record that a stage finished, with the result it saved."""
+        self._save(run_id, stage, student_id, COMPLETED, output=output)
+
+    def mark_failed(self, run_id: str, stage: str, student_id: Optional[str], error: str) -> None:
+        """Record that a stage raised, so a resume starts from it."""
+        self._save(run_id, stage, student_id, FAILED, error=error)
+
+    def mark_skipped(self, run_id: str, stage: str, student_id: Optional[str]) -> None:
+        """Record that routing left a stage out of the run."""
+        self._save(run_id, stage, student_id, SKIPPED)
+
+    def completed_runs(self, run_ids: List[str], stages: List[str]) -> Set[str]:
+        """The subset of runs whose every stage is completed or skipped, found in one query per chunk."""
+        db = SessionLocal()
+        try:
+            done = set()
+            for start in range(0, len(run_ids), QUERY_CHUNK_SIZE):
+                chunk = run_ids[start:start + QUERY_CHUNK_SIZE]
+                rows = db.query(PipelineCheckpointModel.run_id).filter(
+                    PipelineCheckpointModel.run_id.in_(chunk),
+                    PipelineCheckpointModel.stage.in_(stages),
+                    PipelineCheckpointModel.status.in_([COMPLETED, SKIPPED])
+                ).group_by(PipelineCheckpointModel.run_id).having(
+                    func.count(PipelineCheckpointModel.stage) == len(stages)
+                )
+                done.update(row.run_id for row in rows)
+            return done
+        finally:
+            db.close()
+
+    def clear(self, run_id: str) -> None:
+        """Forget a run so it starts from scratch next time."""
+        db = SessionLocal()
+        try:
+            db.query(PipelineCheckpointModel).filter_by(run_id=run_id).delete()
+            db.commit()
+        finally:
+            db.close()
+
+    def _save(self, run_id: str, stage: str, student_id: Optional[str], status: str, output: Any = None, error: Optional[str] = None) -> None:
+        db = SessionLocal()
+        try:
+            db.merge(PipelineCheckpointModel(
+                run_id=run_id,
+                stage=stage,
+                student_id=student_id,
+                status=status,
+                output=output,
+                error=error,
+                updated_at=datetime.now()
+            ))
+            db.commit()
+        finally:
+            db.close()
@@ -2,22 +2,73 @@
 This module handles database connection and session management.
 It provides the `get_db` context manager and initializes the database engine.
 Defaults to SQLite for local development but supports PostgreSQL.
+The engine and tables are created lazily on first use, so importing this module costs nothing.
 """
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import sessionmaker
 from .models import Base
 import os
+import threading
+from typing import List
 
 # Default to SQLite for local dev if no URL provided
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./school_dropout_agent.db")
 
-engine = create_engine(
-    DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
-)
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Keeps IN (...) lists under SQLite's bound-parameter limit
+QUERY_CHUNK_SIZE = 500
+
+_engine = None
+_session_factory = None
+_initialized = False
+_lock = threading.RLock()
+
+def get_engine():
+    """Create the engine on first use."""
+    global _engine, _session_factory
+    if _engine is None:
+        with _lock:
+            if _engine is None:
+                _engine = create_engine(
+                    DATABASE_URL, connect_args={"check_same_thread": False} if "sqlite" in DATABASE_URL else {}
+                )
+                _session_factory = sessionmaker(autocommit=False, autoflush=False, bind=_engine)
+    return _engine
+
+def upsert_statement(model, key_columns: List[str], update_columns: List[str], increment_columns: List[str] = ()):
+    """
+    INSERT ... ON CONFLICT DO UPDATE for SQLite and PostgreSQL (DO NOTHING if there is nothing to update).
+    `update_columns` take the inserted value; `increment_columns` add the inserted value to the stored one.
+    """
+    dialect = get_engine().dialect.name
+    if dialect == "sqlite":
+        insert = sqlite.insert
+    elif dialect == "postgresql":
+        insert = postgresql.insert
+    else:
+        raise NotImplementedError(f"Upsert is not supported for the {dialect} dialect")
+    stmt = insert(model)
+    set_ = {column: stmt.excluded[column] for column in update_columns}
+    set_.update({column: getattr(model, column) + stmt.excluded[column] for column in increment_columns})
+    if not set_:
+        return stmt.on_conflict_do_nothing(index_elements=key_columns)
+    return stmt.on_conflict_do_update(index_elements=key_columns, set_=set_)
 
 def init_db():
-    Base.metadata.create_all(bind=engine)
+    global _initialized
+    Base.metadata.create_all(bind=get_engine())
+    _initialized = True
+    # Imported here because the counters module itself opens sessions through this one
+    from school_dropout_agent.infrastructure.analytics.dashboard_counters import dashboard_counters
+    dashboard_counters.backfill()
+
+def SessionLocal():
+    """Open a new database session, creating the tables the first time one is requested."""
+    if not _initialized:
+        with _lock:
+            if not _initialized:
+                init_db()
+    return _session_factory()
 
 def get_db():
     db = SessionLocal()
@@ -25,3 +76,9 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def __getattr__(name):
+    # Keep `database.engine` working for callers that expect a module-level engine
+    if name == "engine":
+        return get_engine()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,7 +3,7 @@ This module defines the SQLAlchemy database models.
 It maps the domain entities (Student, RiskProfile, Intervention) to database tables.
 Used by the DatabaseMemoryService for persistence.
 """
-from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, JSON, Enum as SQLEnum
+from sqlalchemy import Column, String, Float, DateTime, Integer, ForeignKey, JSON, LargeBinary, Index, Enum as SQLEnum
 from sqlalchemy.orm import declarative_base, relationship
 from datetime import datetime
 from school_dropout_agent.core.domain.intervention import InterventionStatus, InterventionType
@@ -45,6 +45,11 @@ class InterventionModel(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
     student = relationship("StudentModel", backref="interventions")
+    
+    __table_args__ = (
+        Index("ix_interventions_student_created", "student_id", "created_at"),
+        Index("ix_interventions_status_type_created", "status", "type", "created_at"),
+    )
 
 class EventModel(Base):
     __tablename__ = "events"
@@ -54,3 +59,109 @@ class EventModel(Base):
     timestamp = Column(DateTime)
     payload = Column(JSON)
     source = Column(String)
+
+class TranslationModel(Base):
+    __tablename__ = "translations"
+    
+    text_hash = Column(String, primary_key=True)
+    target_language = Column(String, primary_key=True)
+    source_text = Column(String)
+    translated_text = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+class PendingNotificationModel(Base):
+    __tablename__ = "pending_notifications"
+    
+    recipient = Column(String, primary_key=True)
+    student_id = Column(String, primary_key=True)
+    stakeholder_type = Column(String)
+    message = Column(String)
+    repeats = Column(Integer, default=1)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class PipelineCheckpointModel(Base):
+    __tablename__ = "pipeline_checkpoints"
+    
+    run_id = Column(String, primary_key=True)
+    stage = Column(String, primary_key=True)
+    student_id = Column(String, index=True)
+    status = Column(String)  # 'completed', 'failed'
+    output = Column(JSON)
+    error = Column(String)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class AgentResultArchiveModel(Base):
+    __tablename__ = "agent_result_archive"
+    
+    archive_id = Column(Integer, primary_key=True, autoincrement=True)
+    run_id = Column(String, index=True)
+    student_id = Column(String)
+    agent_name = Column(String)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    payload = Column(LargeBinary)  # zlib-compressed JSON
+    
+    __table_args__ = (
+        Index("ix_agent_result_archive_student_agent_created", "student_id", "agent_name", "created_at"),
+    )
+
+class LatestAgentResultModel(Base):
+    __tablename__ = "latest_agent_results"
+    
+    student_id = Column(String, primary_key=True)
+    agent_name = Column(String, primary_key=True)
+    archive_id = Column(Integer, ForeignKey("agent_result_archive.archive_id"))
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class InterventionOutcomeModel(Base):
+    __tablename__ = "intervention_outcomes"
+    
+    intervention_id = Column(String, ForeignKey("interventions.intervention_id"), primary_key=True)
+    student_id = Column(String, index=True)
+    intervention_type = Column(String)
+    risk_band = Column(String)  # risk level when the outcome was recorded
+    major = Column(String)
+    outcome = Column(String)  # 'Improved', 'No Change', 'Declined'
+    notes = Column(String)
+    recorded_at = Column(DateTime, default=datetime.utcnow)
+
+class InterventionEffectivenessModel(Base):
+    __tablename__ = "intervention_effectiveness"
+    
+    # 'All' in risk_band or major marks a rollup row
+    intervention_type = Column(String, primary_key=True)
+    risk_band = Column(String, primary_key=True)
+    major = Column(String, primary_key=True)
+    total = Column(Integer, default=0)
+    improved = Column(Integer, default=0)
+    no_change = Column(Integer, default=0)
+    declined = Column(Integer, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class InterventionReviewModel(Base):
+    __tablename__ = "intervention_reviews"
+    
+    intervention_id = Column(String, ForeignKey("interventions.intervention_id"), primary_key=True)
+    student_id = Column(String, index=True)
+    baseline = Column(JSON)  # feature name -> value when the intervention was created
+    baseline_at = Column(DateTime, default=datetime.utcnow)
+    reviewed_at = Column(DateTime)
+    decision = Column(String)  # 'escalate', 'close', 'continue'
+    score = Column(Float)
+
+class StudentDataModel(Base):
+    __tablename__ = "student_data"
+    
+    student_id = Column(String, primary_key=True)
+    category = Column(String, primary_key=True)  # 'attendance', 'grades', 'lms', 'financial'
+    data = Column(JSON)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+class DashboardCounterModel(Base):
+    __tablename__ = "dashboard_counters"
+    
+    # e.g. ('students_by_risk_major', 'High', 'Computer Science') or ('open_interventions_by_type', 'Academic', '')
+    counter = Column(String, primary_key=True)
+    key = Column(String, primary_key=True)
+    subkey = Column(String, primary_key=True, default="")
+    count = Column(Integer, default=0)
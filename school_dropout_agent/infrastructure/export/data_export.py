@@ -0,0 +1,279 @@
+"""
+This module implements the streaming institution-wide export of students, risk profiles and interventions.
+Rows are read with a streaming cursor (`yield_per`) in primary-key order and written incrementally as CSV,
+JSON Lines or Parquet (requires pyarrow), so memory stays constant regardless of table size.
+Exports can be filtered and resumed after the last exported key.
+Usage: python -m school_dropout_agent.infrastructure.export.data_export interventions interventions.csv --status Pending
+"""
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+
+from school_dropout_agent.core.domain.intervention import InterventionStatus, InterventionType
+from school_dropout_agent.infrastructure.database.database import SessionLocal
+from school_dropout_agent.infrastructure.database.models import InterventionModel, RiskProfileModel, StudentModel
+
+EXPORT_CHUNK_SIZE = 5000
+
+STUDENT_COLUMNS = [
+    StudentModel.student_id, StudentModel.first_name, StudentModel.last_name, StudentModel.email,
+    StudentModel.major, StudentModel.enrollment_status, StudentModel.enrollment_date
+]
+RISK_COLUMNS = [RiskProfileModel.risk_score, RiskProfileModel.risk_level, RiskProfileModel.risk_factors, RiskProfileModel.last_updated]
+
+# Dataset -> (key column used for ordering and resuming, filters it supports)
+DATASETS = {
+    "students": (StudentModel.student_id, {"majors", "risk_levels", "enrollment_statuses"}),
+    "risk_profiles": (RiskProfileModel.student_id, {"majors", "risk_levels", "min_risk_score", "since", "until"}),
+    "interventions": (InterventionModel.intervention_id, {"majors", "risk_levels", "statuses", "types", "student_ids", "since", "until"}),
+}
+
+def _statement(dataset: str, filters: Dict[str, Any]):
+    if dataset == "students":
+        stmt = select(*STUDENT_COLUMNS, *RISK_COLUMNS).outerjoin(
+            RiskProfileModel, RiskProfileModel.student_id == StudentModel.student_id
+        )
+        updated_at = None
+    elif dataset == "risk_profiles":
+        stmt = select(RiskProfileModel.student_id, *STUDENT_COLUMNS[1:], *RISK_COLUMNS).join(
+            StudentModel, StudentModel.student_id == RiskProfileModel.student_id
+        )
+        updated_at = RiskProfileModel.last_updated
+    else:
+        stmt = select(
+            InterventionModel.intervention_id, InterventionModel.student_id, StudentModel.major,
+            InterventionModel.type, InterventionModel.status, InterventionModel.description,
+            InterventionModel.created_at, InterventionModel.updated_at, RiskProfileModel.risk_level
+        ).outerjoin(
+            StudentModel, StudentModel.student_id == InterventionModel.student_id
+        ).outerjoin(
+            RiskProfileModel, RiskProfileModel.student_id == InterventionModel.student_id
+        )
+        updated_at = InterventionModel.updated_at
+
+    if filters.get("majors"):
+        stmt = stmt.where(StudentModel.major.in_(filters["majors"]))
+    if filters.get("risk_levels"):
+        stmt = stmt.where(RiskProfileModel.risk_level.in_(filters["risk_levels"]))
+    if filters.get("enrollment_statuses"):
+        stmt = stmt.where(StudentModel.enrollment_status.in_(filters["enrollment_statuses"]))
+    if filters.get("min_risk_score") is not None:
+        stmt = stmt.where(RiskProfileModel.risk_score >= filters["min_risk_score"])
+    if filters.get("statuses"):
+        stmt = stmt.where(InterventionModel.status.in_([InterventionStatus(s.capitalize()) for s in filters["statuses"]]))
+    if filters.get("types"):
+        stmt = stmt.where(InterventionModel.type.in_([InterventionType(t.capitalize()) for t in filters["types"]]))
+    if filters.get("student_ids"):
+        stmt = stmt.where(InterventionModel.student_id.in_(filters["student_ids"]))
+    if filters.get("since"):
+        stmt = stmt.where(updated_at >= filters["since"])
+    if filters.get("until"):
+        stmt = stmt.where(updated_at < filters["until"])
+    return stmt
+
+def iter_rows(
+    dataset: str,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream a dataset's rows in key order, starting after the key `after`.
+    Rows are fetched `chunk_size` at a time from a streaming cursor and never held all at once.
+    """
+    if dataset not in DATASETS:
+        raise ValueError(f"Unknown dataset '{dataset}'; expected one of {sorted(DATASETS)}")
+    key, supported = DATASETS[dataset]
+    filters = {name: value for name, value in (filters or {}).items() if value not in (None, [], "")}
+    unsupported = set(filters) - supported
+    if unsupported:
+        raise ValueError(f"Dataset '{dataset}' does not support filters {sorted(unsupported)}")
+
+    stmt = _statement(dataset, filters)
+    if after is not None:
+        stmt = stmt.where(key > after)
+    stmt = stmt.order_by(key).execution_options(yield_per=chunk_size, stream_results=True)
+
+    db = SessionLocal()
+    try:
+        for row in db.execute(stmt):
+            yield dict(row._mapping)
+    finally:
+        db.close()
+
+def _flat(value: Any) -> Any:
+    """Scalar form of a value for CSV and Parquet columns."""
+    if isinstance(value, datetime):
+        return value.isoformat()
+    if hasattr(value, "value"):
+        return value.value
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    return value
+
+NUMERIC_COLUMNS = {"risk_score"}
+
+def _parquet_value(name: str, value: Any) -> Any:
+    if value is None or name in NUMERIC_COLUMNS:
+        return value
+    return str(_flat(value))
+
+class CsvExportWriter:
+    def __init__(self, path: str, append: bool = False):
+        self._file = open(path, "a" if append else "w", newline="")
+        self._has_header = append and self._file.tell() > 0
+        self._writer = None
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if self._writer is None:
+            self._writer = csv.DictWriter(self._file, fieldnames=list(rows[0]))
+            if not self._has_header:
+                self._writer.writeheader()
+        self._writer.writerows({name: _flat(value) for name, value in row.items()} for row in rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+class JsonLinesExportWriter:
+    def __init__(self, path: str, append: bool = False):
+        self._file = open(path, "a" if append else "w")
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        self._file.writelines(json.dumps(row, default=_flat) + "\n" for row in rows)
+        self._file.flush()
+
+    def close(self) -> None:
+        self._file.close()
+
+class ParquetExportWriter:
+    """Writes each chunk as a row group. Parquet files cannot be appended to; resume into a new part file."""
+
+    def __init__(self, path: str, append: bool = False):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Parquet export requires pyarrow (pip install pyarrow)") from e
+        if append and os.path.exists(path):
+            raise ValueError(f"Cannot append to Parquet file {path}; resume into a new file")
+        self._pa, self._pq = pa, pq
+        self._path = path
+        self._writer = None
+
+    def write(self, rows: List[Dict[str, Any]]) -> None:
+        if self._writer is None:
+            # Timestamps, enums and JSON are written as strings so every row group shares one schema
+            schema = self._pa.schema([
+                (name, self._pa.float64() if name in NUMERIC_COLUMNS else self._pa.string()) for name in rows[0]
+            ])
+            self._writer = self._pq.ParquetWriter(self._path, schema)
+        columns = {
+            name: [_parquet_value(name, row[name]) for row in rows] for name in self._writer.schema.names
+        }
+        self._writer.write_table(self._pa.Table.from_pydict(columns, schema=self._writer.schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+WRITERS = {"csv": CsvExportWriter, "jsonl": JsonLinesExportWriter, "parquet": ParquetExportWriter}
+
+def export(
+    dataset: str,
+    path: str,
+    format: Optional[str] = None,
+    filters: Optional[Dict[str, Any]] = None,
+    after: Optional[str] = None,
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+    on_chunk: Optional[Callable[[Dict[str, Any]], Any]] = None
+) -> Dict[str, Any]:
+    """
+    Export a dataset to `path`, writing one chunk at a time. The format defaults to the file extension.
+    When `after` is given the export resumes after that key and appends to the file (CSV and JSON Lines).
+    Returns the row count and `last_key`, which is the `after` value to resume from.
+    Each chunk is flushed to disk before `on_chunk` receives `{"rows", "last_key"}`; if the export fails,
+    the raised exception carries the `rows_written` and `last_key` of the last chunk that reached the file.
+    """
+    format = (format or os.path.splitext(path)[1].lstrip(".")).lower()
+    if format not in WRITERS:
+        raise ValueError(f"Unknown export format '{format}'; expected one of {sorted(WRITERS)}")
+
+    key_column = DATASETS[dataset][0].key if dataset in DATASETS else None
+    writer = WRITERS[format](path, append=after is not None)
+    started = time.perf_counter()
+    rows_written = 0
+    last_key = after
+    chunk: List[Dict[str, Any]] = []
+
+    def write_chunk() -> None:
+        nonlocal rows_written, last_key
+        writer.write(chunk)
+        rows_written += len(chunk)
+        last_key = chunk[-1][key_column]
+        if on_chunk is not None:
+            on_chunk({"rows": rows_written, "last_key": last_key})
+
+    try:
+        for row in iter_rows(dataset, filters, after, chunk_size):
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                write_chunk()
+                chunk = []
+        if chunk:
+            write_chunk()
+    except Exception as e:
+        # Let the caller resume from the last chunk that was written
+        e.rows_written = rows_written
+        e.last_key = last_key
+        raise
+    finally:
+        writer.close()
+
+    seconds = time.perf_counter() - started
+    return {
+        "dataset": dataset,
+        "path": path,
+        "format": format,
+        "rows": rows_written,
+        "last_key": last_key,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(rows_written / seconds) if seconds else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Stream an institution-wide export to CSV, JSON Lines or Parquet.")
+    parser.add_argument("dataset", choices=sorted(DATASETS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=sorted(WRITERS))
+    parser.add_argument("--after", help="Resume after this key (the last_key of an interrupted export)")
+    parser.add_argument("--major", action="append", dest="majors")
+    parser.add_argument("--risk-level", action="append", dest="risk_levels")
+    parser.add_argument("--enrollment-status", action="append", dest="enrollment_statuses")
+    parser.add_argument("--status", action="append", dest="statuses")
+    parser.add_argument("--type", action="append", dest="types")
+    parser.add_argument("--min-risk-score", type=float)
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--chunk-size", type=int, default=EXPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    filter_names = {"majors", "risk_levels", "enrollment_statuses", "statuses", "types", "min_risk_score", "since", "until"}
+    filters = {name: value for name, value in vars(args).items() if name in filter_names}
+    try:
+        result = export(args.dataset, args.path, args.format, filters, args.after, args.chunk_size)
+    except Exception as e:
+        if getattr(e, "last_key", None) is not None:
+            print(f"Export failed after {e.rows_written} rows; resume with --after {e.last_key}", file=sys.stderr)
+        raise
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
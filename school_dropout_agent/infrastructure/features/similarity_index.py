@@ -0,0 +1,265 @@
+"""
+This module implements the SimilarStudentIndex, a k-nearest-neighbour index over student feature vectors.
+Vectors are the standardized attendance, grades, LMS, financial and emotional features of `build_feature_matrix`.
+Small cohorts are searched by brute force; large ones are partitioned with k-means and only the partitions
+closest to the query are scanned. Students can be added or refreshed incrementally.
+The index is built offline (`python -m school_dropout_agent.infrastructure.features.similarity_index`) and saved to
+SIMILARITY_INDEX_PATH; the bulk importer adds imported students to it and the `find_similar_students` tool loads it.
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from school_dropout_agent.infrastructure.features.student_features import build_feature_matrix
+
+KMEANS_ITERATIONS = 10
+
+DEFAULT_INDEX_PATH = os.getenv("SIMILARITY_INDEX_PATH", "./similarity_index.npz")
+
+# Cohorts up to this size may be indexed on first use; larger ones must be built offline
+LAZY_BUILD_LIMIT = int(os.getenv("SIMILARITY_LAZY_BUILD_LIMIT", "5000"))
+
+# Students refreshed per feature extraction batch by `upsert_many`
+UPSERT_BATCH_SIZE = 5000
+
+class SimilarStudentIndex:
+    """
+    Euclidean k-NN over standardized feature vectors.
+
+    `build` fits the standardization and, for cohorts of at least `partition_threshold` students
+    (SIMILARITY_PARTITION_THRESHOLD), about sqrt(n) k-means partitions of which `n_probe` are scanned per query.
+    `upsert` reuses the fitted statistics and centroids, so call `build` again after large cohort changes.
+    """
+
+    def __init__(self, partition_threshold: Optional[int] = None, n_probe: int = 3):
+        self.partition_threshold = partition_threshold or int(os.getenv("SIMILARITY_PARTITION_THRESHOLD", "50000"))
+        self.n_probe = n_probe
+        self._student_ids: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._vectors = np.empty((0, 0))
+        self._norms = np.empty(0)
+        self._size = 0
+        self._mean: Optional[np.ndarray] = None
+        self._scale: Optional[np.ndarray] = None
+        self._centroids: Optional[np.ndarray] = None
+        self._assignments = np.empty(0, dtype=np.int64)
+        # Modification time of the saved index this one was loaded from or saved to
+        self._saved_mtime = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, student_id: str) -> bool:
+        return student_id in self._positions
+
+    @property
+    def partitions(self) -> int:
+        return 0 if self._centroids is None else len(self._centroids)
+
+    def build(self, student_ids: List[str], partitions: Optional[int] = None) -> None:
+        """Index a cohort from scratch. `partitions` overrides the automatic choice (0 disables partitioning)."""
+        matrix = build_feature_matrix(student_ids)
+        with self._lock:
+            self._mean = matrix.values.mean(axis=0)
+            scale = matrix.values.std(axis=0)
+            self._scale = np.where(scale > 0, scale, 1.0)
+            self._student_ids = list(matrix.student_ids)
+            self._positions = {student_id: i for i, student_id in enumerate(self._student_ids)}
+            self._vectors = self._standardize(matrix.values)
+            self._norms = (self._vectors ** 2).sum(axis=1)
+            self._size = len(self._student_ids)
+
+            if partitions is None:
+                partitions = int(np.sqrt(self._size)) if self._size >= self.partition_threshold else 0
+            self._centroids = self._kmeans(self._vectors, partitions) if partitions > 1 else None
+            self._assignments = self._assign(self._vectors)
+
+    def upsert(self, student_ids: List[str]) -> None:
+        """Add new students and refresh the vectors of indexed ones."""
+        if self._mean is None:
+            self.build(student_ids)
+            return
+        matrix = build_feature_matrix(student_ids)
+        vectors = self._standardize(matrix.values)
+        with self._lock:
+            for student_id, vector in zip(matrix.student_ids, vectors):
+                position = self._positions.get(student_id)
+                if position is None:
+                    position = self._append(student_id)
+                self._vectors[position] = vector
+                self._norms[position] = vector @ vector
+                self._assignments[position] = self._assign(vector[None, :])[0]
+
+    def query(self, student_id: str, k: int = 5) -> List[Tuple[str, float]]:
+        """
+        The `k` students closest to `student_id` as (student ID, distance), closest first.
+        A student that is not indexed is compared by its current features without being added.
+        """
+        with self._lock:
+            position = self._positions.get(student_id)
+            vector = self._vectors[position] if position is not None else None
+        if vector is None:
+            vector = self._standardize(build_feature_matrix([student_id]).values)[0]
+
+        with self._lock:
+            candidates = None
+            if self._centroids is not None:
+                centroid_distances = ((self._centroids - vector) ** 2).sum(axis=1)
+                # Tied centroids may sort ahead of the query's own partition, so always probe it too
+                probed = np.union1d(np.argsort(centroid_distances)[:self.n_probe], self._assign(vector[None, :]))
+                candidates = np.flatnonzero(np.isin(self._assignments[:self._size], probed))
+                if len(candidates) - (position is not None) < min(k, self._size - (position is not None)):
+                    # Too few students in the probed partitions; scan everyone rather than return a short list
+                    candidates = None
+                else:
+                    vectors, norms = self._vectors[candidates], self._norms[candidates]
+            if candidates is None:
+                # Brute force scans views of the whole index instead of gathered copies
+                candidates = np.arange(self._size)
+                vectors, norms = self._vectors[:self._size], self._norms[:self._size]
+
+            # |v - q|^2 = |v|^2 - 2 v.q + |q|^2, with |v|^2 cached per student
+            distances = np.sqrt(np.maximum(norms - 2 * (vectors @ vector) + vector @ vector, 0.0))
+            # An indexed student always falls in its own (probed) partition; exclude it from the results
+            if position is not None:
+                distances[candidates == position] = np.inf
+            k = min(k, len(candidates) - (position is not None))
+            if k <= 0:
+                return []
+            top = np.argpartition(distances, k - 1)[:k]
+            top = top[np.argsort(distances[top], kind="stable")]
+            return [(self._student_ids[candidates[i]], round(float(distances[i]), 4)) for i in top]
+
+    def upsert_many(self, student_ids: Iterable[str]) -> None:
+        """`upsert` a large set of students in batches, bounding the feature matrix held at once."""
+        student_ids = list(student_ids)
+        for start in range(0, len(student_ids), UPSERT_BATCH_SIZE):
+            self.upsert(student_ids[start:start + UPSERT_BATCH_SIZE])
+
+    def save(self, path: str = DEFAULT_INDEX_PATH) -> None:
+        """Write the index to `path` atomically, so a reader never sees a partial file."""
+        with self._lock:
+            arrays = {
+                "student_ids": np.array(self._student_ids, dtype=str),
+                "vectors": self._vectors[:self._size],
+                "mean": self._mean,
+                "scale": self._scale,
+                "centroids": self._centroids if self._centroids is not None else np.empty((0, len(self._mean))),
+                "assignments": self._assignments[:self._size],
+            }
+        temporary = f"{path}.tmp.npz"
+        np.savez(temporary, **arrays)
+        os.replace(temporary, path)
+        self._saved_mtime = os.path.getmtime(path)
+
+    def load(self, path: str = DEFAULT_INDEX_PATH) -> bool:
+        """Replace the index with the one saved at `path`. Returns False if there is no saved index."""
+        if not os.path.exists(path):
+            return False
+        mtime = os.path.getmtime(path)
+        with np.load(path) as saved:
+            student_ids = saved["student_ids"].tolist()
+            vectors = saved["vectors"]
+            centroids = saved["centroids"]
+            with self._lock:
+                self._student_ids = student_ids
+                self._positions = {student_id: i for i, student_id in enumerate(student_ids)}
+                self._vectors = vectors.copy()
+                self._norms = (self._vectors ** 2).sum(axis=1)
+                self._size = len(student_ids)
+                self._mean, self._scale = saved["mean"], saved["scale"]
+                self._centroids = centroids if len(centroids) else None
+                self._assignments = saved["assignments"].astype(np.int64)
+                self._saved_mtime = mtime
+        return True
+
+    def ensure_loaded(self, student_ids=None, path: str = DEFAULT_INDEX_PATH) -> bool:
+        """
+        Make the index available without building it inside a request: load the saved index if there is one
+        (again whenever another process, such as the bulk importer, has saved a newer one), otherwise build
+        and save it only for cohorts of at most `LAZY_BUILD_LIMIT` students.
+        `student_ids` is a callable listing the cohort. Returns whether the index is ready.
+        """
+        if os.path.exists(path) and os.path.getmtime(path) > self._saved_mtime and self.load(path):
+            return True
+        if self._size:
+            return True
+        if student_ids is None:
+            return False
+        cohort = student_ids()
+        if len(cohort) > LAZY_BUILD_LIMIT:
+            return False
+        self.build(cohort)
+        self.save(path)
+        return True
+
+    def _standardize(self, values: np.ndarray) -> np.ndarray:
+        return (values - self._mean) / self._scale
+
+    def _append(self, student_id: str) -> int:
+        # Grow the backing arrays geometrically so appends stay amortized O(1)
+        if self._size == len(self._vectors):
+            capacity = max(16, 2 * len(self._vectors))
+            vectors = np.zeros((capacity, len(self._mean)))
+            vectors[:self._size] = self._vectors[:self._size]
+            norms = np.zeros(capacity)
+            norms[:self._size] = self._norms[:self._size]
+            assignments = np.zeros(capacity, dtype=np.int64)
+            assignments[:self._size] = self._assignments[:self._size]
+            self._vectors, self._norms, self._assignments = vectors, norms, assignments
+        position = self._size
+        self._student_ids.append(student_id)
+        self._positions[student_id] = position
+        self._size += 1
+        return position
+
+    def _assign(self, vectors: np.ndarray) -> np.ndarray:
+        if self._centroids is None:
+            return np.zeros(len(vectors), dtype=np.int64)
+        # |v - c|^2 = |v|^2 - 2 v.c + |c|^2; |v|^2 does not change the argmin
+        scores = (self._centroids ** 2).sum(axis=1) - 2 * vectors @ self._centroids.T
+        return scores.argmin(axis=1)
+
+    def _kmeans(self, vectors: np.ndarray, partitions: int) -> np.ndarray:
+        rng = np.random.default_rng(0)
+        # Seed from distinct vectors; students filled in with the same defaults would otherwise yield duplicate centroids
+        distinct = np.unique(vectors, axis=0)
+        centroids = distinct[rng.choice(len(distinct), size=min(partitions, len(distinct)), replace=False)].copy()
+        for _ in range(KMEANS_ITERATIONS):
+            self._centroids = centroids
+            assignments = self._assign(vectors)
+            counts = np.bincount(assignments, minlength=len(centroids))
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assignments, vectors)
+            # Empty partitions keep their previous centroid
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+        return centroids
+
+similar_student_index = SimilarStudentIndex()
+
+def main():
+    parser = argparse.ArgumentParser(description="Build the similar-student index for every known student and save it.")
+    parser.add_argument("--path", default=DEFAULT_INDEX_PATH)
+    parser.add_argument("--partitions", type=int, help="Override the automatic partition count (0 disables partitioning)")
+    args = parser.parse_args()
+
+    from school_dropout_agent.infrastructure.mock_data import MockDataStore
+    started = time.perf_counter()
+    similar_student_index.build(MockDataStore.student_ids(), args.partitions)
+    similar_student_index.save(args.path)
+    print(json.dumps({
+        "path": args.path,
+        "students": len(similar_student_index),
+        "partitions": similar_student_index.partitions,
+        "seconds": round(time.perf_counter() - started, 3)
+    }))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+This module builds numeric feature arrays for a cohort of students.
+Each feature is extracted from the student's data categories (attendance, grades, LMS, ...) with the same
+defaults the agent tools fall back to, so batch evaluation agrees with what the agents see.
+Used by the threshold rule engine and the similar-student index.
+"""
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from school_dropout_agent.infrastructure.mock_data import MockDataStore
+from school_dropout_agent.infrastructure.nlp.sentiment import sentiment_scorer
+
+CATEGORIES = ["attendance", "grades", "lms", "financial", "counseling", "surveys", "social"]
+
+# Survey comment assumed for students without survey data, as the emotional tools do
+DEFAULT_COMMENT = "Everything is going well."
+
+def _days_since(date: Optional[str]) -> float:
+    if not date:
+        return 0.0
+    return float((datetime.now() - datetime.strptime(date, "%Y-%m-%d")).days)
+
+# Feature name -> (category, extractor of the category's data, default when the category is missing)
+FEATURES: Dict[str, Tuple[str, Callable[[Dict[str, Any]], float], float]] = {
+    "attendance_rate": ("attendance", lambda d: d.get("attendance_rate", 1.0), 1.0),
+    "recent_absences": ("attendance", lambda d: d.get("recent_absences", 0), 0.0),
+    "current_gpa": ("grades", lambda d: d.get("current_gpa", 3.0), 3.0),
+    "failed_courses": ("grades", lambda d: d.get("failed_courses", 0), 0.0),
+    "missing_assignments": ("grades", lambda d: d.get("missing_assignments", 0), 0.0),
+    "days_since_lms_login": ("lms", lambda d: _days_since(d.get("last_login")), 0.0),
+    "lms_daily_minutes": ("lms", lambda d: d.get("average_daily_time_minutes", 30), 30.0),
+    "financial_hold": ("financial", lambda d: float(bool(d.get("financial_hold"))), 0.0),
+    "tuition_unpaid": ("financial", lambda d: float(not d.get("tuition_paid", True)), 0.0),
+    "outstanding_balance": ("financial", lambda d: d.get("outstanding_balance", 0.0), 0.0),
+    "recent_counseling_visits": ("counseling", lambda d: d.get("recent_visits", 0), 0.0),
+    "total_counseling_visits": ("counseling", lambda d: d.get("total_visits", 0), 0.0),
+    "stress_level": ("surveys", lambda d: d.get("stress_level", 2.0), 2.0),
+    "satisfaction_score": ("surveys", lambda d: d.get("satisfaction_score", 4.0), 4.0),
+    "workload_rating": ("surveys", lambda d: d.get("workload_rating", 3.0), 3.0),
+    "club_memberships": ("social", lambda d: d.get("club_memberships", 1), 1.0),
+    "event_attendance_last_month": ("social", lambda d: d.get("event_attendance_last_month", 2), 2.0),
+    "peer_interaction_score": ("social", lambda d: d.get("peer_interaction_score", 3.0), 3.0),
+}
+
+# Text-derived features, scored for the whole cohort in one batch
+TEXT_FEATURES = ["comment_sentiment", "comment_distress", "issue_distress"]
+
+FEATURE_NAMES = list(FEATURES) + TEXT_FEATURES
+
+@dataclass
+class FeatureMatrix:
+    """Rows are students, columns are features, in `FEATURE_NAMES` order."""
+    student_ids: List[str]
+    feature_names: List[str]
+    values: np.ndarray
+
+    def column(self, name: str) -> np.ndarray:
+        return self.values[:, self.feature_names.index(name)]
+
+    def row(self, student_id: str) -> Dict[str, float]:
+        values = self.values[self.student_ids.index(student_id)]
+        return dict(zip(self.feature_names, values.tolist()))
+
+def build_feature_matrix(student_ids: List[str]) -> FeatureMatrix:
+    """Extract every feature for every student into one float matrix."""
+    values = np.empty((len(student_ids), len(FEATURE_NAMES)))
+    comments: List[str] = []
+    issues: List[List[str]] = []
+    cohort_data = MockDataStore.get_many(student_ids, CATEGORIES)
+    for row, student_id in enumerate(student_ids):
+        data = cohort_data[student_id]
+        for column, (category, extract, default) in enumerate(FEATURES.values()):
+            category_data = data[category]
+            values[row, column] = float(extract(category_data)) if category_data else default
+        comments.append((data["surveys"] or {}).get("comments", DEFAULT_COMMENT))
+        issues.append((data["counseling"] or {}).get("reported_issues", []))
+
+    # One scoring pass for all comments and issues of the cohort
+    scores = sentiment_scorer.score_batch(comments + [issue for student_issues in issues for issue in student_issues])
+    offset = len(comments)
+    first_text_column = len(FEATURES)
+    for row, student_issues in enumerate(issues):
+        issue_scores = scores[offset:offset + len(student_issues)]
+        offset += len(student_issues)
+        values[row, first_text_column] = scores[row]["sentiment"]
+        values[row, first_text_column + 1] = scores[row]["distress"]
+        values[row, first_text_column + 2] = max((s["distress"] for s in issue_scores), default=0.0)
+
+    return FeatureMatrix(list(student_ids), list(FEATURE_NAMES), values)
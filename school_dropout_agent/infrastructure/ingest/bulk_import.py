@@ -0,0 +1,228 @@
+"""
+This module implements the chunked bulk importer for SIS/LMS data files.
+CSV or JSON Lines exports of students, attendance, grades, LMS and financial data are parsed by a generator
+pipeline (read -> validate -> chunk), and each chunk is upserted with multi-row statements in its own transaction.
+Invalid rows are rejected with their line number instead of aborting the load.
+Usage: python -m school_dropout_agent.infrastructure.ingest.bulk_import grades grades_nightly.csv
+"""
+import argparse
+import csv
+import itertools
+import json
+import os
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from school_dropout_agent.infrastructure.analytics.dashboard_counters import dashboard_counters
+from school_dropout_agent.infrastructure.database.database import SessionLocal, upsert_statement
+from school_dropout_agent.infrastructure.database.models import StudentDataModel, StudentModel
+from school_dropout_agent.infrastructure.features.similarity_index import similar_student_index
+
+IMPORT_CHUNK_SIZE = 5000
+MAX_REPORTED_ERRORS = 20
+
+def _bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in ("true", "1", "yes", "y"):
+        return True
+    if text in ("false", "0", "no", "n"):
+        return False
+    raise ValueError(f"not a boolean: {value!r}")
+
+def _date(value: Any) -> str:
+    """ISO date string (YYYY-MM-DD), as the mock data and feature extractors expect."""
+    return datetime.fromisoformat(str(value).strip()).strftime("%Y-%m-%d")
+
+def _json_list(value: Any) -> List[Any]:
+    parsed = json.loads(value) if isinstance(value, str) else value
+    if not isinstance(parsed, list):
+        raise ValueError(f"not a list: {value!r}")
+    return parsed
+
+def _bounded(convert: Callable[[Any], float], low: float, high: float) -> Callable[[Any], float]:
+    def check(value: Any) -> float:
+        number = convert(value)
+        if not low <= number <= high:
+            raise ValueError(f"{number} is outside [{low}, {high}]")
+        return number
+    return check
+
+def _non_negative(convert: Callable[[Any], float]) -> Callable[[Any], float]:
+    return _bounded(convert, 0, float("inf"))
+
+def _int(value: Any) -> int:
+    return int(float(value))
+
+# Kind -> field -> converter. Fields not listed are kept as they are (category data) or ignored (students).
+SCHEMAS: Dict[str, Dict[str, Callable[[Any], Any]]] = {
+    "students": {
+        "first_name": str,
+        "last_name": str,
+        "email": str,
+        "enrollment_status": str,
+        "major": str,
+        "enrollment_date": lambda v: datetime.fromisoformat(str(v).strip()),
+    },
+    "attendance": {
+        "total_classes": _non_negative(_int),
+        "missed_classes": _non_negative(_int),
+        "attendance_rate": _bounded(float, 0.0, 1.0),
+        "recent_absences": _non_negative(_int),
+        "last_attended": _date,
+    },
+    "grades": {
+        "current_gpa": _bounded(float, 0.0, 4.0),
+        "failed_courses": _non_negative(_int),
+        "missing_assignments": _non_negative(_int),
+        "recent_grades": _json_list,
+    },
+    "lms": {
+        "last_login": _date,
+        "average_daily_time_minutes": _non_negative(float),
+        "resources_viewed_last_week": _non_negative(_int),
+    },
+    "financial": {
+        "tuition_paid": _bool,
+        "financial_hold": _bool,
+        "outstanding_balance": _non_negative(float),
+    },
+}
+
+def read_records(path: str, format: Optional[str] = None) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    """Yield (line number, raw record) from a CSV or JSON Lines file, one at a time."""
+    format = (format or os.path.splitext(path)[1].lstrip(".")).lower()
+    with open(path, newline="") as f:
+        if format == "csv":
+            # Line 1 is the header
+            for line, record in enumerate(csv.DictReader(f), start=2):
+                yield line, record
+        elif format == "jsonl":
+            for line, text in enumerate(f, start=1):
+                if text.strip():
+                    try:
+                        yield line, json.loads(text)
+                    except json.JSONDecodeError as e:
+                        yield line, {"__error__": f"invalid JSON: {e.msg}"}
+        else:
+            raise ValueError(f"Unknown import format '{format}'; expected csv or jsonl")
+
+class RejectedRows:
+    """Count of rejected rows, keeping the first `MAX_REPORTED_ERRORS` for the report."""
+
+    def __init__(self):
+        self.count = 0
+        self.samples: List[Dict[str, Any]] = []
+
+    def append(self, error: Tuple[int, str]) -> None:
+        self.count += 1
+        if len(self.samples) < MAX_REPORTED_ERRORS:
+            self.samples.append({"line": error[0], "error": error[1]})
+
+def validate(kind: str, records: Iterable[Tuple[int, Dict[str, Any]]], errors: RejectedRows) -> Iterator[Dict[str, Any]]:
+    """Convert each record to its database row, recording (line, message) in `errors` for rejected ones."""
+    schema = SCHEMAS[kind]
+    for line, record in records:
+        if "__error__" in record:
+            errors.append((line, record["__error__"]))
+            continue
+        student_id = str(record.get("student_id") or "").strip()
+        if not student_id:
+            errors.append((line, "missing student_id"))
+            continue
+        try:
+            values = {
+                field: schema[field](value) if field in schema else value
+                for field, value in record.items()
+                if field != "student_id" and value not in (None, "")
+            }
+        except (ValueError, TypeError) as e:
+            errors.append((line, str(e)))
+            continue
+
+        if kind == "students":
+            # Only the columns the file provides, so a partial file or blank cell never nulls stored values
+            yield {"student_id": student_id, **{field: value for field, value in values.items() if field in schema}}
+        else:
+            yield {"student_id": student_id, "category": kind, "data": values, "updated_at": datetime.now()}
+
+def chunked(rows: Iterable[Dict[str, Any]], size: int) -> Iterator[List[Dict[str, Any]]]:
+    iterator = iter(rows)
+    while chunk := list(itertools.islice(iterator, size)):
+        yield chunk
+
+def import_file(
+    kind: str,
+    path: str,
+    format: Optional[str] = None,
+    chunk_size: int = IMPORT_CHUNK_SIZE
+) -> Dict[str, Any]:
+    """
+    Stream a file into the database, upserting `chunk_size` rows per transaction.
+    Students go to `students`; attendance, grades, LMS and financial rows replace the student's data for that category.
+    """
+    if kind not in SCHEMAS:
+        raise ValueError(f"Unknown import kind '{kind}'; expected one of {sorted(SCHEMAS)}")
+    if kind == "students":
+        model, keys = StudentModel, ["student_id"]
+    else:
+        model, keys = StudentDataModel, ["student_id", "category"]
+    # One statement per set of columns present; student rows update only the columns their record provides,
+    # and columns the importer does not know about (e.g. metadata_json) are left as they are
+    statements: Dict[Tuple[str, ...], Any] = {}
+
+    errors = RejectedRows()
+    started = time.perf_counter()
+    loaded = 0
+    student_ids = set()
+    db = SessionLocal()
+    try:
+        for chunk in chunked(validate(kind, read_records(path, format), errors), chunk_size):
+            # A key may appear only once per statement; later occurrences in the file win column by column
+            unique: Dict[Tuple[Any, ...], Dict[str, Any]] = {}
+            for row in chunk:
+                unique.setdefault(tuple(row[key] for key in keys), {}).update(row)
+            groups: Dict[Tuple[str, ...], List[Dict[str, Any]]] = {}
+            for row in unique.values():
+                groups.setdefault(tuple(sorted(row)), []).append(row)
+            with db.begin():
+                for columns, rows in groups.items():
+                    if columns not in statements:
+                        statements[columns] = upsert_statement(model, keys, [c for c in columns if c not in keys])
+                    db.execute(statements[columns], rows)
+            loaded += len(unique)
+            student_ids.update(row["student_id"] for row in unique.values())
+    finally:
+        db.close()
+    if kind == "students" and loaded:
+        # The upserts bypass the memory service, so majors in the dashboard counters may have moved
+        dashboard_counters.reconcile()
+    if student_ids and similar_student_index.ensure_loaded():
+        # Add new students to the saved similar-student index and refresh the vectors of updated ones
+        similar_student_index.upsert_many(sorted(student_ids))
+        similar_student_index.save()
+
+    seconds = time.perf_counter() - started
+    return {
+        "kind": kind,
+        "path": path,
+        "rows_loaded": loaded,
+        "rows_rejected": errors.count,
+        "errors": errors.samples,
+        "seconds": round(seconds, 3),
+        "rows_per_second": round(loaded / seconds) if seconds else None
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Bulk-load a CSV or JSON Lines export of SIS/LMS data.")
+    parser.add_argument("kind", choices=sorted(SCHEMAS))
+    parser.add_argument("path")
+    parser.add_argument("--format", choices=["csv", "jsonl"])
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE)
+    args = parser.parse_args()
+    print(json.dumps(import_file(args.kind, args.path, args.format, args.chunk_size)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+This module implements the ControlledLlm wrapper and the `build_model` helper used by every agent.
+ControlledLlm routes each call of an inner model through the shared ModelCallController and retries
+rate-limited (429) calls with exponential backoff, so raising parallelism never turns into a retry storm.
+Set MODEL_CONTROLLER_ENABLED=false to hand agents the bare model instead.
+"""
+import asyncio
+import os
+import random
+from typing import AsyncGenerator, Optional, Union
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.adk.models.registry import LLMRegistry
+from google.adk.utils.context_utils import Aclosing
+from pydantic import Field
+
+from school_dropout_agent.infrastructure.llm.model_call_controller import ModelCallController, get_default_controller
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for HTTP 429 / RESOURCE_EXHAUSTED errors from the model API."""
+    return getattr(error, "code", None) == 429 or "RESOURCE_EXHAUSTED" in str(error)
+
+def estimate_request_tokens(llm_request: LlmRequest) -> int:
+    """Rough prompt size (4 characters per token) used to pre-charge the token bucket."""
+    chars = len(str(llm_request.config.system_instruction or "")) if llm_request.config else 0
+    for content in llm_request.contents:
+        for part in content.parts or []:
+            chars += len(part.text or "")
+            if part.function_call:
+                chars += len(str(part.function_call.args))
+            if part.function_response:
+                chars += len(str(part.function_response.response))
+    return chars // 4
+
+class ControlledLlm(BaseLlm):
+    """
+    Model wrapper that admits calls through a ModelCallController.
+
+    A 429 raised before the first response is reported to the controller as throttling and the call
+    is retried after `base_backoff_seconds * 2**attempt` (with jitter, capped at `max_backoff_seconds`).
+    Errors after a response has been streamed are never retried.
+    The slot is released, and the latency measured, as soon as the complete response arrives,
+    before the caller acts on it.
+    """
+
+    model: str
+    inner: BaseLlm
+    controller: ModelCallController = Field(default_factory=get_default_controller)
+    max_retries: int = 5
+    base_backoff_seconds: float = 0.5
+    max_backoff_seconds: float = 30.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        estimated_tokens = estimate_request_tokens(llm_request)
+        for attempt in range(self.max_retries + 1):
+            ticket = await self.controller.acquire(estimated_tokens)
+            throttled = False
+            released = False
+            try:
+                async with Aclosing(self.inner.generate_content_async(llm_request, stream)) as agen:
+                    async for llm_response in agen:
+                        ticket.responses += 1
+                        if llm_response.usage_metadata and llm_response.usage_metadata.total_token_count:
+                            ticket.used_tokens = llm_response.usage_metadata.total_token_count
+                        if not llm_response.partial and not released:
+                            # ADK runs the tool calls while we are suspended in `yield`; that time is
+                            # neither model latency nor a use of the concurrency slot
+                            released = True
+                            self.controller.release(ticket)
+                        yield llm_response
+                return
+            except Exception as e:
+                if ticket.responses or not is_rate_limit_error(e) or attempt == self.max_retries:
+                    raise
+                throttled = True
+            finally:
+                if not released:
+                    self.controller.release(ticket, throttled=throttled)
+
+            backoff = min(self.max_backoff_seconds, self.base_backoff_seconds * 2 ** attempt)
+            await asyncio.sleep(backoff * random.uniform(0.5, 1.0))
+
+def build_model(model: Union[str, BaseLlm], controller: Optional[ModelCallController] = None) -> Union[str, BaseLlm]:
+    """Resolve a model name or instance and wrap it in a ControlledLlm sharing the default controller."""
+    if os.getenv("MODEL_CONTROLLER_ENABLED", "true").lower() in ("0", "false", "no"):
+        return model
+    if isinstance(model, ControlledLlm):
+        return model
+    inner = LLMRegistry.new_llm(model) if isinstance(model, str) else model
+    return ControlledLlm(model=inner.model, inner=inner, controller=controller or get_default_controller())
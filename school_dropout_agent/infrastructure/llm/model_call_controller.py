@@ -0,0 +1,206 @@
+"""
+This module implements the ModelCallController shared by every agent's model calls.
+It paces requests with token buckets for requests and tokens per minute, and adapts the number of
+concurrent calls with additive-increase/multiplicative-decrease driven by latency and throttling.
+Used by ControlledLlm; one controller per process is shared through `get_default_controller`.
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+class TokenBucket:
+    """Refills at `rate_per_minute`, holds at most `capacity`; consumption may go into debt."""
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.rate_per_second = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate_per_second)
+        self._updated = now
+
+    def delay_for(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 when they already are)."""
+        self._refill()
+        # Requests larger than the bucket only wait for a full bucket
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate_per_second
+
+    def consume(self, amount: float) -> None:
+        self._refill()
+        self.tokens -= amount
+
+    def drain(self) -> None:
+        """Empty the bucket so admissions continue only at the refill rate."""
+        self._refill()
+        self.tokens = min(self.tokens, 0.0)
+
+@dataclass
+class ModelCallTicket:
+    """One admitted model call, returned by `acquire` and handed back to `release`."""
+    started_at: float
+    estimated_tokens: int
+    used_tokens: Optional[int] = None
+    responses: int = 0
+
+class ModelCallController:
+    """
+    Admission control for model calls.
+
+    A call is admitted when fewer than `concurrency_limit` calls are in flight and both buckets
+    have room. The limit grows by `increase_step / limit` per fast success (about +1 per window of
+    calls), shrinks by `throttle_decrease_factor` on a 429 and by `latency_decrease_factor` when the
+    smoothed latency exceeds `latency_tolerance` times the fastest latency seen (latencies under
+    `latency_floor_seconds` never count as congestion). Only one decrease is applied
+    per window: throttles from calls admitted before the last decrease are ignored.
+    Waiters are plain futures, so the controller serves one event loop at a time.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 1000,
+        tokens_per_minute: float = 1_000_000,
+        initial_concurrency: float = 4,
+        min_concurrency: float = 1,
+        max_concurrency: float = 32,
+        increase_step: float = 1.0,
+        throttle_decrease_factor: float = 0.5,
+        latency_decrease_factor: float = 0.9,
+        latency_tolerance: float = 2.0,
+        latency_floor_seconds: float = 0.05,
+        latency_smoothing: float = 0.2
+    ):
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase_step = increase_step
+        self.throttle_decrease_factor = throttle_decrease_factor
+        self.latency_decrease_factor = latency_decrease_factor
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor_seconds = latency_floor_seconds
+        self.latency_smoothing = latency_smoothing
+
+        self._limit = float(initial_concurrency)
+        self._in_flight = 0
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+        self._min_latency: Optional[float] = None
+        self._smoothed_latency: Optional[float] = None
+
+        self.admitted = 0
+        self.throttled = 0
+        self.wait_seconds = 0.0
+
+    @classmethod
+    def from_env(cls) -> "ModelCallController":
+        """Controller configured from MODEL_* environment variables."""
+        return cls(
+            requests_per_minute=float(os.getenv("MODEL_REQUESTS_PER_MINUTE", "1000")),
+            tokens_per_minute=float(os.getenv("MODEL_TOKENS_PER_MINUTE", "1000000")),
+            initial_concurrency=float(os.getenv("MODEL_INITIAL_CONCURRENCY", "4")),
+            max_concurrency=float(os.getenv("MODEL_MAX_CONCURRENCY", "32"))
+        )
+
+    @property
+    def concurrency_limit(self) -> int:
+        return max(int(self.min_concurrency), int(self._limit))
+
+    async def acquire(self, estimated_tokens: int = 0) -> ModelCallTicket:
+        """Wait for a concurrency slot and bucket capacity, then admit the call."""
+        requested_at = time.monotonic()
+        while True:
+            if self._in_flight >= self.concurrency_limit:
+                waiter = asyncio.get_running_loop().create_future()
+                self._waiters.append(waiter)
+                try:
+                    await waiter
+                finally:
+                    if waiter in self._waiters:
+                        self._waiters.remove(waiter)
+                continue
+
+            delay = max(self._requests.delay_for(1), self._tokens.delay_for(estimated_tokens))
+            if delay > 0:
+                await asyncio.sleep(delay)
+                continue
+
+            self._requests.consume(1)
+            self._tokens.consume(estimated_tokens)
+            self._in_flight += 1
+            self.admitted += 1
+            now = time.monotonic()
+            self.wait_seconds += now - requested_at
+            return ModelCallTicket(started_at=now, estimated_tokens=estimated_tokens)
+
+    def release(self, ticket: ModelCallTicket, throttled: bool = False) -> None:
+        """Finish a call, true up the token bucket and adapt the concurrency limit."""
+        self._in_flight -= 1
+        now = time.monotonic()
+        if ticket.used_tokens is not None:
+            self._tokens.consume(ticket.used_tokens - ticket.estimated_tokens)
+
+        if throttled:
+            self.throttled += 1
+            self._requests.drain()
+            self._decrease(ticket, self.throttle_decrease_factor, now)
+        elif self._is_congested(now - ticket.started_at):
+            self._decrease(ticket, self.latency_decrease_factor, now)
+        else:
+            self._limit = min(self.max_concurrency, self._limit + self.increase_step / max(self._limit, 1.0))
+
+        self._wake()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": self.concurrency_limit,
+            "in_flight": self._in_flight,
+            "admitted": self.admitted,
+            "throttled": self.throttled,
+            "smoothed_latency_seconds": round(self._smoothed_latency or 0.0, 4),
+            "wait_seconds": round(self.wait_seconds, 3)
+        }
+
+    def _is_congested(self, latency: float) -> bool:
+        if self._min_latency is None:
+            self._min_latency = self._smoothed_latency = latency
+            return False
+        self._min_latency = min(self._min_latency, latency)
+        self._smoothed_latency += self.latency_smoothing * (latency - self._smoothed_latency)
+        return self._smoothed_latency > max(self._min_latency * self.latency_tolerance, self.latency_floor_seconds)
+
+    def _decrease(self, ticket: ModelCallTicket, factor: float, now: float) -> None:
+        if ticket.started_at < self._last_decrease:
+            return
+        self._limit = max(self.min_concurrency, self._limit * factor)
+        self._last_decrease = now
+
+    def _wake(self) -> None:
+        free = self.concurrency_limit - self._in_flight
+        while free > 0 and self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+_default_controller: Optional[ModelCallController] = None
+
+def get_default_controller() -> ModelCallController:
+    """The process-wide controller, created from the environment on first use."""
+    global _default_controller
+    if _default_controller is None:
+        _default_controller = ModelCallController.from_env()
+    return _default_controller
+
+def set_default_controller(controller: Optional[ModelCallController]) -> None:
+    """Replace the process-wide controller (None recreates it from the environment on next use)."""
+    global _default_controller
+    _default_controller = controller
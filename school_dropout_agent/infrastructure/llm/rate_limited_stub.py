@@ -0,0 +1,64 @@
+"""
+This module implements the RateLimitedStubLlm, a local stand-in for a rate-limited model endpoint.
+It answers like ScriptedLlm but rejects calls with a 429 RESOURCE_EXHAUSTED error once a sliding-window
+request quota or a concurrency cap is exceeded, and slows down as it gets busier.
+Used by the model controller benchmark to exercise throttling without calling Gemini.
+"""
+import asyncio
+import time
+from collections import deque
+from typing import AsyncGenerator, Deque
+
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai.errors import ClientError
+from pydantic import Field, PrivateAttr
+
+from school_dropout_agent.infrastructure.llm.scripted_llm import ScriptedLlm
+
+class RateLimitedStubLlm(ScriptedLlm):
+    """
+    ScriptedLlm behind simulated server-side limits.
+
+    At most `requests_per_window` calls are accepted per `window_seconds` and at most `max_concurrent`
+    may run at once. Each accepted call takes `latency_seconds` plus `congestion_seconds` per other call
+    in flight. Counters of accepted and rejected calls are kept for reporting.
+    """
+
+    model: str = "rate-limited-stub"
+    requests_per_window: int = 60
+    window_seconds: float = 1.0
+    max_concurrent: int = 8
+    congestion_seconds: float = 0.0
+
+    accepted: int = Field(default=0, exclude=True)
+    rejected: int = Field(default=0, exclude=True)
+    _recent: Deque[float] = PrivateAttr(default_factory=deque)
+    _in_flight: int = PrivateAttr(default=0)
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        now = time.monotonic()
+        while self._recent and now - self._recent[0] >= self.window_seconds:
+            self._recent.popleft()
+        if len(self._recent) >= self.requests_per_window or self._in_flight >= self.max_concurrent:
+            self.rejected += 1
+            raise ClientError(429, {"error": {"code": 429, "message": "Resource exhausted.", "status": "RESOURCE_EXHAUSTED"}})
+
+        self._recent.append(now)
+        self._in_flight += 1
+        self.accepted += 1
+        try:
+            if self.congestion_seconds:
+                await asyncio.sleep(self.congestion_seconds * (self._in_flight - 1))
+            async for llm_response in super().generate_content_async(llm_request, stream):
+                yield llm_response
+        finally:
+            self._in_flight -= 1
+
+    def reset(self) -> None:
+        self.accepted = 0
+        self.rejected = 0
+        self._recent.clear()
+        self._in_flight = 0
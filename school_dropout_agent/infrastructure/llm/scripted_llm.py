@@ -0,0 +1,186 @@
+"""
+This module implements the ScriptedLlm, a deterministic stand-in for Gemini.
+For each agent in the FullAnalysisPipeline it emits a fixed sequence of tool calls followed by a short reply,
+so the pipeline can be run offline and repeatably by benchmarks and verification scripts.
+"""
+import asyncio
+import re
+from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Tuple
+
+from google.adk.models.base_llm import BaseLlm
+from google.adk.models.llm_request import LlmRequest
+from google.adk.models.llm_response import LlmResponse
+from google.genai import types
+from pydantic import Field
+
+from school_dropout_agent.infrastructure.mock_data import MockDataStore
+
+# A step is a tool name plus a function building its arguments from the student ID
+ScriptStep = Tuple[str, Callable[[str], Dict[str, Any]]]
+
+_AGENT_NAME = re.compile(r'Your internal name is "([^"]+)"')
+_STUDENT_ID = re.compile(r"\bstudent_[A-Za-z0-9_]+")
+
+_RISK_SCORES = {"High": 0.85, "Medium": 0.5, "Low": 0.15}
+
+def _risk_level(student_id: str) -> str:
+    profile = MockDataStore.get_student_data(student_id, "profile") or {}
+    return profile.get("risk_level", "Low")
+
+def _first_weak_subject(student_id: str) -> Dict[str, Any]:
+    data = MockDataStore.get_student_data(student_id, "academic_support") or {}
+    weak = data.get("weak_subjects") or [{"subject": "General Studies", "topic": "Study Skills"}]
+    return {"subject": weak[0]["subject"], "topic": weak[0]["topic"]}
+
+def _parent_language(student_id: str) -> str:
+    data = MockDataStore.get_student_data(student_id, "family") or {}
+    return data.get("preferred_language", "English")
+
+DEFAULT_SCRIPTS: Dict[str, List[ScriptStep]] = {
+    "dropout_prevention_orchestrator": [
+        ("transfer_to_agent", lambda sid: {"agent_name": "full_analysis_pipeline"}),
+    ],
+    "risk_prediction_agent": [
+        ("get_student_attendance", lambda sid: {"student_id": sid}),
+        ("get_student_grades", lambda sid: {"student_id": sid}),
+        ("get_lms_activity", lambda sid: {"student_id": sid}),
+        ("get_financial_status", lambda sid: {"student_id": sid}),
+        ("save_risk_assessment", lambda sid: {
+            "student_id": sid,
+            "risk_score": _RISK_SCORES[_risk_level(sid)],
+            "risk_level": _risk_level(sid),
+            "risk_factors": ["attendance", "grades"] if _risk_level(sid) != "Low" else []
+        }),
+        ("save_agent_result", lambda sid: {
+            "agent_name": "risk_prediction_agent",
+            "result": {"student_id": sid, "risk_level": _risk_level(sid), "risk_score": _RISK_SCORES[_risk_level(sid)]}
+        }),
+    ],
+    "emotional_behavioral_agent": [
+        ("get_counseling_visits", lambda sid: {"student_id": sid}),
+        ("get_survey_responses", lambda sid: {"student_id": sid}),
+        ("get_social_engagement", lambda sid: {"student_id": sid}),
+        ("save_agent_result", lambda sid: {
+            "agent_name": "emotional_behavioral_agent",
+            "result": {"student_id": sid, "flags": ["high_stress"] if _risk_level(sid) == "High" else []}
+        }),
+    ],
+    "academic_support_agent": [
+        ("get_weak_subjects", lambda sid: {"student_id": sid}),
+        ("get_learning_style", lambda sid: {"student_id": sid}),
+        ("get_study_resources", _first_weak_subject),
+        ("save_agent_result", lambda sid: {
+            "agent_name": "academic_support_agent",
+            "result": {"student_id": sid, "study_plan": [_first_weak_subject(sid)]}
+        }),
+    ],
+    "intervention_coordinator_agent": [
+        ("get_active_interventions", lambda sid: {"student_id": sid}),
+        ("create_intervention", lambda sid: {
+            "student_id": sid, "intervention_type": "Academic", "description": "Weekly tutoring sessions"
+        }),
+        ("notify_stakeholder", lambda sid: {
+            "stakeholder_type": "teacher", "student_id": sid, "message": "Student enrolled in weekly tutoring."
+        }),
+        ("save_agent_result", lambda sid: {
+            "agent_name": "intervention_coordinator_agent",
+            "result": {"student_id": sid, "interventions": ["Academic"]}
+        }),
+    ],
+    "family_engagement_agent": [
+        ("get_parent_contact_info", lambda sid: {"student_id": sid}),
+        ("translate_message", lambda sid: {
+            "message": "Your child may benefit from tutoring.", "target_language": _parent_language(sid)
+        }),
+        ("send_parent_message", lambda sid: {
+            "student_id": sid, "message": "Your child may benefit from tutoring.", "language": _parent_language(sid)
+        }),
+        ("save_agent_result", lambda sid: {
+            "agent_name": "family_engagement_agent",
+            "result": {"student_id": sid, "message_sent": True, "language": _parent_language(sid)}
+        }),
+    ],
+    "monitoring_agent": [
+        ("compare_metrics", lambda sid: {"student_id": sid}),
+        ("save_agent_result", lambda sid: {"agent_name": "monitoring_agent", "result": {"student_id": sid}}),
+    ],
+    "final_summary_agent": [
+        ("get_all_agent_results", lambda sid: {"student_id": sid}),
+    ],
+    "brief_summary_agent": [
+        ("get_all_agent_results", lambda sid: {"student_id": sid}),
+    ],
+}
+
+class ScriptedLlm(BaseLlm):
+    """
+    Deterministic model that replays a per-agent script of tool calls.
+
+    The agent is identified from the system instruction ADK injects, the student from the conversation,
+    and the next step from the number of tool responses the agent has received so far.
+    `latency_seconds` simulates model time per call.
+    """
+
+    model: str = "scripted-llm"
+    scripts: Dict[str, List[ScriptStep]] = Field(default_factory=lambda: dict(DEFAULT_SCRIPTS))
+    latency_seconds: float = 0.0
+
+    async def generate_content_async(
+        self, llm_request: LlmRequest, stream: bool = False
+    ) -> AsyncGenerator[LlmResponse, None]:
+        if self.latency_seconds:
+            await asyncio.sleep(self.latency_seconds)
+
+        agent_name = self._agent_name(llm_request)
+        student_id = self._student_id(llm_request)
+        script = self.scripts.get(agent_name, [])
+        step = self._completed_steps(llm_request)
+
+        if step < len(script):
+            tool_name, build_args = script[step]
+            part = types.Part(function_call=types.FunctionCall(name=tool_name, args=build_args(student_id)))
+        else:
+            part = types.Part(text=f"{agent_name} completed for {student_id}.")
+
+        yield LlmResponse(
+            content=types.Content(role="model", parts=[part]),
+            usage_metadata=types.GenerateContentResponseUsageMetadata(
+                prompt_token_count=self._estimate_prompt_tokens(llm_request),
+                candidates_token_count=16
+            )
+        )
+
+    def _agent_name(self, llm_request: LlmRequest) -> str:
+        instruction = str(llm_request.config.system_instruction or "") if llm_request.config else ""
+        match = _AGENT_NAME.search(instruction)
+        return match.group(1) if match else ""
+
+    def _student_id(self, llm_request: LlmRequest) -> Optional[str]:
+        for content in llm_request.contents:
+            for part in content.parts or []:
+                match = _STUDENT_ID.search(part.text or "")
+                if match:
+                    return match.group(0)
+        return None
+
+    def _completed_steps(self, llm_request: LlmRequest) -> int:
+        """Count tool responses since the last plain user or context message."""
+        count = 0
+        for content in reversed(llm_request.contents):
+            parts = content.parts or []
+            responses = sum(1 for part in parts if part.function_response)
+            if content.role == "user" and not responses:
+                break
+            count += responses
+        return count
+
+    def _estimate_prompt_tokens(self, llm_request: LlmRequest) -> int:
+        chars = len(str(llm_request.config.system_instruction or "")) if llm_request.config else 0
+        for content in llm_request.contents:
+            for part in content.parts or []:
+                chars += len(part.text or "")
+                if part.function_call:
+                    chars += len(str(part.function_call.args))
+                if part.function_response:
+                    chars += len(str(part.function_response.response))
+        return chars // 4
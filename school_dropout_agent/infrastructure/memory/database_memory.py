@@ -6,21 +6,74 @@ Acts as the bridge between the application core and the database.
 from typing import Optional, List, Dict, Any
 from datetime import datetime
 import json
+from sqlalchemy import func
+from sqlalchemy.orm import aliased
 from school_dropout_agent.core.memory.memory_service import MemoryService
-from school_dropout_agent.infrastructure.database.database import SessionLocal
+from school_dropout_agent.infrastructure.database.database import SessionLocal, QUERY_CHUNK_SIZE
 from school_dropout_agent.infrastructure.database.models import (
     StudentModel, RiskProfileModel, InterventionModel
 )
 from school_dropout_agent.core.domain.intervention import InterventionType, InterventionStatus
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+from school_dropout_agent.infrastructure.analytics.dashboard_counters import (
+    count_open_intervention, dashboard_counters, move_risk_count
+)
+
+def _enum_value(value) -> str:
+    return value.value if hasattr(value, 'value') else str(value)
+
+def _intervention_to_dict(i: InterventionModel) -> Dict[str, Any]:
+    return {
+        "intervention_id": i.intervention_id,
+        "type": _enum_value(i.type),
+        "status": _enum_value(i.status),
+        "description": i.description,
+        "created_at": i.created_at.isoformat() if i.created_at else None
+    }
+
+def _risk_profile_to_dict(r: RiskProfileModel) -> Dict[str, Any]:
+    return {
+        "risk_score": r.risk_score,
+        "risk_level": r.risk_level,
+        "last_updated": r.last_updated.isoformat() if r.last_updated else None,
+        "risk_factors": r.risk_factors
+    }
+
+def _compact_history(student: StudentModel, risk_profile, recent: List[InterventionModel], counts) -> Dict[str, Any]:
+    """Build a compact history from its rows; `counts` holds (status, type, count) tuples."""
+    by_status: Dict[str, int] = {}
+    by_type: Dict[str, int] = {}
+    for status, intervention_type, count in counts:
+        by_status[_enum_value(status)] = by_status.get(_enum_value(status), 0) + count
+        by_type[_enum_value(intervention_type)] = by_type.get(_enum_value(intervention_type), 0) + count
+    
+    return {
+        "student_id": student.student_id,
+        "first_name": student.first_name,
+        "last_name": student.last_name,
+        "email": student.email,
+        "enrollment_status": student.enrollment_status,
+        "major": student.major,
+        "enrollment_date": student.enrollment_date.isoformat() if student.enrollment_date else None,
+        "risk_profile": _risk_profile_to_dict(risk_profile) if risk_profile else None,
+        "recent_interventions": [_intervention_to_dict(i) for i in recent],
+        "intervention_counts": {
+            "total": sum(by_status.values()),
+            "by_status": by_status,
+            "by_type": by_type
+        }
+    }
 
 class DatabaseMemoryService(MemoryService):
     """Memory service using PostgreSQL/SQLite database."""
     
+    @instrumentation.timed("memory.store_student_profile")
     def store_student_profile(self, student_id: str, profile_data: Dict[str, Any]) -> None:
         """Store or update a student's profile."""
         db = SessionLocal()
         try:
             student = db.query(StudentModel).filter_by(student_id=student_id).first()
+            old_major = student.major if student else None
             if student:
                 # Update existing
                 for key, value in profile_data.items():
@@ -30,10 +83,15 @@ class DatabaseMemoryService(MemoryService):
                 # Create new
                 student = StudentModel(student_id=student_id, **profile_data)
                 db.add(student)
+            if student.major != old_major:
+                risk_profile = db.get(RiskProfileModel, student_id)
+                if risk_profile:
+                    move_risk_count(db, risk_profile.risk_level, old_major, risk_profile.risk_level, student.major)
             db.commit()
         finally:
             db.close()
     
+    @instrumentation.timed("memory.retrieve_student_history")
     def retrieve_student_history(self, student_id: str) -> Optional[Dict[str, Any]]:
         """Retrieve a student's complete history."""
         db = SessionLocal()
@@ -56,30 +114,19 @@ class DatabaseMemoryService(MemoryService):
                 "enrollment_status": student.enrollment_status,
                 "major": student.major,
                 "enrollment_date": student.enrollment_date.isoformat() if student.enrollment_date else None,
-                "risk_profile": {
-                    "risk_score": risk_profile.risk_score,
-                    "risk_level": risk_profile.risk_level,
-                    "last_updated": risk_profile.last_updated.isoformat() if risk_profile.last_updated else None,
-                    "risk_factors": risk_profile.risk_factors
-                } if risk_profile else None,
-                "interventions": [
-                    {
-                        "intervention_id": i.intervention_id,
-                        "type": i.type.value if hasattr(i.type, 'value') else str(i.type),
-                        "status": i.status.value if hasattr(i.status, 'value') else str(i.status),
-                        "description": i.description,
-                        "created_at": i.created_at.isoformat() if i.created_at else None
-                    } for i in interventions
-                ]
+                "risk_profile": _risk_profile_to_dict(risk_profile) if risk_profile else None,
+                "interventions": [_intervention_to_dict(i) for i in interventions]
             }
         finally:
             db.close()
     
+    @instrumentation.timed("memory.update_risk_profile")
     def update_risk_profile(self, student_id: str, risk_data: Dict[str, Any]) -> None:
         """Update a student's risk assessment."""
         db = SessionLocal()
         try:
             risk_profile = db.query(RiskProfileModel).filter_by(student_id=student_id).first()
+            old_level = risk_profile.risk_level if risk_profile else None
             if risk_profile:
                 risk_profile.risk_score = risk_data.get("risk_score", risk_profile.risk_score)
                 risk_profile.risk_level = risk_data.get("risk_level", risk_profile.risk_level)
@@ -94,10 +141,15 @@ class DatabaseMemoryService(MemoryService):
                     last_updated=datetime.now()
                 )
                 db.add(risk_profile)
+            # Dashboard counters change in the same transaction as the profile
+            student = db.get(StudentModel, student_id)
+            major = student.major if student else None
+            move_risk_count(db, old_level, major, risk_profile.risk_level, major)
             db.commit()
         finally:
             db.close()
     
+    @instrumentation.timed("memory.store_intervention")
     def store_intervention(self, student_id: str, intervention_data: Dict[str, Any]) -> str:
         """Store an intervention and return its ID."""
         db = SessionLocal()
@@ -116,24 +168,131 @@ class DatabaseMemoryService(MemoryService):
                 updated_at=datetime.now()
             )
             db.add(intervention)
+            count_open_intervention(db, intervention_type)
             db.commit()
             return intervention.intervention_id
         finally:
             db.close()
     
+    @instrumentation.timed("memory.get_interventions")
     def get_interventions(self, student_id: str) -> List[Dict[str, Any]]:
         """Get all interventions for a student."""
         db = SessionLocal()
         try:
             interventions = db.query(InterventionModel).filter_by(student_id=student_id).all()
-            return [
-                {
-                    "intervention_id": i.intervention_id,
-                    "type": i.type.value if hasattr(i.type, 'value') else str(i.type),
-                    "status": i.status.value if hasattr(i.status, 'value') else str(i.status),
-                    "description": i.description,
-                    "created_at": i.created_at.isoformat() if i.created_at else None
-                } for i in interventions
-            ]
+            return [_intervention_to_dict(i) for i in interventions]
+        finally:
+            db.close()
+    
+    @instrumentation.timed("memory.get_risk_profiles")
+    def get_risk_profiles(self, student_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the current risk profile of many students at once, keyed by student ID."""
+        db = SessionLocal()
+        try:
+            profiles = {}
+            for start in range(0, len(student_ids), QUERY_CHUNK_SIZE):
+                chunk = student_ids[start:start + QUERY_CHUNK_SIZE]
+                for r in db.query(RiskProfileModel).filter(RiskProfileModel.student_id.in_(chunk)):
+                    profiles[r.student_id] = _risk_profile_to_dict(r)
+            return profiles
         finally:
             db.close()
+    
+    @instrumentation.timed("memory.retrieve_compact_history")
+    def retrieve_compact_history(self, student_id: str, recent_interventions: int = 5) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a bounded history: the profile, the latest risk profile, the `recent_interventions`
+        newest interventions and aggregate intervention counts by status and type.
+        """
+        db = SessionLocal()
+        try:
+            student = db.query(StudentModel).filter_by(student_id=student_id).first()
+            if not student:
+                return None
+            
+            risk_profile = db.query(RiskProfileModel).filter_by(student_id=student_id).first()
+            recent = db.query(InterventionModel).filter_by(student_id=student_id).order_by(
+                InterventionModel.created_at.desc(), InterventionModel.intervention_id.desc()
+            ).limit(recent_interventions).all()
+            counts = db.query(InterventionModel.status, InterventionModel.type, func.count()).filter_by(
+                student_id=student_id
+            ).group_by(InterventionModel.status, InterventionModel.type).all()
+            
+            return _compact_history(student, risk_profile, recent, counts)
+        finally:
+            db.close()
+    
+    @instrumentation.timed("memory.retrieve_compact_histories")
+    def retrieve_compact_histories(self, student_ids: List[str], recent_interventions: int = 5) -> Dict[str, Dict[str, Any]]:
+        """
+        Retrieve the compact history of many students at once, keyed by student ID (unknown students are omitted).
+        Uses four queries per chunk of students regardless of how many interventions they have.
+        """
+        db = SessionLocal()
+        try:
+            histories = {}
+            for start in range(0, len(student_ids), QUERY_CHUNK_SIZE):
+                chunk = student_ids[start:start + QUERY_CHUNK_SIZE]
+                students = db.query(StudentModel).filter(StudentModel.student_id.in_(chunk)).all()
+                if not students:
+                    continue
+                
+                risk_profiles = {
+                    r.student_id: r for r in db.query(RiskProfileModel).filter(RiskProfileModel.student_id.in_(chunk))
+                }
+                
+                # Newest N interventions per student in one query
+                rank = func.row_number().over(
+                    partition_by=InterventionModel.student_id,
+                    order_by=(InterventionModel.created_at.desc(), InterventionModel.intervention_id.desc())
+                ).label("rank")
+                ranked = db.query(InterventionModel, rank).filter(InterventionModel.student_id.in_(chunk)).subquery()
+                ranked_intervention = aliased(InterventionModel, ranked)
+                recent: Dict[str, List[InterventionModel]] = {}
+                for i in db.query(ranked_intervention).filter(ranked.c.rank <= recent_interventions).order_by(ranked.c.rank):
+                    recent.setdefault(i.student_id, []).append(i)
+                
+                counts: Dict[str, list] = {}
+                for student_id, status, intervention_type, count in db.query(
+                    InterventionModel.student_id, InterventionModel.status, InterventionModel.type, func.count()
+                ).filter(InterventionModel.student_id.in_(chunk)).group_by(
+                    InterventionModel.student_id, InterventionModel.status, InterventionModel.type
+                ):
+                    counts.setdefault(student_id, []).append((status, intervention_type, count))
+                
+                for student in students:
+                    histories[student.student_id] = _compact_history(
+                        student,
+                        risk_profiles.get(student.student_id),
+                        recent.get(student.student_id, []),
+                        counts.get(student.student_id, [])
+                    )
+            return histories
+        finally:
+            db.close()
+    
+    @instrumentation.timed("memory.get_intervention_page")
+    def get_intervention_page(self, student_id: str, offset: int = 0, limit: int = 10) -> Dict[str, Any]:
+        """Get one page of a student's interventions, newest first, with the total count."""
+        db = SessionLocal()
+        try:
+            query = db.query(InterventionModel).filter_by(student_id=student_id)
+            total = query.count()
+            page = query.order_by(
+                InterventionModel.created_at.desc(), InterventionModel.intervention_id.desc()
+            ).offset(offset).limit(limit).all()
+            return {
+                "student_id": student_id,
+                "offset": offset,
+                "limit": limit,
+                "total": total,
+                "has_more": offset + len(page) < total,
+                "interventions": [_intervention_to_dict(i) for i in page]
+            }
+        finally:
+            db.close()
+
+    @instrumentation.timed("memory.get_dashboard_counts")
+    def get_dashboard_counts(self) -> Dict[str, Any]:
+        """Get the live dashboard counts from the write-maintained counter table."""
+        return dashboard_counters.snapshot()
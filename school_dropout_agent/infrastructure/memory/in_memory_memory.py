@@ -0,0 +1,152 @@
+"""
+This module implements the InMemoryMemoryService.
+It keeps student profiles, risk profiles and interventions in dictionaries instead of a database.
+Used by tests, benchmarks and short-lived workers that should not touch the real database.
+"""
+from typing import Optional, List, Dict, Any
+from datetime import datetime
+import copy
+from school_dropout_agent.core.memory.memory_service import MemoryService
+from school_dropout_agent.core.domain.intervention import InterventionType, InterventionStatus
+
+class InMemoryMemoryService(MemoryService):
+    """Memory service backed by process-local dictionaries."""
+
+    def __init__(self):
+        self._students: Dict[str, Dict[str, Any]] = {}
+        self._risk_profiles: Dict[str, Dict[str, Any]] = {}
+        self._interventions: Dict[str, List[Dict[str, Any]]] = {}
+
+    def store_student_profile(self, student_id: str, profile_data: Dict[str, Any]) -> None:
+        """Store or update a student's profile."""
+        self._students.setdefault(student_id, {"student_id": student_id}).update(profile_data)
+
+    def retrieve_student_history(self, student_id: str) -> Optional[Dict[str, Any]]:
+        """Retrieve a student's complete history."""
+        student = self._students.get(student_id)
+        if not student:
+            return None
+
+        enrollment_date = student.get("enrollment_date")
+        risk_profile = self._risk_profiles.get(student_id)
+        return {
+            "student_id": student_id,
+            "first_name": student.get("first_name"),
+            "last_name": student.get("last_name"),
+            "email": student.get("email"),
+            "enrollment_status": student.get("enrollment_status"),
+            "major": student.get("major"),
+            "enrollment_date": enrollment_date.isoformat() if enrollment_date else None,
+            "risk_profile": {
+                **risk_profile,
+                "last_updated": risk_profile["last_updated"].isoformat()
+            } if risk_profile else None,
+            "interventions": self.get_interventions(student_id)
+        }
+
+    def update_risk_profile(self, student_id: str, risk_data: Dict[str, Any]) -> None:
+        """Update a student's risk assessment."""
+        current = self._risk_profiles.get(student_id, {
+            "risk_score": 0.0,
+            "risk_level": "Low",
+            "risk_factors": []
+        })
+        self._risk_profiles[student_id] = {
+            "risk_score": risk_data.get("risk_score", current["risk_score"]),
+            "risk_level": risk_data.get("risk_level", current["risk_level"]),
+            "risk_factors": risk_data.get("risk_factors", current["risk_factors"]),
+            "last_updated": datetime.now()
+        }
+
+    def store_intervention(self, student_id: str, intervention_data: Dict[str, Any]) -> str:
+        """Store an intervention and return its ID."""
+        intervention_type = intervention_data.get("type", "Academic")
+        if isinstance(intervention_type, str):
+            intervention_type = InterventionType[intervention_type.upper()]
+
+        intervention_id = intervention_data.get("intervention_id")
+        self._interventions.setdefault(student_id, []).append({
+            "intervention_id": intervention_id,
+            "type": intervention_type.value,
+            "status": InterventionStatus.PENDING.value,
+            "description": intervention_data.get("description", ""),
+            "created_at": datetime.now().isoformat()
+        })
+        return intervention_id
+
+    def get_interventions(self, student_id: str) -> List[Dict[str, Any]]:
+        """Get all interventions for a student."""
+        return copy.deepcopy(self._interventions.get(student_id, []))
+
+    def get_risk_profiles(self, student_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """Get the current risk profile of many students at once, keyed by student ID."""
+        return {
+            student_id: {**self._risk_profiles[student_id], "last_updated": self._risk_profiles[student_id]["last_updated"].isoformat()}
+            for student_id in student_ids if student_id in self._risk_profiles
+        }
+
+    def retrieve_compact_history(self, student_id: str, recent_interventions: int = 5) -> Optional[Dict[str, Any]]:
+        """
+        Retrieve a bounded history: the profile, the latest risk profile, the `recent_interventions`
+        newest interventions and aggregate intervention counts by status and type.
+        """
+        history = self.retrieve_student_history(student_id)
+        if history is None:
+            return None
+
+        interventions = history.pop("interventions")
+        by_status: Dict[str, int] = {}
+        by_type: Dict[str, int] = {}
+        for intervention in interventions:
+            by_status[intervention["status"]] = by_status.get(intervention["status"], 0) + 1
+            by_type[intervention["type"]] = by_type.get(intervention["type"], 0) + 1
+        history["recent_interventions"] = interventions[::-1][:recent_interventions]
+        history["intervention_counts"] = {"total": len(interventions), "by_status": by_status, "by_type": by_type}
+        return history
+
+    def retrieve_compact_histories(self, student_ids: List[str], recent_interventions: int = 5) -> Dict[str, Dict[str, Any]]:
+        """Retrieve the compact history of many students at once, keyed by student ID (unknown students are omitted)."""
+        histories = {}
+        for student_id in student_ids:
+            history = self.retrieve_compact_history(student_id, recent_interventions)
+            if history is not None:
+                histories[student_id] = history
+        return histories
+
+    def get_intervention_page(self, student_id: str, offset: int = 0, limit: int = 10) -> Dict[str, Any]:
+        """Get one page of a student's interventions, newest first, with the total count."""
+        interventions = self.get_interventions(student_id)[::-1]
+        page = interventions[offset:offset + limit]
+        return {
+            "student_id": student_id,
+            "offset": offset,
+            "limit": limit,
+            "total": len(interventions),
+            "has_more": offset + len(page) < len(interventions),
+            "interventions": page
+        }
+
+    def get_dashboard_counts(self) -> Dict[str, Any]:
+        """Get the live dashboard counts, aggregated from the dictionaries."""
+        by_risk_major: Dict[str, Dict[str, int]] = {}
+        by_risk: Dict[str, int] = {}
+        by_major: Dict[str, int] = {}
+        for student_id, risk_profile in self._risk_profiles.items():
+            level = risk_profile["risk_level"] or "Unknown"
+            major = self._students.get(student_id, {}).get("major") or "Unknown"
+            cells = by_risk_major.setdefault(level, {})
+            cells[major] = cells.get(major, 0) + 1
+            by_risk[level] = by_risk.get(level, 0) + 1
+            by_major[major] = by_major.get(major, 0) + 1
+        open_by_type: Dict[str, int] = {}
+        for interventions in self._interventions.values():
+            for intervention in interventions:
+                if intervention["status"] in (InterventionStatus.PENDING.value, InterventionStatus.ACTIVE.value):
+                    open_by_type[intervention["type"]] = open_by_type.get(intervention["type"], 0) + 1
+        return {
+            "students_by_risk_level": by_risk,
+            "students_by_major": by_major,
+            "students_by_risk_level_and_major": by_risk_major,
+            "open_interventions_by_type": open_by_type,
+            "open_interventions": sum(open_by_type.values())
+        }
@@ -0,0 +1,57 @@
+"""
+This module resolves which MemoryService a tool should use.
+Tools receive an ADK ToolContext and resolve the service through its public fields: the service ID the
+AnalysisRunner stores in session state, then the service registered for the running agent's name (agents register
+themselves and their sub-agents, so one shared instance serves the whole agent graph). Falls back to a process-wide default.
+"""
+from typing import Dict, Optional
+
+from school_dropout_agent.core.memory.memory_service import MemoryService
+
+# Session state key naming the registered service a session's tools use
+MEMORY_SERVICE_STATE_KEY = "memory_service_id"
+
+_default_memory_service: Optional[MemoryService] = None
+_services_by_id: Dict[str, MemoryService] = {}
+_services_by_agent_name: Dict[str, MemoryService] = {}
+
+def get_default_memory_service() -> MemoryService:
+    """Process-wide MemoryService, created on first use (DatabaseMemoryService unless overridden)."""
+    global _default_memory_service
+    if _default_memory_service is None:
+        from school_dropout_agent.infrastructure.memory.database_memory import DatabaseMemoryService
+        _default_memory_service = DatabaseMemoryService()
+    return _default_memory_service
+
+def set_default_memory_service(memory_service: Optional[MemoryService]) -> None:
+    """Replace the process-wide default, e.g. with an InMemoryMemoryService in tests."""
+    global _default_memory_service
+    _default_memory_service = memory_service
+
+def register_memory_service(memory_service: MemoryService) -> str:
+    """Register a service and return the ID a session stores under MEMORY_SERVICE_STATE_KEY to use it."""
+    service_id = f"memory_service_{id(memory_service):x}"
+    _services_by_id[service_id] = memory_service
+    return service_id
+
+def register_agent_memory_service(agent, memory_service: Optional[MemoryService]) -> None:
+    """Serve `memory_service` to the agent's tools, and to those of its sub-agents constructed without one."""
+    if memory_service is None:
+        return
+    _services_by_agent_name[agent.name] = memory_service
+    for sub_agent in agent.sub_agents:
+        if getattr(sub_agent, "memory_service", None) is None:
+            register_agent_memory_service(sub_agent, memory_service)
+
+def resolve_memory_service(tool_context=None) -> MemoryService:
+    """
+    Returns the memory service for the session and agent running this tool.
+    The session's registered service wins, since agent names repeat across agent graphs built in one process.
+    """
+    if tool_context is not None:
+        memory_service = _services_by_id.get(tool_context.state.get(MEMORY_SERVICE_STATE_KEY))
+        if memory_service is None:
+            memory_service = _services_by_agent_name.get(tool_context.agent_name)
+        if memory_service is not None:
+            return memory_service
+    return get_default_memory_service()
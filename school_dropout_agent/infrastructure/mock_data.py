@@ -73,6 +73,10 @@ class MockDataStore:
                 "email": "parent@example.com",
                 "phone": "+1-555-1234",
                 "preferred_language": "English"
+            },
+            "contacts": {
+                "teacher": "math101.teacher@example.edu",
+                "counselor": "counseling.center@example.edu"
             }
         },
         "student_medium_risk": {
@@ -135,6 +139,10 @@ class MockDataStore:
                 "email": "mary.smith@example.com",
                 "phone": "+1-555-5678",
                 "preferred_language": "Spanish"
+            },
+            "contacts": {
+                "teacher": "math101.teacher@example.edu",
+                "counselor": "counseling.center@example.edu"
             }
         },
         "student_low_risk": {
@@ -195,6 +203,10 @@ class MockDataStore:
                 "email": "robert.j@example.com",
                 "phone": "+1-555-9012",
                 "preferred_language": "English"
+            },
+            "contacts": {
+                "teacher": "history202.teacher@example.edu",
+                "counselor": "counseling.center@example.edu"
             }
         }
     }
@@ -206,5 +218,77 @@ class MockDataStore:
         """
         student = cls._students.get(student_id)
         if not student:
-            return None
+            return cls._imported_data([student_id], [category])[student_id][category]
         return student.get(category)
+
+    @classmethod
+    def get_many(cls, student_ids: List[str], categories: List[str]) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Retrieves several categories of data for a cohort, keyed by student and then category.
+        Imported students are fetched with one query per chunk instead of one per student and category.
+        """
+        data = {
+            student_id: {category: cls._students[student_id].get(category) for category in categories}
+            for student_id in student_ids if student_id in cls._students
+        }
+        imported = [student_id for student_id in dict.fromkeys(student_ids) if student_id not in cls._students]
+        if imported:
+            data.update(cls._imported_data(imported, categories))
+        return data
+
+    @staticmethod
+    def _imported_data(student_ids: List[str], categories: List[str]) -> Dict[str, Dict[str, Optional[Dict[str, Any]]]]:
+        """
+        Looks up data loaded by the bulk importer for students that are not in the mock store.
+        Their profile comes from the `students` table when the import did not provide one.
+        """
+        # Imported here so the mock store only touches the database for imported students
+        from school_dropout_agent.infrastructure.database.database import SessionLocal, QUERY_CHUNK_SIZE
+        from school_dropout_agent.infrastructure.database.models import StudentDataModel, StudentModel
+
+        data = {student_id: {category: None for category in categories} for student_id in student_ids}
+        db = SessionLocal()
+        try:
+            for start in range(0, len(student_ids), QUERY_CHUNK_SIZE):
+                chunk = student_ids[start:start + QUERY_CHUNK_SIZE]
+                rows = db.query(StudentDataModel).filter(
+                    StudentDataModel.student_id.in_(chunk),
+                    StudentDataModel.category.in_(categories)
+                )
+                for row in rows:
+                    data[row.student_id][row.category] = row.data
+                if "profile" in categories:
+                    students = db.query(StudentModel).filter(StudentModel.student_id.in_(chunk))
+                    for student in students:
+                        if data[student.student_id]["profile"] is None:
+                            data[student.student_id]["profile"] = {
+                                "name": " ".join(filter(None, [student.first_name, student.last_name])) or student.student_id,
+                                "major": student.major,
+                                "enrollment_status": student.enrollment_status
+                            }
+            return data
+        finally:
+            db.close()
+
+    @classmethod
+    def student_ids(cls) -> List[str]:
+        """
+        Lists the IDs of every known student: the mock set followed by students loaded into the database.
+        """
+        from school_dropout_agent.infrastructure.database.database import SessionLocal
+        from school_dropout_agent.infrastructure.database.models import StudentDataModel, StudentModel
+
+        db = SessionLocal()
+        try:
+            imported = db.query(StudentModel.student_id).union(db.query(StudentDataModel.student_id))
+            return list(dict.fromkeys([*cls._students, *sorted(row[0] for row in imported)]))
+        finally:
+            db.close()
+
+    @classmethod
+    def add_student(cls, student_id: str, data: Dict[str, Any]) -> None:
+        """
+        Registers (or replaces) a student's data, keyed by category.
+        Used by benchmarks to create synthetic cohorts from the built-in profiles.
+        """
+        cls._students[student_id] = data
@@ -0,0 +1,154 @@
+"""
+This module implements the SentimentScorer, a CPU-only lexicon scorer for survey comments and counseling issues.
+Texts are tokenized into signed lexicon hits (negation flips, intensifiers amplify) and a whole batch is scored
+with one vectorized pass over a document-term matrix. Scores are cached per normalized-text hash.
+Used by the emotional tools and by cohort pre-screening, so neither needs a model call to read free text.
+"""
+import hashlib
+import re
+from typing import Any, Dict, List, Tuple
+
+import numpy as np
+
+# Valence of common words in student feedback, on a -3..+3 scale
+VALENCE: Dict[str, float] = {
+    "love": 3.0, "loving": 3.0, "great": 2.5, "excellent": 3.0, "amazing": 3.0, "enjoy": 2.0, "enjoying": 2.0,
+    "happy": 2.5, "good": 1.5, "well": 1.0, "fine": 0.8, "manageable": 0.8, "confident": 2.0, "motivated": 2.0,
+    "supported": 2.0, "helpful": 1.5, "interesting": 1.5, "fun": 2.0, "better": 1.0, "improving": 1.5,
+    "bad": -1.5, "hard": -0.8, "difficult": -1.0, "tired": -1.2, "worried": -1.8, "worry": -1.8,
+    "stress": -2.0, "stressed": -2.0, "stressful": -2.0, "overwhelmed": -2.5, "overwhelming": -2.5,
+    "anxious": -2.2, "anxiety": -2.2, "burnout": -2.5, "exhausted": -2.2, "lonely": -2.2, "alone": -1.5,
+    "sad": -2.0, "depressed": -3.0, "depression": -3.0, "hopeless": -3.0, "hate": -3.0, "awful": -2.5,
+    "terrible": -2.5, "failing": -2.2, "fail": -2.0, "behind": -1.2, "struggling": -2.0, "struggle": -1.8,
+    "lost": -1.5, "confused": -1.2, "quit": -2.5, "dropout": -3.0, "panic": -2.5, "isolated": -2.2,
+}
+
+# Terms that signal distress regardless of overall tone, weighted by severity
+DISTRESS: Dict[str, float] = {
+    "stress": 0.6, "stressed": 0.6, "overwhelmed": 0.8, "overwhelming": 0.8, "anxiety": 0.8, "anxious": 0.8,
+    "burnout": 1.0, "exhausted": 0.7, "panic": 1.0, "depressed": 1.2, "depression": 1.2, "hopeless": 1.5,
+    "lonely": 0.8, "isolated": 0.8, "quit": 1.0, "dropout": 1.5, "failing": 0.8, "struggling": 0.6,
+    "personal": 0.3, "family": 0.2, "financial": 0.4, "crisis": 1.5, "harm": 2.0,
+}
+
+NEGATORS = {"not", "no", "never", "nothing", "hardly", "without", "dont", "isnt", "cant", "wont", "didnt", "doesnt", "arent"}
+INTENSIFIERS = {"very": 1.5, "really": 1.4, "so": 1.3, "extremely": 1.8, "totally": 1.5, "too": 1.3, "super": 1.5}
+
+# How many following tokens a negator or intensifier affects; punctuation ends the scope early
+SCOPE = 3
+
+NEGATIVE_THRESHOLD = -0.05
+POSITIVE_THRESHOLD = 0.05
+
+_TOKEN = re.compile(r"[a-z]+|[.,;:!?]")
+
+def _normalize(text: str) -> str:
+    return " ".join(text.lower().replace("'", "").split())
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(_normalize(text).encode("utf-8")).hexdigest()
+
+class SentimentScorer:
+    """
+    Batch lexicon scorer.
+
+    `sentiment` is in [-1, 1] (summed valence normalized as x / sqrt(x^2 + 15)),
+    `distress` is in [0, 1] (1 - exp(-summed distress weight)), and `label` is negative/neutral/positive.
+    At most `max_cache_size` scores are cached; the oldest are evicted first.
+    """
+
+    def __init__(self, max_cache_size: int = 100_000):
+        self.max_cache_size = max_cache_size
+        self._cache: Dict[str, Dict[str, Any]] = {}
+        self._vocabulary = sorted(set(VALENCE) | set(DISTRESS))
+        self._index = {term: i for i, term in enumerate(self._vocabulary)}
+        self._valence = np.array([VALENCE.get(term, 0.0) for term in self._vocabulary])
+        self._distress = np.array([DISTRESS.get(term, 0.0) for term in self._vocabulary])
+        self.scored = 0
+
+    def score(self, text: str) -> Dict[str, Any]:
+        return self.score_batch([text])[0]
+
+    def score_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score many texts; only texts not seen before are computed, in one vectorized pass."""
+        keys = [_hash(text or "") for text in texts]
+        # Scores for this batch are kept here: remembering new scores may evict entries the batch still needs
+        scores: Dict[str, Dict[str, Any]] = {}
+        missing = {}
+        for key, text in zip(keys, texts):
+            if key in scores or key in missing:
+                continue
+            cached = self._cache.get(key)
+            if cached is not None:
+                scores[key] = cached
+            else:
+                missing[key] = text or ""
+
+        if missing:
+            for key, score in zip(missing, self._compute(list(missing.values()))):
+                scores[key] = score
+                self._remember(key, score)
+        return [{**scores[key], "distress_terms": list(scores[key]["distress_terms"])} for key in keys]
+
+    def _compute(self, texts: List[str]) -> List[Dict[str, Any]]:
+        rows, columns, signs, weights = [], [], [], []
+        matched: List[List[str]] = []
+        for row, text in enumerate(texts):
+            hits = self._hits(text)
+            matched.append([term for term, sign, _ in hits if sign > 0 and DISTRESS.get(term)])
+            for term, sign, weight in hits:
+                rows.append(row)
+                columns.append(self._index[term])
+                signs.append(sign)
+                weights.append(weight)
+
+        # Document-term matrices: signed, intensified counts for valence and plain counts for distress
+        valence_counts = np.zeros((len(texts), len(self._vocabulary)))
+        distress_counts = np.zeros((len(texts), len(self._vocabulary)))
+        if rows:
+            rows_array = np.array(rows)
+            columns_array = np.array(columns)
+            np.add.at(valence_counts, (rows_array, columns_array), np.array(signs) * np.array(weights))
+            np.add.at(distress_counts, (rows_array, columns_array), (np.array(signs) > 0).astype(float))
+
+        valence = valence_counts @ self._valence
+        sentiment = valence / np.sqrt(valence * valence + 15.0)
+        distress = 1.0 - np.exp(-(distress_counts @ self._distress))
+        self.scored += len(texts)
+
+        return [
+            {
+                "sentiment": round(float(s), 3),
+                "distress": round(float(d), 3),
+                "label": "negative" if s <= NEGATIVE_THRESHOLD else "positive" if s >= POSITIVE_THRESHOLD else "neutral",
+                "distress_terms": terms
+            } for s, d, terms in zip(sentiment, distress, matched)
+        ]
+
+    def _hits(self, text: str) -> List[Tuple[str, int, float]]:
+        """Lexicon terms in the text with their negation sign and intensity."""
+        hits = []
+        negate_until = intensify_until = -1
+        intensity = 1.0
+        for position, token in enumerate(_TOKEN.findall(_normalize(text))):
+            if not token.isalpha():
+                negate_until = intensify_until = -1
+                continue
+            if token in NEGATORS:
+                negate_until = position + SCOPE
+                continue
+            if token in INTENSIFIERS:
+                intensity = INTENSIFIERS[token]
+                intensify_until = position + SCOPE
+                continue
+            if token in self._index:
+                sign = -1 if position <= negate_until else 1
+                hits.append((token, sign, intensity if position <= intensify_until else 1.0))
+        return hits
+
+    def _remember(self, key: str, score: Dict[str, Any]) -> None:
+        if len(self._cache) >= self.max_cache_size:
+            self._cache.pop(next(iter(self._cache)))
+        self._cache[key] = score
+
+sentiment_scorer = SentimentScorer()
@@ -0,0 +1,221 @@
+"""
+This module implements the NotificationDigestService.
+It buffers stakeholder notifications per recipient over a configurable window and delivers one digest per recipient.
+Pending notifications are persisted so a restart does not lose them.
+Used by the InterventionCoordinatorAgent's `notify_stakeholder` tool.
+"""
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Any, List, Optional
+
+from school_dropout_agent.core.notifications.notification_sender import NotificationSender
+from school_dropout_agent.infrastructure.database.database import SessionLocal
+from school_dropout_agent.infrastructure.database.models import PendingNotificationModel
+from school_dropout_agent.infrastructure.telemetry.instrumentation import instrumentation
+
+logger = logging.getLogger(__name__)
+
+class NotificationDigestService:
+    """
+    Coalesces notifications into per-recipient digests.
+
+    Repeats for the same (recipient, student) replace the earlier message. A recipient is flushed when its
+    window elapses or its buffer reaches `max_pending_per_recipient`; the oldest recipient is flushed early
+    whenever the whole buffer exceeds `max_pending_total`.
+    Notifications without a `recipient_id` go to a per-student recipient (`<stakeholder_type>:<student_id>`),
+    never to one shared digest for every stakeholder of that type.
+    A digest whose delivery fails stays buffered (and persisted) and is retried at the next flush.
+    """
+
+    def __init__(
+        self,
+        sender: NotificationSender,
+        window_seconds: Optional[float] = None,
+        max_pending_per_recipient: int = 500,
+        max_pending_total: int = 5000
+    ):
+        self.sender = sender
+        self.window = timedelta(seconds=window_seconds if window_seconds is not None else float(
+            os.getenv("NOTIFICATION_DIGEST_WINDOW_SECONDS", "900")
+        ))
+        self.max_pending_per_recipient = max_pending_per_recipient
+        self.max_pending_total = max_pending_total
+        self._buffers: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        self._window_start: Dict[str, datetime] = {}
+        self._pending_total = 0
+        self._restored = False
+
+    def enqueue(
+        self,
+        stakeholder_type: str,
+        student_id: str,
+        message: str,
+        recipient_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Buffer a notification and flush any digests that are due."""
+        self._ensure_restored()
+        recipient = recipient_id or f"{stakeholder_type}:{student_id}"
+        now = datetime.now()
+
+        buffer = self._buffers.setdefault(recipient, {})
+        entry = buffer.get(student_id)
+        if entry:
+            entry["message"] = message
+            entry["repeats"] += 1
+            entry["updated_at"] = now
+        else:
+            entry = {
+                "student_id": student_id,
+                "stakeholder_type": stakeholder_type,
+                "message": message,
+                "repeats": 1,
+                "created_at": now,
+                "updated_at": now
+            }
+            buffer[student_id] = entry
+            self._pending_total += 1
+            self._window_start.setdefault(recipient, now)
+        self._persist(recipient, entry)
+
+        digests = []
+        if len(buffer) >= self.max_pending_per_recipient:
+            digests.append(self._try_flush(recipient))
+        for oldest in sorted(self._window_start, key=self._window_start.get):
+            if self._pending_total <= self.max_pending_total:
+                break
+            digests.append(self._try_flush(oldest))
+        digests = [digest for digest in digests if digest is not None]
+        digests.extend(self.flush_due(now))
+
+        return {
+            "recipient": recipient,
+            "pending_for_recipient": len(self._buffers.get(recipient, {})),
+            "digests_sent": len(digests)
+        }
+
+    def flush_due(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """Flush every recipient whose window has elapsed; failed deliveries stay buffered."""
+        self._ensure_restored()
+        now = now or datetime.now()
+        due = [r for r, start in self._window_start.items() if now - start >= self.window]
+        return [digest for digest in map(self._try_flush, due) if digest is not None]
+
+    def flush_all(self) -> List[Dict[str, Any]]:
+        """
+        Flush every recipient regardless of its window, e.g. at the end of a cohort run;
+        failed deliveries stay buffered.
+        """
+        self._ensure_restored()
+        return [digest for digest in map(self._try_flush, list(self._buffers)) if digest is not None]
+
+    def shutdown(self) -> None:
+        """Deliver whatever this process buffered before it exits (registered with `atexit` by the tools)."""
+        if self._restored and self._pending_total:
+            self.flush_all()
+
+    def flush_recipient(self, recipient: str) -> Dict[str, Any]:
+        """
+        Deliver one digest for a recipient and clear its buffer.
+        If the sender raises, the notifications are put back into the buffer and the error is re-raised.
+        """
+        buffer = self._buffers.pop(recipient, {})
+        window_start = self._window_start.pop(recipient, datetime.now())
+        self._pending_total -= len(buffer)
+
+        digest = {
+            "recipient": recipient,
+            "window_start": window_start.isoformat(),
+            "sent_at": datetime.now().isoformat(),
+            "count": len(buffer),
+            "notifications": [
+                {
+                    "student_id": entry["student_id"],
+                    "stakeholder_type": entry["stakeholder_type"],
+                    "message": entry["message"],
+                    "repeats": entry["repeats"]
+                } for entry in buffer.values()
+            ]
+        }
+        started = time.perf_counter()
+        try:
+            self.sender.send_digest(recipient, digest)
+        except Exception:
+            instrumentation.record("notification", "send_digest", None, time.perf_counter() - started, error=True)
+            self._buffers[recipient] = buffer
+            self._window_start[recipient] = window_start
+            self._pending_total += len(buffer)
+            raise
+        instrumentation.record("notification", "send_digest", None, time.perf_counter() - started)
+
+        db = SessionLocal()
+        try:
+            db.query(PendingNotificationModel).filter_by(recipient=recipient).delete()
+            db.commit()
+        finally:
+            db.close()
+        return digest
+
+    def pending_count(self) -> int:
+        """Number of buffered notifications across all recipients."""
+        self._ensure_restored()
+        return self._pending_total
+
+    async def run(self, interval_seconds: float = 60.0) -> None:
+        """Periodically flush due digests; run as a background task in long-lived workers."""
+        while True:
+            self.flush_due()
+            await asyncio.sleep(interval_seconds)
+
+    def _try_flush(self, recipient: str) -> Optional[Dict[str, Any]]:
+        """Flush one recipient, leaving it buffered for the next attempt if delivery fails."""
+        try:
+            return self.flush_recipient(recipient)
+        except Exception:
+            # Counted as a send_digest error by `flush_recipient`; the digest is retried at the next flush
+            logger.exception("Delivering the digest for %s failed; %d notifications stay buffered",
+                             recipient, len(self._buffers.get(recipient, {})))
+            return None
+
+    def _persist(self, recipient: str, entry: Dict[str, Any]) -> None:
+        db = SessionLocal()
+        try:
+            db.merge(PendingNotificationModel(
+                recipient=recipient,
+                student_id=entry["student_id"],
+                stakeholder_type=entry["stakeholder_type"],
+                message=entry["message"],
+                repeats=entry["repeats"],
+                created_at=entry["created_at"],
+                updated_at=entry["updated_at"]
+            ))
+            db.commit()
+        finally:
+            db.close()
+
+    def _ensure_restored(self) -> None:
+        """Reload notifications that were pending when the process last stopped."""
+        if self._restored:
+            return
+        self._restored = True
+        db = SessionLocal()
+        try:
+            for row in db.query(PendingNotificationModel).all():
+                buffer = self._buffers.setdefault(row.recipient, {})
+                if row.student_id not in buffer:
+                    self._pending_total += 1
+                buffer[row.student_id] = {
+                    "student_id": row.student_id,
+                    "stakeholder_type": row.stakeholder_type,
+                    "message": row.message,
+                    "repeats": row.repeats or 1,
+                    "created_at": row.created_at,
+                    "updated_at": row.updated_at
+                }
+                start = self._window_start.get(row.recipient)
+                if start is None or (row.created_at and row.created_at < start):
+                    self._window_start[row.recipient] = row.created_at or datetime.now()
+        finally:
+            db.close()
@@ -0,0 +1,17 @@
+"""
+This module implements the MockNotificationSender.
+It records delivered digests in memory instead of sending emails or messages.
+Used as the default sender for local development and verification scripts.
+"""
+from typing import Dict, Any, List
+from school_dropout_agent.core.notifications.notification_sender import NotificationSender
+
+class MockNotificationSender(NotificationSender):
+    """Notification sender that keeps delivered digests in a list."""
+    
+    def __init__(self):
+        self.sent: List[Dict[str, Any]] = []
+    
+    def send_digest(self, recipient: str, digest: Dict[str, Any]) -> None:
+        """Deliver one digest to a recipient."""
+        self.sent.append(digest)
@@ -0,0 +1,153 @@
+"""
+This module implements the RuleEngine for declarative threshold rules.
+Rules are loaded from a JSON config (`config/threshold_rules.json`, or THRESHOLD_RULES_PATH) and each one
+is compiled to a vectorized predicate over cohort feature arrays. The config is reloaded when its file changes.
+The same compiled rules drive batch flagging and the rule lists rendered into agent prompts.
+"""
+import functools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+from school_dropout_agent.infrastructure.features.student_features import FEATURE_NAMES, FeatureMatrix, build_feature_matrix
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "threshold_rules.json")
+
+OPERATORS = {
+    "<": np.less,
+    "<=": np.less_equal,
+    ">": np.greater,
+    ">=": np.greater_equal,
+    "==": np.equal,
+    "!=": np.not_equal
+}
+
+# A predicate maps feature columns (name -> array over students) to a boolean mask over students
+Predicate = Callable[[Mapping[str, np.ndarray]], np.ndarray]
+
+@dataclass
+class CompiledRule:
+    id: str
+    description: str
+    expression: str
+    predicate: Predicate
+
+def compile_condition(condition: Dict[str, Any]) -> Tuple[Predicate, str]:
+    """
+    Compile a condition to a predicate and a readable expression.
+    A condition is either a comparison (`feature`, `op`, `value`) or a group (`all` / `any`) of conditions.
+    """
+    for key, combine, joiner in (("all", np.logical_and, " AND "), ("any", np.logical_or, " OR ")):
+        if key in condition:
+            parts = [compile_condition(c) for c in condition[key]]
+            if not parts:
+                raise ValueError(f"Empty '{key}' group")
+            predicates = [predicate for predicate, _ in parts]
+            expression = joiner.join(f"({e})" if " AND " in e or " OR " in e else e for _, e in parts)
+            return (lambda columns: functools.reduce(combine, (p(columns) for p in predicates))), expression
+
+    feature, op, value = condition.get("feature"), condition.get("op"), condition.get("value")
+    if feature not in FEATURE_NAMES:
+        raise ValueError(f"Unknown feature '{feature}'")
+    if op not in OPERATORS:
+        raise ValueError(f"Unknown operator '{op}' for feature '{feature}'")
+    compare, threshold = OPERATORS[op], float(value)
+    return (lambda columns: compare(columns[feature], threshold)), f"{feature} {op} {value}"
+
+def compile_rules(config: Dict[str, Any]) -> Dict[str, List[CompiledRule]]:
+    """Compile every rule set of a config; raises ValueError on the first invalid rule."""
+    compiled = {}
+    for name, rules in config.get("rule_sets", {}).items():
+        compiled[name] = []
+        for rule in rules:
+            try:
+                predicate, expression = compile_condition(rule)
+            except (ValueError, TypeError) as e:
+                raise ValueError(f"Rule '{rule.get('id')}' in '{name}': {e}") from e
+            compiled[name].append(CompiledRule(rule["id"], rule.get("description", rule["id"]), expression, predicate))
+    return compiled
+
+class RuleEngine:
+    """
+    Compiled threshold rules with hot reload.
+
+    The config file's modification time is checked at most every `reload_interval_seconds`.
+    A config that fails to compile is ignored (the previous rules stay active) and its error is kept
+    in `last_error`; only the very first load raises.
+    """
+
+    def __init__(self, path: Optional[str] = None, reload_interval_seconds: float = 1.0):
+        self.path = path or os.getenv("THRESHOLD_RULES_PATH", DEFAULT_RULES_PATH)
+        self.reload_interval_seconds = reload_interval_seconds
+        self.version: Optional[str] = None
+        self.last_error: Optional[str] = None
+        self._rules: Optional[Dict[str, List[CompiledRule]]] = None
+        self._mtime: Optional[float] = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def rules(self, rule_set: str) -> List[CompiledRule]:
+        self._maybe_reload()
+        return list(self._rules.get(rule_set, []))
+
+    def evaluate_masks(self, rule_set: str, matrix: FeatureMatrix) -> Tuple[List[str], np.ndarray]:
+        """Rule IDs and a (rules x students) boolean matrix of which students match which rule."""
+        rules = self.rules(rule_set)
+        columns = {name: matrix.values[:, i] for i, name in enumerate(matrix.feature_names)}
+        masks = np.zeros((len(rules), len(matrix.student_ids)), dtype=bool)
+        for i, rule in enumerate(rules):
+            masks[i] = rule.predicate(columns)
+        return [rule.id for rule in rules], masks
+
+    def evaluate(self, rule_set: str, matrix: FeatureMatrix) -> Dict[str, List[str]]:
+        """The IDs of the rules each student matches, keyed by student ID."""
+        rule_ids, masks = self.evaluate_masks(rule_set, matrix)
+        return {
+            student_id: [rule_ids[i] for i in np.flatnonzero(masks[:, column])]
+            for column, student_id in enumerate(matrix.student_ids)
+        }
+
+    def flags_for(self, rule_set: str, student_ids: List[str]) -> Dict[str, List[str]]:
+        """Build the cohort's features and evaluate a rule set over them in one pass."""
+        return self.evaluate(rule_set, build_feature_matrix(student_ids))
+
+    def render(self, rule_set: str) -> str:
+        """A numbered list of the rules for use in agent prompts."""
+        return "\n".join(
+            f"{i}. {rule.description} (`{rule.expression}`)."
+            for i, rule in enumerate(self.rules(rule_set), start=1)
+        )
+
+    def _maybe_reload(self) -> None:
+        now = time.monotonic()
+        if self._rules is not None and now - self._checked_at < self.reload_interval_seconds:
+            return
+        with self._lock:
+            self._checked_at = now
+            mtime = None
+            try:
+                # A missing file (e.g. mid atomic rename) keeps the last good rules like an invalid one
+                mtime = os.path.getmtime(self.path)
+                if self._rules is not None and mtime == self._mtime:
+                    return
+                with open(self.path) as f:
+                    config = json.load(f)
+                rules = compile_rules(config)
+            except (OSError, ValueError, KeyError) as e:
+                if self._rules is None:
+                    raise
+                self.last_error = f"{type(e).__name__}: {e}"
+                if mtime is not None:
+                    self._mtime = mtime
+                return
+            self._rules = rules
+            self._mtime = mtime
+            self.version = f"{config.get('version', 0)}@{int(mtime)}"
+            self.last_error = None
+
+rule_engine = RuleEngine()
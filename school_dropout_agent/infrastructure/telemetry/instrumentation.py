@@ -0,0 +1,357 @@
+"""
+This module implements latency, token and error instrumentation for the agent graph.
+It hooks into ADK's before/after tool and model callbacks (plus a Runner plugin for model errors)
+and times DatabaseMemoryService operations, tagging every measurement with the agent name and student.
+Measurements are exported as OpenTelemetry spans and metrics, and as JSON or Prometheus text
+through `Instrumentation.to_json`, `Instrumentation.to_prometheus` and the local `serve_metrics` endpoint.
+"""
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from google.adk.plugins.base_plugin import BasePlugin
+from opentelemetry import metrics, trace
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+# Set while a tool runs so nested DB calls are attributed to the calling agent and student
+_current_agent: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_agent", default=None)
+_current_student: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar("current_student", default=None)
+
+class _Series:
+    """Aggregated measurements for one (kind, name, agent) combination."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(LATENCY_BUCKETS)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+
+    def observe(self, seconds: float, error: bool, prompt_tokens: int = 0, completion_tokens: int = 0):
+        self.count += 1
+        self.errors += int(error)
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for i, bound in enumerate(LATENCY_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+        self.prompt_tokens += prompt_tokens
+        self.completion_tokens += completion_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.errors / self.count if self.count else 0.0,
+            "avg_seconds": self.total_seconds / self.count if self.count else 0.0,
+            "max_seconds": self.max_seconds,
+            "total_seconds": self.total_seconds,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens
+        }
+
+class Instrumentation:
+    """
+    Collects per-tool, per-model and per-DB-operation measurements.
+    Attach to an LlmAgent with `**instrumentation.agent_callbacks()`, and pass `instrumentation.plugin()`
+    to the Runner: LlmAgent has no model-error callback, so failed model calls are only seen by plugins.
+    """
+
+    def __init__(self, max_recent: int = 1000):
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[str, str, str], _Series] = {}
+        self._recent: Deque[Dict[str, Any]] = deque(maxlen=max_recent)
+        self._started: Dict[str, Tuple[float, Any]] = {}
+
+        self._tracer = trace.get_tracer("school_dropout_agent")
+        meter = metrics.get_meter("school_dropout_agent")
+        self._duration = meter.create_histogram(
+            "sda.operation.duration", unit="s", description="Latency of tool, model and DB operations"
+        )
+        self._calls = meter.create_counter("sda.operation.calls", description="Tool, model and DB operations")
+        self._errors = meter.create_counter("sda.operation.errors", description="Failed tool, model and DB operations")
+        self._tokens = meter.create_counter("sda.model.tokens", description="Model tokens by direction")
+
+    # ADK callbacks
+
+    def agent_callbacks(self) -> Dict[str, Callable]:
+        """Keyword arguments that wire this instrumentation into an LlmAgent."""
+        return {
+            "before_tool_callback": self.before_tool,
+            "after_tool_callback": self.after_tool,
+            "on_tool_error_callback": self.on_tool_error,
+            "before_model_callback": self.before_model,
+            "after_model_callback": self.after_model
+        }
+
+    def before_tool(self, tool, args: Dict[str, Any], tool_context) -> None:
+        student_id = args.get("student_id") or tool_context.state.get("student_id")
+        span = self._tracer.start_span(f"tool {tool.name}", attributes={
+            "sda.kind": "tool",
+            "sda.agent": tool_context.agent_name,
+            "sda.tool": tool.name,
+            "sda.student_id": student_id or ""
+        })
+        self._started[f"tool:{tool_context.function_call_id}"] = (time.perf_counter(), span)
+        _current_agent.set(tool_context.agent_name)
+        _current_student.set(student_id)
+        return None
+
+    def after_tool(self, tool, args: Dict[str, Any], tool_context, tool_response: Any) -> None:
+        error = isinstance(tool_response, dict) and "error" in tool_response
+        self._finish_tool(tool, args, tool_context, error)
+        return None
+
+    def on_tool_error(self, tool, args: Dict[str, Any], tool_context, error: Exception) -> None:
+        self._finish_tool(tool, args, tool_context, True, error)
+        return None
+
+    def before_model(self, callback_context, llm_request) -> None:
+        span = self._tracer.start_span(f"model {callback_context.agent_name}", attributes={
+            "sda.kind": "model",
+            "sda.agent": callback_context.agent_name,
+            "sda.model": llm_request.model or "",
+            "sda.student_id": callback_context.state.get("student_id") or ""
+        })
+        key = f"model:{callback_context.invocation_id}:{callback_context.agent_name}"
+        stale = self._started.pop(key, None)
+        if stale:
+            # An agent calls its model one call at a time; a call still open here failed without a report
+            self._finish_model(callback_context, stale, error="model call ended without a response")
+        self._started[key] = (time.perf_counter(), span)
+        return None
+
+    def after_model(self, callback_context, llm_response) -> None:
+        if llm_response.partial:
+            return None
+        key = f"model:{callback_context.invocation_id}:{callback_context.agent_name}"
+        started = self._started.pop(key, None)
+        if not started:
+            return None
+
+        usage = llm_response.usage_metadata
+        self._finish_model(
+            callback_context,
+            started,
+            error=str(llm_response.error_message or llm_response.error_code) if llm_response.error_code is not None else None,
+            prompt_tokens=(usage.prompt_token_count or 0) if usage else 0,
+            completion_tokens=(usage.candidates_token_count or 0) if usage else 0
+        )
+        return None
+
+    def on_model_error(self, callback_context, llm_request, error: Exception) -> None:
+        key = f"model:{callback_context.invocation_id}:{callback_context.agent_name}"
+        started = self._started.pop(key, None)
+        if started:
+            self._finish_model(callback_context, started, error=f"{type(error).__name__}: {error}", exception=error)
+        return None
+
+    def plugin(self) -> "InstrumentationPlugin":
+        """Runner plugin that reports model errors to this instrumentation."""
+        return InstrumentationPlugin(self)
+
+    # Recording and export
+
+    def record(
+        self,
+        kind: str,
+        name: str,
+        agent: Optional[str],
+        seconds: float,
+        error: bool = False,
+        student_id: Optional[str] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0
+    ) -> None:
+        """Record one measurement in the local registry and the OpenTelemetry meter."""
+        agent = agent or "unknown"
+        attributes = {"sda.kind": kind, "sda.name": name, "sda.agent": agent}
+        self._duration.record(seconds, attributes)
+        self._calls.add(1, attributes)
+        if error:
+            self._errors.add(1, attributes)
+        if prompt_tokens:
+            self._tokens.add(prompt_tokens, {**attributes, "sda.direction": "prompt"})
+        if completion_tokens:
+            self._tokens.add(completion_tokens, {**attributes, "sda.direction": "completion"})
+
+        with self._lock:
+            self._series.setdefault((kind, name, agent), _Series()).observe(
+                seconds, error, prompt_tokens, completion_tokens
+            )
+            self._recent.append({
+                "kind": kind,
+                "name": name,
+                "agent": agent,
+                "student_id": student_id,
+                "seconds": seconds,
+                "error": error,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "timestamp": datetime.now().isoformat()
+            })
+
+    def timed(self, name: str) -> Callable:
+        """Decorator that records the latency of a DB operation under the calling agent and student."""
+        def decorator(func: Callable) -> Callable:
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                start = time.perf_counter()
+                error = False
+                try:
+                    return func(*args, **kwargs)
+                except Exception:
+                    error = True
+                    raise
+                finally:
+                    self.record(
+                        "db", name, _current_agent.get(), time.perf_counter() - start,
+                        error=error, student_id=_current_student.get()
+                    )
+            return wrapper
+        return decorator
+
+    def reset(self) -> None:
+        """Drop every recorded measurement."""
+        with self._lock:
+            self._series.clear()
+            self._recent.clear()
+            self._started.clear()
+
+    def to_json(self, recent: bool = True) -> Dict[str, Any]:
+        """Aggregated measurements, plus the most recent raw records tagged by student."""
+        with self._lock:
+            series = [
+                {"kind": kind, "name": name, "agent": agent, **s.to_dict()}
+                for (kind, name, agent), s in sorted(self._series.items())
+            ]
+            records = list(self._recent) if recent else []
+        return {"series": series, "recent": records}
+
+    def to_prometheus(self) -> str:
+        """Aggregated measurements in the Prometheus text exposition format."""
+        lines: List[str] = [
+            "# TYPE sda_operation_duration_seconds histogram",
+        ]
+        calls: List[str] = ["# TYPE sda_operation_calls_total counter"]
+        errors: List[str] = ["# TYPE sda_operation_errors_total counter"]
+        tokens: List[str] = ["# TYPE sda_model_tokens_total counter"]
+        with self._lock:
+            for (kind, name, agent), s in sorted(self._series.items()):
+                labels = f'kind="{kind}",name="{name}",agent="{agent}"'
+                for bound, count in zip(LATENCY_BUCKETS, s.buckets):
+                    lines.append(f'sda_operation_duration_seconds_bucket{{{labels},le="{bound}"}} {count}')
+                lines.append(f'sda_operation_duration_seconds_bucket{{{labels},le="+Inf"}} {s.count}')
+                lines.append(f"sda_operation_duration_seconds_sum{{{labels}}} {s.total_seconds}")
+                lines.append(f"sda_operation_duration_seconds_count{{{labels}}} {s.count}")
+                calls.append(f"sda_operation_calls_total{{{labels}}} {s.count}")
+                errors.append(f"sda_operation_errors_total{{{labels}}} {s.errors}")
+                if kind == "model":
+                    tokens.append(f'sda_model_tokens_total{{{labels},direction="prompt"}} {s.prompt_tokens}')
+                    tokens.append(f'sda_model_tokens_total{{{labels},direction="completion"}} {s.completion_tokens}')
+        return "\n".join(lines + calls + errors + tokens) + "\n"
+
+    def _finish_model(
+        self,
+        callback_context,
+        started: Tuple[float, Any],
+        error: Optional[str] = None,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        exception: Optional[Exception] = None
+    ):
+        start, span = started
+        span.set_attribute("sda.prompt_tokens", prompt_tokens)
+        span.set_attribute("sda.completion_tokens", completion_tokens)
+        if exception is not None:
+            span.record_exception(exception)
+        if error is not None:
+            span.set_status(trace.Status(trace.StatusCode.ERROR, error))
+        span.end()
+
+        self.record(
+            "model",
+            callback_context.agent_name,
+            callback_context.agent_name,
+            time.perf_counter() - start,
+            error=error is not None,
+            student_id=callback_context.state.get("student_id"),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens
+        )
+
+    def _finish_tool(self, tool, args: Dict[str, Any], tool_context, error: bool, exception: Optional[Exception] = None):
+        started = self._started.pop(f"tool:{tool_context.function_call_id}", None)
+        _current_agent.set(None)
+        _current_student.set(None)
+        if not started:
+            return
+
+        start, span = started
+        if exception is not None:
+            span.record_exception(exception)
+        if error:
+            span.set_status(trace.Status(trace.StatusCode.ERROR))
+        span.end()
+
+        self.record(
+            "tool",
+            tool.name,
+            tool_context.agent_name,
+            time.perf_counter() - start,
+            error=error,
+            student_id=args.get("student_id") or tool_context.state.get("student_id")
+        )
+
+class InstrumentationPlugin(BasePlugin):
+    """Forwards model errors, which ADK reports only to Runner plugins, to an Instrumentation."""
+
+    def __init__(self, instrumentation: Instrumentation):
+        super().__init__(name="sda_instrumentation")
+        self.instrumentation = instrumentation
+
+    async def on_model_error_callback(self, *, callback_context, llm_request, error: Exception):
+        # Returning None lets the error propagate as before
+        return self.instrumentation.on_model_error(callback_context, llm_request, error)
+
+# Process-wide instance shared by every agent and the memory service
+instrumentation = Instrumentation()
+
+def serve_metrics(host: str = "127.0.0.1", port: int = 9464) -> ThreadingHTTPServer:
+    """
+    Starts a background HTTP server exposing `/metrics` (Prometheus text) and `/metrics.json`.
+    Returns the server so callers can `shutdown()` it.
+    """
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/metrics":
+                body = instrumentation.to_prometheus().encode("utf-8")
+                content_type = "text/plain; version=0.0.4"
+            elif self.path == "/metrics.json":
+                body = json.dumps(instrumentation.to_json()).encode("utf-8")
+                content_type = "application/json"
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,18 @@
+"""
+This module implements the MockTranslationBackend.
+It tags each text with the target language instead of calling a real translation API.
+Used as the default backend for local development and verification scripts.
+"""
+from typing import List
+from school_dropout_agent.core.translation.translation_backend import TranslationBackend
+
+class MockTranslationBackend(TranslationBackend):
+    """Translation backend that prefixes texts with the target language."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    def translate_batch(self, texts: List[str], target_language: str) -> List[str]:
+        """Translate every text into the target language, preserving order."""
+        self.calls += 1
+        return [f"[{target_language}] {text}" for text in texts]
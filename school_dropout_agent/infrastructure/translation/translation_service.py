@@ -0,0 +1,167 @@
+"""
+This module implements the TranslationService.
+It memoizes translations in a persistent cache keyed by (normalized text hash, target language), fronted by a
+bounded in-process TTL cache, and coalesces outstanding requests into one backend call per language.
+Used by the FamilyEngagementAgent's `translate_message` tool.
+"""
+import asyncio
+import hashlib
+import os
+import re
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Set, Tuple
+
+from cachetools import TTLCache
+
+from school_dropout_agent.core.translation.translation_backend import TranslationBackend
+from school_dropout_agent.infrastructure.database.database import SessionLocal
+from school_dropout_agent.infrastructure.database.models import TranslationModel
+
+_WHITESPACE = re.compile(r"\s+")
+
+def normalize_text(text: str) -> str:
+    """Collapse whitespace so trivially different messages share a cache entry."""
+    return _WHITESPACE.sub(" ", text).strip()
+
+def text_hash(text: str) -> str:
+    """Hash of the normalized text, used as the cache key."""
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+class TranslationService:
+    """
+    Memoized, batching front-end for a TranslationBackend.
+
+    Concurrent `translate` calls are buffered per target language for `batch_window_seconds`
+    and resolved with a single backend call containing only the distinct uncached texts.
+    The database and the backend are called from a worker thread, never from the event loop.
+    """
+
+    def __init__(
+        self,
+        backend: TranslationBackend,
+        batch_window_seconds: Optional[float] = None,
+        max_batch_size: int = 100,
+        cache_size: Optional[int] = None,
+        cache_ttl_seconds: Optional[float] = None
+    ):
+        self.backend = backend
+        self.batch_window_seconds = batch_window_seconds if batch_window_seconds is not None else float(
+            os.getenv("TRANSLATION_BATCH_WINDOW_SECONDS", "0.05")
+        )
+        self.max_batch_size = max_batch_size
+        self.backend_calls = 0
+        # The database keeps every translation; the in-process copy only holds the hot ones
+        self.cache_size = cache_size or int(os.getenv("TRANSLATION_CACHE_SIZE", "10000"))
+        self.cache_ttl_seconds = cache_ttl_seconds or float(os.getenv("TRANSLATION_CACHE_TTL_SECONDS", "86400"))
+        self._cache = TTLCache(maxsize=self.cache_size, ttl=self.cache_ttl_seconds)
+        self._cache_lock = threading.Lock()
+        self._pending: Dict[str, Dict[str, Tuple[str, asyncio.Future]]] = {}
+        self._flush_handles: Dict[str, asyncio.TimerHandle] = {}
+        self._flush_tasks: Set[asyncio.Task] = set()
+
+    async def translate(self, text: str, target_language: str) -> str:
+        """Translate a single text, sharing backend calls with concurrent requests."""
+        normalized = normalize_text(text)
+        key = text_hash(normalized)
+        with self._cache_lock:
+            cached = self._cache.get((key, target_language))
+        if cached is not None:
+            return cached
+
+        pending = self._pending.setdefault(target_language, {})
+        if key in pending:
+            return await pending[key][1]
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending[key] = (normalized, future)
+
+        if len(pending) >= self.max_batch_size:
+            self._flush_language(target_language)
+        elif target_language not in self._flush_handles:
+            self._flush_handles[target_language] = loop.call_later(
+                self.batch_window_seconds, self._flush_language, target_language
+            )
+        return await future
+
+    def translate_batch(self, texts: List[str], target_language: str) -> List[str]:
+        """Translate many texts at once, e.g. to pre-warm the cache before a cohort run."""
+        normalized = [normalize_text(text) for text in texts]
+        keys = [text_hash(text) for text in normalized]
+        translations: Dict[str, str] = {}
+        with self._cache_lock:
+            for key, text in zip(keys, normalized):
+                cached = self._cache.get((key, target_language))
+                if cached is not None:
+                    translations[key] = cached
+        missing = {key: text for key, text in zip(keys, normalized) if key not in translations}
+        if missing:
+            translations.update(self._resolve(target_language, missing))
+        return [translations[key] for key in keys]
+
+    async def flush(self) -> None:
+        """Resolve every outstanding request immediately."""
+        for target_language in list(self._pending):
+            self._flush_language(target_language)
+        if self._flush_tasks:
+            await asyncio.gather(*self._flush_tasks, return_exceptions=True)
+
+    def _flush_language(self, target_language: str) -> None:
+        handle = self._flush_handles.pop(target_language, None)
+        if handle:
+            handle.cancel()
+        pending = self._pending.pop(target_language, {})
+        if not pending:
+            return
+        # Called from the batch timer, so the blocking lookup runs as a task; keep a reference until it is done
+        task = asyncio.ensure_future(self._resolve_pending(target_language, pending))
+        self._flush_tasks.add(task)
+        task.add_done_callback(self._flush_tasks.discard)
+
+    async def _resolve_pending(self, target_language: str, pending: Dict[str, Tuple[str, asyncio.Future]]) -> None:
+        try:
+            translations = await asyncio.to_thread(
+                self._resolve, target_language, {key: text for key, (text, _) in pending.items()}
+            )
+        except Exception as e:
+            for _, future in pending.values():
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        for key, (_, future) in pending.items():
+            if not future.done():
+                future.set_result(translations[key])
+
+    def _resolve(self, target_language: str, texts_by_key: Dict[str, str]) -> Dict[str, str]:
+        """Translate texts from the database, then the rest with one backend call, and cache them in process."""
+        db = SessionLocal()
+        try:
+            rows = db.query(TranslationModel).filter(
+                TranslationModel.target_language == target_language,
+                TranslationModel.text_hash.in_(list(texts_by_key))
+            ).all()
+            translations = {row.text_hash: row.translated_text for row in rows}
+
+            missing = [key for key in texts_by_key if key not in translations]
+            if missing:
+                translated_texts = self.backend.translate_batch([texts_by_key[key] for key in missing], target_language)
+                self.backend_calls += 1
+                for key, translated in zip(missing, translated_texts):
+                    translations[key] = translated
+                    db.add(TranslationModel(
+                        text_hash=key,
+                        target_language=target_language,
+                        source_text=texts_by_key[key],
+                        translated_text=translated,
+                        created_at=datetime.now()
+                    ))
+                db.commit()
+
+            with self._cache_lock:
+                for key, translated in translations.items():
+                    self._cache[(key, target_language)] = translated
+            return translations
+        finally:
+            db.close()
@@ -0,0 +1,60 @@
+"""
+Regression tests for the partitioned SimilarStudentIndex.
+Feature matrices are generated in the test, so no student data or database is needed.
+"""
+import numpy as np
+
+from school_dropout_agent.infrastructure.features import similarity_index
+from school_dropout_agent.infrastructure.features.similarity_index import SimilarStudentIndex
+from school_dropout_agent.infrastructure.features.student_features import FEATURE_NAMES, FeatureMatrix
+
+def _use_vectors(monkeypatch, vectors):
+    ids = [f"student_{i}" for i in range(len(vectors))]
+    rows = dict(zip(ids, vectors))
+
+    def build_feature_matrix(student_ids):
+        return FeatureMatrix(list(student_ids), list(FEATURE_NAMES), np.array([rows[sid] for sid in student_ids]))
+
+    monkeypatch.setattr(similarity_index, "build_feature_matrix", build_feature_matrix)
+    return ids
+
+def test_partitioned_query_with_mostly_identical_vectors(monkeypatch):
+    # Most students carry only default features, as when whole categories are missing
+    rng = np.random.default_rng(1)
+    vectors = np.zeros((5000, len(FEATURE_NAMES)))
+    vectors[:200] = rng.normal(size=(200, len(FEATURE_NAMES)))
+    ids = _use_vectors(monkeypatch, vectors)
+
+    index = SimilarStudentIndex(partition_threshold=1000)
+    index.build(ids)
+    assert index.partitions > 1
+
+    for student_id in ids[::25]:
+        neighbours = index.query(student_id, k=5)
+        assert len(neighbours) == 5
+        assert student_id not in [neighbour for neighbour, _ in neighbours]
+
+def test_partitioned_query_matches_brute_force(monkeypatch):
+    rng = np.random.default_rng(2)
+    ids = _use_vectors(monkeypatch, rng.normal(size=(2000, len(FEATURE_NAMES))))
+
+    partitioned = SimilarStudentIndex(partition_threshold=1000, n_probe=1000)
+    partitioned.build(ids)
+    brute_force = SimilarStudentIndex(partition_threshold=10_000)
+    brute_force.build(ids)
+
+    for student_id in ids[:20]:
+        assert partitioned.query(student_id, k=5) == brute_force.query(student_id, k=5)
+
+def test_saved_index_answers_like_the_built_one(monkeypatch, tmp_path):
+    rng = np.random.default_rng(3)
+    ids = _use_vectors(monkeypatch, rng.normal(size=(1500, len(FEATURE_NAMES))))
+    built = SimilarStudentIndex(partition_threshold=1000)
+    built.build(ids)
+    built.save(str(tmp_path / "index.npz"))
+
+    loaded = SimilarStudentIndex()
+    assert loaded.ensure_loaded(path=str(tmp_path / "index.npz"))
+    assert loaded.partitions == built.partitions
+    for student_id in ids[:10]:
+        assert loaded.query(student_id, k=5) == built.query(student_id, k=5)